@@ -14,6 +14,8 @@ from studio.app.common.core.auth.auth_dependencies import (
 )
 from studio.app.common.core.logger import AppLogger
 from studio.app.common.core.mode import MODE
+from studio.app.common.core.utils.api_executor import ApiExecutor
+from studio.app.common.core.utils.latency_metrics import LatencyMetricsMiddleware
 from studio.app.common.core.workspace.workspace_dependencies import (
     is_workspace_available,
     is_workspace_owner,
@@ -23,6 +25,7 @@ from studio.app.common.routers import (
     auth,
     experiment,
     files,
+    metrics,
     outputs,
     params,
     run,
@@ -41,11 +44,13 @@ async def lifespan(app: FastAPI):
     # Startup event
     mode = "standalone" if MODE.IS_STANDALONE else "multiuser"
     logger = AppLogger.get_logger()
+    ApiExecutor.startup()
     logger.info(f'"Studio" application startup complete. [mode: {mode}]')
 
     yield
 
     # Shutdown event
+    ApiExecutor.shutdown()
     logger.info('"Studio" application shutdown.')
 
 
@@ -58,6 +63,7 @@ app.include_router(algolist.router, dependencies=[Depends(get_current_user)])
 app.include_router(auth.router)
 app.include_router(experiment.router, dependencies=[Depends(get_current_user)])
 app.include_router(files.router, dependencies=[Depends(get_current_user)])
+app.include_router(metrics.router, dependencies=[Depends(get_admin_user)])
 app.include_router(outputs.router, dependencies=[Depends(get_current_user)])
 app.include_router(params.router, dependencies=[Depends(get_current_user)])
 app.include_router(run.router, dependencies=[Depends(get_current_user)])
@@ -84,6 +90,7 @@ if MODE.IS_STANDALONE:
     app.dependency_overrides[is_workspace_owner] = skip_dependencies
     app.dependency_overrides[is_workspace_available] = skip_dependencies
 
+app.add_middleware(LatencyMetricsMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
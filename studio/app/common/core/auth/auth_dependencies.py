@@ -15,7 +15,7 @@ from studio.app.common.models import UserRole as UserRoleModel
 from studio.app.common.schemas.users import User
 
 
-async def get_current_user(
+def get_current_user(
     res: Response,
     ex_token: Optional[str] = Depends(APIKeyHeader(name="ExToken", auto_error=False)),
     credential: HTTPAuthorizationCredentials = Depends(HTTPBearer(auto_error=False)),
@@ -58,7 +58,7 @@ async def get_current_user(
         )
 
 
-async def get_admin_user(current_user: User = Depends(get_current_user)):
+def get_admin_user(current_user: User = Depends(get_current_user)):
     if current_user.is_admin:
         return current_user
     else:
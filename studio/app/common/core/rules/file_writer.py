@@ -1,6 +1,10 @@
 import h5py
 
+from studio.app.common.core.rules.result_handoff import ResultHandoff
 from studio.app.common.core.snakemake.smk import Rule
+from studio.app.common.core.utils.pickle_handler import PickleWriter
+from studio.app.common.core.workflow.node_cache import NodeCache
+from studio.app.common.core.workflow.node_status_index import NodeStatusIndex
 from studio.app.common.dataclass import CsvData, ImageData, TimeSeriesData
 from studio.app.const import FILETYPE
 from studio.app.optinist.core.nwb.nwb import NWBDATASET
@@ -10,6 +14,33 @@ from studio.app.optinist.routers.mat import MatGetter
 
 
 class FileWriter:
+    @classmethod
+    def write(cls, rule_config: Rule):
+        """
+        Write the output pickle and status of a data node
+        """
+        outputfile = None
+        if rule_config.type in [FILETYPE.CSV, FILETYPE.BEHAVIOR]:
+            outputfile = cls.csv(rule_config, rule_config.type)
+        elif rule_config.type == FILETYPE.IMAGE:
+            outputfile = cls.image(rule_config)
+        elif rule_config.type == FILETYPE.HDF5:
+            outputfile = cls.hdf5(rule_config)
+        elif rule_config.type == FILETYPE.MATLAB:
+            outputfile = cls.mat(rule_config)
+        elif rule_config.type == FILETYPE.MICROSCOPE:
+            outputfile = cls.microscope(rule_config)
+        else:
+            assert False, f"Invalid file type: {rule_config.type}"
+
+        PickleWriter.write(rule_config.output, outputfile)
+        ResultHandoff.put(rule_config.output, outputfile)
+        NodeStatusIndex.write_success(
+            rule_config.output,
+            outputfile,
+            NodeCache.data_key(rule_config.output, rule_config.input),
+        )
+
     @classmethod
     def csv(cls, rule_config: Rule, nodeType):
         info = {
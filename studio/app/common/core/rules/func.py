@@ -24,6 +24,10 @@ if __name__ == "__main__":
 
     rule_config.input = snakemake.input
     rule_config.output = snakemake.output[0]
+    rule_config.resources = {
+        **(rule_config.resources or {}),
+        "threads": snakemake.threads,
+    }
     run_script_path = sys.argv[0]
 
     Runner.run(rule_config, last_output, run_script_path)
@@ -0,0 +1,69 @@
+import copy
+import os
+from collections import OrderedDict
+
+from studio.app.common.core.utils.pickle_handler import PickleReader
+
+
+class ResultHandoff:
+    """
+    Node results kept in memory by the rule worker that produced them,
+    and handed to the downstream rules run by the same worker instead of
+    reading back their pickle (which is still written for the UI).
+
+    Disabled (max_entries 0) outside of rule workers.
+    An entry is used only while its pickle is unchanged (stat), results
+    rewritten by other processes (e.g. edit ROI) are read from the file.
+    Entries are deep copied on handoff, functions may modify their inputs.
+    """
+
+    __entries = OrderedDict()
+    __max_entries = 0
+
+    @classmethod
+    def enable(cls, max_entries: int) -> None:
+        cls.__max_entries = max_entries
+        cls.clear()
+
+    @classmethod
+    def clear(cls) -> None:
+        cls.__entries.clear()
+
+    @classmethod
+    def put(cls, pickle_path: str, output_info: dict) -> None:
+        """
+        Keep output_info just written to pickle_path
+        """
+        if cls.__max_entries <= 0:
+            return
+
+        # the runner merges the nwb dicts of results after they are written
+        output_info = dict(output_info)
+        if "nwbfile" in output_info:
+            output_info["nwbfile"] = _copy_dicts(output_info["nwbfile"])
+
+        cls.__entries[pickle_path] = (_stat_key(pickle_path), output_info)
+        cls.__entries.move_to_end(pickle_path)
+        while len(cls.__entries) > cls.__max_entries:
+            cls.__entries.popitem(last=False)
+
+    @classmethod
+    def read(cls, pickle_path: str):
+        entry = cls.__entries.get(pickle_path)
+        if entry is not None and entry[0] == _stat_key(pickle_path):
+            cls.__entries.move_to_end(pickle_path)
+            return copy.deepcopy(entry[1])
+
+        return PickleReader.read(pickle_path)
+
+
+def _stat_key(path: str) -> tuple:
+    # pickles are replaced atomically, a new file has a new inode
+    stat = os.stat(path)
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+def _copy_dicts(value):
+    if isinstance(value, dict):
+        return {k: _copy_dicts(v) for k, v in value.items()}
+    return value
@@ -0,0 +1,73 @@
+"""
+Long-lived rule worker, started by RuleWorkerPool with the python of a conda env:
+
+    python -m studio.app.common.core.rules.rule_worker {socket fd} {handoff entries}
+
+Rules (details, input, output, last_output, threads of a Snakefile rule) are received
+over the socket and executed in-process, so that imports stay warm between
+rules. None (success) or the formatted traceback is sent back for each rule.
+The last results are kept in memory for the downstream rules (ResultHandoff).
+"""
+import sys
+import traceback
+from multiprocessing.connection import Connection
+
+from studio.app.common.core.rules.file_writer import FileWriter
+from studio.app.common.core.rules.result_handoff import ResultHandoff
+from studio.app.common.core.rules.runner import Runner
+from studio.app.common.core.snakemake.snakemake_reader import RuleConfigReader
+from studio.app.common.core.utils.filepath_creater import join_filepath
+from studio.app.common.core.workflow.workflow import NodeType, NodeTypeUtil
+from studio.app.const import FILETYPE
+from studio.app.dir_path import DIRPATH
+
+# prefix of the run script path recorded in the pid file by worker rules
+RUN_SCRIPT_PREFIX = "rule_worker:"
+
+
+def run_rule(
+    details: dict, input: list, output: list, last_output: list, threads: int = 1
+) -> None:
+    """
+    Same as the rules/data.py and rules/func.py scripts
+    """
+    rule_config = RuleConfigReader.read(details)
+    rule_config.output = output[0]
+
+    if NodeTypeUtil.check_nodetype_from_filetype(rule_config.type) == NodeType.DATA:
+        if rule_config.type in [FILETYPE.IMAGE]:
+            rule_config.input = input
+        else:
+            rule_config.input = input[0]
+
+        FileWriter.write(rule_config)
+    else:
+        rule_config.input = input
+        rule_config.resources = {**(rule_config.resources or {}), "threads": threads}
+        last_output = [join_filepath([DIRPATH.OUTPUT_DIR, x]) for x in last_output]
+
+        Runner.run(rule_config, last_output, f"{RUN_SCRIPT_PREFIX}{rule_config.output}")
+
+
+def main(fd: int, handoff_entries: int) -> None:
+    conn = Connection(fd)
+    ResultHandoff.enable(handoff_entries)
+
+    while True:
+        try:
+            rule = conn.recv()
+        except EOFError:
+            # the pool was closed
+            break
+
+        try:
+            run_rule(*rule)
+            conn.send(None)
+        except Exception:
+            conn.send(traceback.format_exc())
+
+    conn.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]), int(sys.argv[2]))
@@ -14,10 +14,13 @@ from studio.app.common.core.experiment.experiment import ExptOutputPathIds
 from studio.app.common.core.experiment.experiment_reader import ExptConfigReader
 from studio.app.common.core.experiment.experiment_writer import ExptConfigWriter
 from studio.app.common.core.logger import AppLogger
+from studio.app.common.core.rules.result_handoff import ResultHandoff
 from studio.app.common.core.snakemake.smk import Rule
 from studio.app.common.core.utils.file_reader import JsonReader
 from studio.app.common.core.utils.filepath_creater import join_filepath
 from studio.app.common.core.utils.pickle_handler import PickleReader, PickleWriter
+from studio.app.common.core.workflow.node_cache import NodeCache
+from studio.app.common.core.workflow.node_status_index import NodeStatusIndex
 from studio.app.common.schemas.workflow import WorkflowPIDFileData
 from studio.app.const import DATE_FORMAT
 from studio.app.dir_path import DIRPATH
@@ -26,6 +29,7 @@ from studio.app.optinist.core.nwb.nwb_creater import (
     overwrite_nwbfile,
     save_nwb,
 )
+from studio.app.optinist.core.nwb.nwb_dataio import NWBDataIO
 from studio.app.wrappers import wrapper_dict
 
 logger = AppLogger.get_logger()
@@ -54,25 +58,57 @@ class Runner:
 
             cls.__set_func_start_timestamp(os.path.dirname(__rule.output))
 
-            # output_info
-            output_info = cls.__execute_function(
-                __rule.path,
-                __rule.params,
-                nwbfile.get("input"),
-                os.path.dirname(__rule.output),
-                input_info,
-            )
-
-            # nwbfileの設定
-            output_info["nwbfile"] = cls.__save_func_nwb(
-                f"{__rule.output.split('.')[0]}.nwb",
-                __rule.type,
-                nwbfile,
-                output_info,
-            )
-
-            # 各関数での結果を保存
-            PickleWriter.write(__rule.output, output_info)
+            # results of the same function, params and inputs are reused
+            cache_key, output_info = None, None
+            if NodeCache.enabled():
+                node_cache = NodeCache()
+                input_dirpaths = {
+                    NodeCache.input_key(path): os.path.dirname(path)
+                    for path in __rule.input
+                }
+                cache_key = NodeCache.node_key(
+                    __rule,
+                    nwbfile.get("input"),
+                    list(input_dirpaths),
+                    cls.__get_function(__rule.path),
+                )
+                # force-run nodes are recomputed (and their cache entry kept)
+                if not __rule.forcerun:
+                    output_info = node_cache.restore(
+                        cache_key, __rule.output, input_dirpaths
+                    )
+
+            if output_info is None:
+                started_at_ns = time.time_ns()
+
+                # output_info
+                output_info = cls.__execute_function(
+                    __rule.path,
+                    __rule.params,
+                    nwbfile.get("input"),
+                    os.path.dirname(__rule.output),
+                    input_info,
+                    (__rule.resources or {}).get("threads", 1),
+                )
+
+                # nwbfileの設定
+                output_info["nwbfile"] = cls.__save_func_nwb(
+                    f"{__rule.output.split('.')[0]}.nwb",
+                    __rule.type,
+                    nwbfile,
+                    output_info,
+                )
+
+                # 各関数での結果を保存
+                PickleWriter.write(__rule.output, output_info)
+
+                if cache_key is not None:
+                    node_cache.store(
+                        cache_key, __rule.output, input_dirpaths, started_at_ns
+                    )
+
+            ResultHandoff.put(__rule.output, output_info)
+            NodeStatusIndex.write_success(__rule.output, output_info, cache_key)
 
             # NWB全体保存
             if __rule.output in last_output:
@@ -93,6 +129,7 @@ class Runner:
 
             # save error info to node pickle data.
             PickleWriter.write_error(__rule.output, e)
+            NodeStatusIndex.write_error(__rule.output, "\n".join(err_msg))
 
     @classmethod
     def __get_pid_file_path(cls, workspace_id: str, unique_id: str) -> str:
@@ -162,26 +199,40 @@ class Runner:
     @classmethod
     def save_all_nwb(cls, save_path, all_nwbfile):
         input_nwbfile = all_nwbfile["input"]
-        all_nwbfile.pop("input")
         nwbconfig = {}
-        for x in all_nwbfile.values():
-            nwbconfig = merge_nwbfile(nwbconfig, x)
+        for key, x in all_nwbfile.items():
+            if key != "input":
+                nwbconfig = merge_nwbfile(nwbconfig, x)
         # 同一のnwbfileに対して、複数の関数を実行した場合、h5pyエラーが発生する
         lock_path = save_path + ".lock"
         timeout = 30  # ロック取得のタイムアウト時間（秒）
         with FileLock(lock_path, timeout=timeout):
             # ロックが取得できたら、ファイルに書き込みを行う
             if os.path.exists(save_path):
-                overwrite_nwbfile(save_path, nwbconfig)
+                overwrite_nwbfile(
+                    save_path,
+                    nwbconfig,
+                    NWBDataIO.from_config(input_nwbfile.get("dataset_io")),
+                )
             else:
                 save_nwb(save_path, input_nwbfile, nwbconfig)
 
     @classmethod
-    def __execute_function(cls, path, params, nwb_params, output_dir, input_info):
-        wrapper = cls.__dict2leaf(wrapper_dict, path.split("/"))
-        func = copy.deepcopy(wrapper["function"])
+    def __get_function(cls, path):
+        return cls.__dict2leaf(wrapper_dict, path.split("/"))["function"]
+
+    @classmethod
+    def __execute_function(
+        cls, path, params, nwb_params, output_dir, input_info, threads=1
+    ):
+        func = copy.deepcopy(cls.__get_function(path))
+        # threads: cores allotted to the node by snakemake (multi-core wrappers)
         output_info = func(
-            params=params, nwbfile=nwb_params, output_dir=output_dir, **input_info
+            params=params,
+            nwbfile=nwb_params,
+            output_dir=output_dir,
+            threads=threads,
+            **input_info,
         )
         del func
         gc.collect()
@@ -198,7 +249,7 @@ class Runner:
     def read_input_info(cls, input_files):
         input_info = {}
         for filepath in input_files:
-            load_data = PickleReader.read(filepath)
+            load_data = ResultHandoff.read(filepath)
 
             # validate load_data content
             assert PickleReader.check_is_valid_node_pickle(
@@ -0,0 +1,257 @@
+import atexit
+import os
+import signal
+import socket
+import subprocess
+import sys
+import threading
+from collections import deque
+from glob import glob
+from multiprocessing.connection import Connection
+from typing import Dict, List, Optional
+
+from pydantic import BaseSettings, Field
+
+from studio.app.common.core.logger import AppLogger
+from studio.app.common.core.rules.rule_worker import RUN_SCRIPT_PREFIX
+from studio.app.common.core.snakemake.smk_utils import SmkUtils
+from studio.app.common.core.workflow.workflow import NodeType, NodeTypeUtil
+from studio.app.dir_path import DIRPATH
+from studio.app.wrappers import wrapper_dict
+
+logger = AppLogger.get_logger()
+
+
+class RuleWorkerConfig(BaseSettings):
+    # conda envs (wrapper conda_name) whose rules run in warm workers,
+    # rules of the other envs are isolated in their own snakemake script process.
+    # CaImAn nodes reuse their local cluster only when run by warm workers
+    # (see caiman/cluster.py)
+    RULE_WORKER_CONDA_ENVS: str = Field(
+        default="optinist,microscope,caiman", env="RULE_WORKER_CONDA_ENVS"
+    )
+    # idle workers kept per env
+    RULE_WORKER_MAX_IDLE: int = Field(default=2, env="RULE_WORKER_MAX_IDLE")
+    # rules run by a worker before it is replaced (releases leaked memory)
+    RULE_WORKER_MAX_TASKS: int = Field(default=50, env="RULE_WORKER_MAX_TASKS")
+    # results kept in memory by each worker for downstream rules (0: disabled)
+    RULE_WORKER_HANDOFF_ENTRIES: int = Field(
+        default=4, env="RULE_WORKER_HANDOFF_ENTRIES"
+    )
+
+    class Config:
+        env_file = f"{DIRPATH.CONFIG_DIR}/.env"
+        env_file_encoding = "utf-8"
+
+
+RULE_WORKER_CONFIG = RuleWorkerConfig()
+
+
+class RuleWorker:
+    """
+    A rule_worker process and the socket connected to it
+    """
+
+    MODULE = "studio.app.common.core.rules.rule_worker"
+    STOP_TIMEOUT = 10  # sec
+
+    def __init__(self, python: str):
+        # the env is activated as `conda activate` does for snakemake scripts
+        bin_dirpath = os.path.dirname(python)
+        env = dict(
+            os.environ,
+            PATH=f"{bin_dirpath}{os.pathsep}{os.environ.get('PATH', '')}",
+            PYTHONPATH=DIRPATH.ROOT_DIR,
+        )
+        if python != sys.executable:
+            env["CONDA_PREFIX"] = os.path.dirname(bin_dirpath)
+
+        parent_sock, child_sock = socket.socketpair()
+        try:
+            self.process = subprocess.Popen(
+                [
+                    python,
+                    "-m",
+                    self.MODULE,
+                    str(child_sock.fileno()),
+                    str(RULE_WORKER_CONFIG.RULE_WORKER_HANDOFF_ENTRIES),
+                ],
+                cwd=DIRPATH.ROOT_DIR,
+                env=env,
+                pass_fds=[child_sock.fileno()],
+            )
+        except Exception:
+            parent_sock.close()
+            raise
+        finally:
+            child_sock.close()
+
+        self.conn = Connection(parent_sock.detach())
+        self.tasks = 0
+        # results held by the worker (see ResultHandoff)
+        self.outputs = deque(maxlen=RULE_WORKER_CONFIG.RULE_WORKER_HANDOFF_ENTRIES)
+
+    def run(self, rule: tuple) -> Optional[str]:
+        """
+        Run rule in the worker, returns the traceback of a failed rule
+        (raises EOFError or OSError if the worker terminated)
+        """
+        self.tasks += 1
+        self.conn.send(rule)
+        error = self.conn.recv()
+        if error is None:
+            self.outputs.extend(rule[2])
+        return error
+
+    @property
+    def exit_status(self) -> str:
+        returncode = self.process.poll()
+        if returncode is not None and returncode < 0:
+            # same as the CalledProcessError of killed snakemake scripts
+            return str(signal.Signals(-returncode))
+        return f"exit status {returncode}"
+
+    def close(self) -> None:
+        self.conn.close()
+        try:
+            self.process.wait(timeout=self.STOP_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+
+
+class RuleWorkerPool:
+    """
+    Long-lived worker processes per conda env, executing Snakefile rules
+    in-process (see rule_worker.py) instead of one interpreter per rule.
+
+    Workers are started on demand (one per concurrently running rule),
+    and at most RULE_WORKER_MAX_IDLE of them are kept warm per env.
+    A rule is given to the worker holding its inputs in memory if it is idle,
+    so that chains of nodes pass results without reading back pickles.
+    """
+
+    __idle: Dict[str, List[RuleWorker]] = {}
+    __lock = threading.Lock()
+
+    @classmethod
+    def executable(cls, details: dict, use_conda: bool) -> Optional[str]:
+        """
+        Python of the worker running the rule of details,
+        None if the rule is run by the snakemake script
+        """
+        if os.name != "posix":
+            return None
+        if NodeTypeUtil.check_nodetype_from_filetype(details["type"]) == NodeType.DATA:
+            return sys.executable
+
+        wrapper = SmkUtils.dict2leaf(wrapper_dict, details["path"].split("/"))
+        conda_name = wrapper.get("conda_name")
+        if conda_name is not None and conda_name not in cls.__conda_envs():
+            return None
+
+        conda_filepath = SmkUtils.conda(details) if use_conda else None
+        if conda_filepath is None:
+            return sys.executable
+
+        return cls.__conda_python(conda_filepath)
+
+    @classmethod
+    def run(
+        cls,
+        python: str,
+        details: dict,
+        input: list,
+        output: list,
+        last_output: list,
+        threads: int = 1,
+    ) -> None:
+        rule = (details, list(input), list(output), list(last_output), threads)
+        worker = cls.__acquire(python, rule[1])
+
+        try:
+            error = worker.run(rule)
+        except (EOFError, OSError) as e:
+            worker.close()
+            # cancelled rules are identified by the signal and the pid file
+            raise RuntimeError(
+                f"Rule worker terminated with {worker.exit_status}. "
+                f"[{RUN_SCRIPT_PREFIX}{rule[2][0]}]"
+            ) from e
+
+        cls.__release(python, worker)
+        if error is not None:
+            raise RuntimeError(f"Rule failed in rule worker.\n{error}")
+
+    @classmethod
+    def shutdown(cls) -> None:
+        with cls.__lock:
+            workers = [w for idle in cls.__idle.values() for w in idle]
+            cls.__idle.clear()
+
+        for worker in workers:
+            worker.close()
+
+    @classmethod
+    def __acquire(cls, python: str, inputs: List[str]) -> RuleWorker:
+        with cls.__lock:
+            idle = cls.__idle.get(python, [])
+            # the worker holding inputs in memory first, then the last released
+            idle.sort(key=lambda w: any(path in w.outputs for path in inputs))
+            while idle:
+                worker = idle.pop()
+                if worker.process.poll() is None:
+                    return worker
+                worker.close()
+
+        logger.info(f"start rule worker: {python}")
+        return RuleWorker(python)
+
+    @classmethod
+    def __release(cls, python: str, worker: RuleWorker) -> None:
+        with cls.__lock:
+            idle = cls.__idle.setdefault(python, [])
+            if (
+                worker.tasks < RULE_WORKER_CONFIG.RULE_WORKER_MAX_TASKS
+                and len(idle) < RULE_WORKER_CONFIG.RULE_WORKER_MAX_IDLE
+            ):
+                idle.append(worker)
+                return
+
+        worker.close()
+
+    @classmethod
+    def __conda_envs(cls) -> List[str]:
+        return [
+            name.strip()
+            for name in RULE_WORKER_CONFIG.RULE_WORKER_CONDA_ENVS.split(",")
+            if name.strip()
+        ]
+
+    @classmethod
+    def __conda_python(cls, conda_filepath: str) -> Optional[str]:
+        """
+        Python of the env snakemake created for conda_filepath,
+        None until the env is created (by the first run of its rules)
+        """
+        if os.path.isdir(conda_filepath):
+            python = f"{conda_filepath}/bin/python"
+            return python if os.path.exists(python) else None
+
+        with open(conda_filepath, "rb") as f:
+            content = f.read()
+
+        # snakemake keeps a copy of the env file next to each env: {env}.yaml
+        conda_dirpath = f"{os.path.dirname(DIRPATH.STUDIO_DIR)}/.snakemake/conda"
+        for env_filepath in glob(f"{conda_dirpath}/*.yaml"):
+            python = f"{os.path.splitext(env_filepath)[0]}/bin/python"
+            if not os.path.exists(python):
+                continue
+            with open(env_filepath, "rb") as f:
+                if f.read() == content:
+                    return python
+
+        return None
+
+
+atexit.register(RuleWorkerPool.shutdown)
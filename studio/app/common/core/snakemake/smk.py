@@ -15,6 +15,9 @@ class Rule:
     hdf5Path: str = None
     matPath: str = None
     path: str = None
+    resources: dict = None
+    # node (or one of its inputs) is force-run, the node cache is not restored
+    forcerun: bool = False
 
 
 @dataclass
@@ -35,4 +38,7 @@ class SmkParam:
     forceall: bool
     forcetargets: bool
     lock: bool
+    warm_pool: bool = False
+    # memory budget of the run (0: memory available at start)
+    mem_mb: int = 0
     forcerun: List[ForceRun] = field(default_factory=list)
@@ -1,6 +1,6 @@
 import logging
 import os
-from typing import Dict
+from typing import Dict, Optional
 
 from studio.app.common.core.rules.runner import Runner
 from studio.app.common.core.utils.file_reader import Reader
@@ -8,6 +8,12 @@ from studio.app.common.core.utils.filepath_creater import (
     create_directory,
     join_filepath,
 )
+from studio.app.common.core.workflow.workflow import NodeRunStatus
+from studio.app.common.core.workflow.workflow_event import (
+    WorkflowEvent,
+    WorkflowEventBroker,
+    WorkflowEventType,
+)
 from studio.app.common.schemas.workflow import WorkflowErrorInfo
 from studio.app.dir_path import DIRPATH
 
@@ -85,6 +91,9 @@ class SmkStatusLogger:
         self.unique_id = unique_id
         self.logger: logging.Logger = __class__.get_logger(workspace_id, unique_id)
 
+        # running jobs of this workflow: {jobid: (node_id, output_path)}
+        self.jobs: Dict[int, tuple] = {}
+
     def log_handler(self, msg: Dict[str, str] = None):
         """
         msg:
@@ -92,6 +101,12 @@ class SmkStatusLogger:
                 "job_info": jobの始まりを通知。inputやoutputがある
                 "job_finished": jobの終了を通知。
         """
+        # Publish node status transitions
+        if msg.get("level") == "job_info":
+            self.__on_job_started(msg)
+        elif msg.get("level") in ["job_finished", "job_error"]:
+            self.__on_job_finished(msg)
+
         # pass
         # # has error.
         # if "exception" in msg:
@@ -126,6 +141,54 @@ class SmkStatusLogger:
                     else:
                         self.logger.error(msg)
 
+    def __get_node_id(self, output_path: str) -> Optional[str]:
+        """
+        output_path format
+          - {DIRPATH.OUTPUT_DIR}/{workspace_id}/{unique_id}/{node_id}/{algo}.pkl
+        Returns None for outputs of other workflows sharing the snakemake logger.
+        """
+        splitted_path = output_path.replace("\\", "/").split("/")
+        if splitted_path[-4:-2] == [self.workspace_id, self.unique_id]:
+            return splitted_path[-2]
+        return None
+
+    def __on_job_started(self, msg: dict):
+        outputs = msg.get("output") or []
+        node_id = self.__get_node_id(outputs[0]) if outputs else None
+        if node_id is None:
+            return
+
+        self.jobs[msg.get("jobid")] = (node_id, outputs[0])
+        WorkflowEventBroker.publish(
+            self.workspace_id,
+            self.unique_id,
+            WorkflowEvent(
+                type=WorkflowEventType.NODE_STARTED,
+                nodeId=node_id,
+                status=NodeRunStatus.RUNNING.value,
+            ),
+        )
+
+    def __on_job_finished(self, msg: dict):
+        job = self.jobs.get(msg.get("jobid"))
+        if job is None:
+            return
+
+        node_id, output_path = job
+        if msg["level"] == "job_error":
+            if self.__get_node_id((msg.get("output") or [""])[0]) != node_id:
+                return
+        elif not os.path.exists(output_path):
+            # jobid of another workflow sharing the snakemake logger
+            return
+
+        self.jobs.pop(msg.get("jobid"))
+        WorkflowEventBroker.publish(
+            self.workspace_id,
+            self.unique_id,
+            WorkflowEvent(type=WorkflowEventType.NODE_FINISHED, nodeId=node_id),
+        )
+
     def clean_up(self):
         """
         remove all handlers from this logger
@@ -1,5 +1,7 @@
 import os
 
+import psutil
+
 from studio.app.common.core.utils.filepath_creater import join_filepath
 from studio.app.common.core.utils.filepath_finder import find_condaenv_filepath
 from studio.app.common.core.workflow.workflow import NodeType, NodeTypeUtil
@@ -9,6 +11,9 @@ from studio.app.wrappers import wrapper_dict
 
 
 class SmkUtils:
+    # mem_mb: MB, runtime: minutes (threads are set by the threads directive)
+    RESOURCES = ("mem_mb", "runtime")
+
     @classmethod
     def input(cls, details):
         if NodeTypeUtil.check_nodetype_from_filetype(details["type"]) == NodeType.DATA:
@@ -40,6 +45,27 @@ class SmkUtils:
 
         return None
 
+    @classmethod
+    def threads(cls, details) -> int:
+        return int((details.get("resources") or {}).get("threads", 1))
+
+    @classmethod
+    def resources(cls, details, mem_mb_budget: int = None) -> dict:
+        """
+        Snakemake resources of the rule (declared in wrappers/**/resources),
+        a rule never requests more memory than the budget of the run
+        """
+        declared = details.get("resources") or {}
+        resources = {k: int(declared[k]) for k in cls.RESOURCES if k in declared}
+
+        if mem_mb_budget and resources.get("mem_mb", 0) > mem_mb_budget:
+            resources["mem_mb"] = mem_mb_budget
+        return resources
+
+    @classmethod
+    def available_mem_mb(cls) -> int:
+        return int(psutil.virtual_memory().available // 2**20)
+
     @classmethod
     def dict2leaf(cls, root_dict: dict, path_list):
         path = path_list.pop(0)
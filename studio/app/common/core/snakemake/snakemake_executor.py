@@ -7,8 +7,15 @@ from snakemake import snakemake
 from studio.app.common.core.logger import AppLogger
 from studio.app.common.core.snakemake.smk import SmkParam
 from studio.app.common.core.snakemake.smk_status_logger import SmkStatusLogger
+from studio.app.common.core.snakemake.smk_utils import SmkUtils
 from studio.app.common.core.utils.filepath_creater import get_pickle_file, join_filepath
-from studio.app.common.core.workflow.workflow import Edge, Node
+from studio.app.common.core.utils.pickle_handler import PickleWriter
+from studio.app.common.core.workflow.workflow import Edge, Node, WorkflowRunStatus
+from studio.app.common.core.workflow.workflow_event import (
+    WorkflowEvent,
+    WorkflowEventBroker,
+    WorkflowEventType,
+)
 from studio.app.dir_path import DIRPATH
 
 logger = AppLogger.get_logger()
@@ -16,32 +23,63 @@ logger = AppLogger.get_logger()
 
 def snakemake_execute(workspace_id: str, unique_id: str, params: SmkParam):
     smk_logger = SmkStatusLogger(workspace_id, unique_id)
-
-    result = snakemake(
-        DIRPATH.SNAKEMAKE_FILEPATH,
-        forceall=params.forceall,
-        cores=params.cores,
-        use_conda=params.use_conda,
-        workdir=f"{os.path.dirname(DIRPATH.STUDIO_DIR)}",
-        configfiles=[
-            join_filepath(
-                [
-                    DIRPATH.OUTPUT_DIR,
-                    workspace_id,
-                    unique_id,
-                    DIRPATH.SNAKEMAKE_CONFIG_YML,
-                ]
-            )
-        ],
-        log_handler=[smk_logger.log_handler],
-    )
-
-    if result:
-        logger.info("snakemake_execute succeeded.")
-    else:
-        logger.error("snakemake_execute failed..")
-
-    smk_logger.clean_up()
+    WorkflowEventBroker.reset(workspace_id, unique_id)
+
+    # rules run concurrently as long as their declared memory fits in the budget
+    mem_mb = params.mem_mb or SmkUtils.available_mem_mb()
+
+    result = False
+    try:
+        result = snakemake(
+            DIRPATH.SNAKEMAKE_FILEPATH,
+            forceall=params.forceall,
+            cores=params.cores,
+            resources={"mem_mb": mem_mb},
+            use_conda=params.use_conda,
+            # rules of the warm worker pool are run by threads of this process
+            force_use_threads=params.warm_pool,
+            workdir=f"{os.path.dirname(DIRPATH.STUDIO_DIR)}",
+            configfiles=[
+                join_filepath(
+                    [
+                        DIRPATH.OUTPUT_DIR,
+                        workspace_id,
+                        unique_id,
+                        DIRPATH.SNAKEMAKE_CONFIG_YML,
+                    ]
+                )
+            ],
+            config={
+                "use_conda": params.use_conda,
+                "warm_pool": params.warm_pool,
+                "mem_mb": mem_mb,
+            },
+            log_handler=[smk_logger.log_handler],
+        )
+    except Exception as e:
+        # e.g. workflow, lock or config errors
+        logger.error(e, exc_info=True)
+    finally:
+        if result:
+            logger.info("snakemake_execute succeeded.")
+        else:
+            logger.error("snakemake_execute failed..")
+
+        smk_logger.clean_up()
+
+        # listeners of the workflow wait for this event in any case
+        WorkflowEventBroker.publish(
+            workspace_id,
+            unique_id,
+            WorkflowEvent(
+                type=WorkflowEventType.WORKFLOW_FINISHED,
+                status=(
+                    WorkflowRunStatus.SUCCESS.value
+                    if result
+                    else WorkflowRunStatus.ERROR.value
+                ),
+            ),
+        )
 
 
 def delete_dependencies(
@@ -78,8 +116,7 @@ def delete_dependencies(
         )
         # logger.debug(pickle_filepath)
 
-        if os.path.exists(pickle_filepath):
-            os.remove(pickle_filepath)
+        PickleWriter.remove(pickle_filepath)
 
         # 全てのedgeを見て、node_idがsourceならtargetをqueueに追加する
         for edge in edgeDict.values():
@@ -14,6 +14,8 @@ class RuleConfigReader:
             hdf5Path=rule["hdf5Path"],
             matPath=rule["matPath"],
             path=rule["path"],
+            resources=rule.get("resources"),
+            forcerun=rule.get("forcerun", False),
         )
 
 
@@ -26,5 +28,7 @@ class SmkParamReader:
             forceall=params["forceall"],
             forcetargets=params["forcetargets"],
             lock=params["lock"],
+            warm_pool=params.get("warm_pool", False),
+            mem_mb=params.get("mem_mb", 0),
             forcerun=params["forcerun"] if "forcerun" in params else [],
         )
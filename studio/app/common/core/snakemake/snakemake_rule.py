@@ -2,7 +2,9 @@ from typing import Dict
 
 from studio.app.common.core.snakemake.smk import Rule
 from studio.app.common.core.snakemake.smk_builder import RuleBuilder
+from studio.app.common.core.utils.config_handler import ConfigReader
 from studio.app.common.core.utils.filepath_creater import get_pickle_file
+from studio.app.common.core.utils.filepath_finder import find_resources_filepath
 from studio.app.common.core.workflow.workflow import Edge, Node, NodeType
 from studio.app.common.core.workflow.workflow_params import get_typecheck_params
 from studio.app.const import FILETYPE
@@ -101,6 +103,9 @@ class SmkRule:
             .set_output(algo_output)
             .set_path(self._node.data.path)
             .set_type(self._node.data.label)
+            .set_resources(
+                ConfigReader.read(find_resources_filepath(self._node.data.label))
+            )
             .build()
         )
 
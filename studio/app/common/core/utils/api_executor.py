@@ -0,0 +1,134 @@
+import asyncio
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+
+from anyio import to_thread
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseSettings, Field
+
+from studio.app.common.core.logger import AppLogger
+from studio.app.dir_path import DIRPATH
+
+logger = AppLogger.get_logger()
+
+
+class ApiExecutorConfig(BaseSettings):
+    # threads running blocking work of the api (sync routes and dependencies)
+    API_THREAD_POOL_SIZE: int = Field(default=40, env="API_THREAD_POOL_SIZE")
+    # processes running cpu-heavy work of the api (0: run in the thread pool)
+    API_PROCESS_POOL_SIZE: int = Field(default=2, env="API_PROCESS_POOL_SIZE")
+    # low priority processes running background work (e.g. image pyramids),
+    # so that it never delays the requests (0: background work is not run)
+    API_BACKGROUND_POOL_SIZE: int = Field(default=1, env="API_BACKGROUND_POOL_SIZE")
+    API_BACKGROUND_NICENESS: int = Field(default=10, env="API_BACKGROUND_NICENESS")
+
+    class Config:
+        env_file = f"{DIRPATH.CONFIG_DIR}/.env"
+        env_file_encoding = "utf-8"
+
+
+API_EXECUTOR_CONFIG = ApiExecutorConfig()
+
+
+class ApiExecutor:
+    """
+    Execution model of the api, so that slow requests do not stall the others:
+    - blocking work (file, db) runs in the bounded thread pool,
+      routes and dependencies doing it are declared as sync `def`
+    - cpu-heavy work (tiff to json, nwb reads) runs in the process pool,
+      awaited by `async def` routes with `ApiExecutor.run_in_process`
+    - long work not needed by the current request runs in the low priority
+      background pool (`ApiExecutor.submit_in_background`)
+    """
+
+    __process_pool: ProcessPoolExecutor = None
+    __background_pool: ProcessPoolExecutor = None
+    # pools are created lazily, from threads of the api
+    __pools_lock = threading.Lock()
+
+    @classmethod
+    def startup(cls) -> None:
+        """
+        Bound the thread pool (of the running event loop)
+        """
+        limiter = to_thread.current_default_thread_limiter()
+        limiter.total_tokens = API_EXECUTOR_CONFIG.API_THREAD_POOL_SIZE
+
+    @classmethod
+    def shutdown(cls) -> None:
+        with cls.__pools_lock:
+            pools = [cls.__process_pool, cls.__background_pool]
+            cls.__process_pool = None
+            cls.__background_pool = None
+
+        for pool in pools:
+            if pool is None:
+                continue
+            if sys.version_info >= (3, 9):
+                pool.shutdown(cancel_futures=True)
+            else:
+                pool.shutdown(wait=False)
+
+    @classmethod
+    async def run_in_process(cls, func: Callable, *args, **kwargs) -> Any:
+        """
+        Run func (a picklable module-level function) in the process pool
+        """
+        if API_EXECUTOR_CONFIG.API_PROCESS_POOL_SIZE <= 0:
+            return await run_in_threadpool(func, *args, **kwargs)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            cls.__get_process_pool(), partial(func, *args, **kwargs)
+        )
+
+    @classmethod
+    def submit_in_background(cls, func: Callable, *args) -> Optional[Future]:
+        """
+        Run func in the background pool (not awaited), errors are logged.
+        Nothing is run without background pool.
+        """
+        if API_EXECUTOR_CONFIG.API_BACKGROUND_POOL_SIZE <= 0:
+            return None
+
+        future = cls.__get_background_pool().submit(func, *args)
+        future.add_done_callback(cls.__log_error)
+        return future
+
+    @staticmethod
+    def __log_error(future: Future) -> None:
+        if not future.cancelled() and future.exception() is not None:
+            logger.error(future.exception(), exc_info=future.exception())
+
+    @classmethod
+    def __get_process_pool(cls) -> ProcessPoolExecutor:
+        with cls.__pools_lock:
+            if cls.__process_pool is None:
+                # not forked, the server process runs threads
+                cls.__process_pool = ProcessPoolExecutor(
+                    max_workers=API_EXECUTOR_CONFIG.API_PROCESS_POOL_SIZE,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return cls.__process_pool
+
+    @classmethod
+    def __get_background_pool(cls) -> ProcessPoolExecutor:
+        with cls.__pools_lock:
+            if cls.__background_pool is None:
+                cls.__background_pool = ProcessPoolExecutor(
+                    max_workers=API_EXECUTOR_CONFIG.API_BACKGROUND_POOL_SIZE,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_lower_priority,
+                    initargs=(API_EXECUTOR_CONFIG.API_BACKGROUND_NICENESS,),
+                )
+            return cls.__background_pool
+
+
+def _lower_priority(niceness: int) -> None:
+    if hasattr(os, "nice"):
+        os.nice(niceness)
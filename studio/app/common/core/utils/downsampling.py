@@ -0,0 +1,121 @@
+from typing import Optional, Tuple
+
+import numpy as np
+
+from studio.app.common.schemas.outputs import DownsampleMethod
+
+
+def downsample_indices(
+    values: np.ndarray,
+    max_points: Optional[int],
+    method: DownsampleMethod = DownsampleMethod.MINMAX,
+) -> np.ndarray:
+    """
+    Frame indices of each row of values (rows, frames), sorted,
+    downsampled to about max_points points (all frames if None)
+    """
+    if method == DownsampleMethod.LTTB:
+        return lttb_indices(values, max_points)
+    return minmax_indices(values, max_points)
+
+
+def minmax_indices(values: np.ndarray, max_points: Optional[int]) -> np.ndarray:
+    """
+    Min/max envelope: the min and max of each bucket of frames are kept,
+    so that peaks of long traces are not lost.
+    """
+    n_rows, n_frames = values.shape
+    if not max_points or n_frames <= max_points:
+        return np.broadcast_to(np.arange(n_frames), values.shape)
+
+    n_buckets = max(1, max_points // 2)
+    bucket = -(-n_frames // n_buckets)
+    n_buckets = -(-n_frames // bucket)
+    pad = n_buckets * bucket - n_frames
+
+    # padded frames are never selected (the last bucket has a frame)
+    buckets = np.pad(
+        values.astype(float), ((0, 0), (0, pad)), constant_values=np.inf
+    ).reshape(n_rows, n_buckets, bucket)
+    argmin = buckets.argmin(axis=2)
+    buckets[:, -1, bucket - pad :] = -np.inf
+    argmax = buckets.argmax(axis=2)
+
+    offsets = np.arange(n_buckets) * bucket
+    indices = np.concatenate([argmin + offsets, argmax + offsets], axis=1)
+    return np.sort(indices, axis=1)
+
+
+def lttb_indices(values: np.ndarray, max_points: Optional[int]) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets, vectorized over rows: the first and last
+    frames are kept, and the frame of each bucket forming the largest
+    triangle with the previous selected frame and the mean of the next bucket.
+    Frames are equally spaced on x, NaN frames are selected only if the whole
+    bucket is NaN.
+    """
+    n_rows, n_frames = values.shape
+    if not max_points or n_frames <= max_points:
+        return np.broadcast_to(np.arange(n_frames), values.shape)
+
+    max_points = max(max_points, 3)
+    y = values.astype(float)
+    rows = np.arange(n_rows)
+
+    # buckets of the frames between the first and the last
+    edges = np.linspace(1, n_frames - 1, max_points - 1).astype(int)
+    edges = np.append(edges, n_frames)
+
+    indices = np.empty((n_rows, max_points), dtype=int)
+    indices[:, 0] = 0
+    indices[:, -1] = n_frames - 1
+
+    for i in range(max_points - 2):
+        start, stop = edges[i], edges[i + 1]
+        next_start, next_stop = edges[i + 1], edges[i + 2]
+
+        next_y = y[:, next_start:next_stop]
+        with np.errstate(invalid="ignore"):
+            next_y = np.nansum(next_y, axis=1) / np.sum(~np.isnan(next_y), axis=1)
+        next_x = (next_start + next_stop - 1) / 2
+
+        prev_x = indices[:, i]
+        prev_y = y[rows, prev_x]
+
+        # doubled triangle areas of the frames of the bucket
+        x = np.arange(start, stop)
+        area = np.abs(
+            (prev_x - next_x)[:, np.newaxis]
+            * (y[:, start:stop] - prev_y[:, np.newaxis])
+            - (prev_x[:, np.newaxis] - x) * (next_y - prev_y)[:, np.newaxis]
+        )
+        area[np.isnan(area)] = -1
+        indices[:, i + 1] = start + area.argmax(axis=1)
+
+    return indices
+
+
+def block_reduce(
+    values: np.ndarray, max_rows: int, max_cols: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Mean of blocks of a 2D matrix, to at most (max_rows, max_cols).
+    Returns the reduced matrix and the first row and column of each block.
+    """
+    n_rows, n_cols = values.shape
+    row_step = max(1, -(-n_rows // max(1, max_rows)))
+    col_step = max(1, -(-n_cols // max(1, max_cols)))
+
+    out_rows, out_cols = -(-n_rows // row_step), -(-n_cols // col_step)
+    blocks = np.pad(
+        values.astype(float),
+        ((0, out_rows * row_step - n_rows), (0, out_cols * col_step - n_cols)),
+        constant_values=np.nan,
+    ).reshape(out_rows, row_step, out_cols, col_step)
+
+    # nanmean, without warnings for all NaN blocks
+    valid = ~np.isnan(blocks)
+    with np.errstate(invalid="ignore"):
+        reduced = np.nansum(blocks, axis=(1, 3)) / valid.sum(axis=(1, 3))
+
+    return reduced, np.arange(0, n_rows, row_step), np.arange(0, n_cols, col_step)
@@ -1,6 +1,6 @@
-import json
 import os
 
+from studio.app.common.core.utils.json_codec import loads
 from studio.app.common.schemas.outputs import (
     JsonTimeSeriesData,
     OutputData,
@@ -23,8 +23,8 @@ class Reader:
 class JsonReader:
     @classmethod
     def read(cls, filepath):
-        with open(filepath, "r") as f:
-            json_data = json.load(f)
+        with open(filepath, "rb") as f:
+            json_data = loads(f.read())
         return json_data
 
     @classmethod
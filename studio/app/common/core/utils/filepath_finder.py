@@ -27,3 +27,7 @@ def find_param_filepath(name: str):
 
 def find_condaenv_filepath(name: str):
     return find_filepath(name, "conda")
+
+
+def find_resources_filepath(name: str):
+    return find_filepath(name, "resources")
@@ -0,0 +1,200 @@
+import os
+import struct
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import numpy as np
+import tifffile
+from fastapi import HTTPException, status
+
+from studio.app.common.dataclass.image import LazyTiffStack
+
+
+class FrameCache:
+    """
+    LRU cache of encoded frame payloads, bounded by total byte size
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.__cache: "OrderedDict[tuple, bytes]" = OrderedDict()
+        self.__size = 0
+        self.__lock = threading.Lock()
+
+    def get(self, key: tuple) -> Optional[bytes]:
+        with self.__lock:
+            payload = self.__cache.get(key)
+            if payload is not None:
+                self.__cache.move_to_end(key)
+            return payload
+
+    def put(self, key: tuple, payload: bytes) -> None:
+        if len(payload) > self.max_bytes:
+            return
+
+        with self.__lock:
+            if key in self.__cache:
+                self.__size -= len(self.__cache.pop(key))
+            self.__cache[key] = payload
+            self.__size += len(payload)
+
+            while self.__size > self.max_bytes:
+                _, evicted = self.__cache.popitem(last=False)
+                self.__size -= len(evicted)
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__cache.clear()
+            self.__size = 0
+
+
+class TiffFrameReader:
+    """
+    Read a frame range of a TIFF file and encode it as a compact binary payload.
+
+    Payload layout (little-endian):
+        header: magic(4s) dtype(8s) n_frames(I) height(I) width(I)
+                start_index(I) value_min(f) value_max(f)
+        body:   n_frames * height * width values of dtype, C-order
+
+    value_min/value_max are the original value range before uint8 quantization
+    (both 0 when not quantized).
+    """
+
+    MAGIC = b"OFRM"
+    HEADER_FORMAT = "<4s8sIIIIff"
+    HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+    CACHE = FrameCache(max_bytes=256 * 1024 * 1024)
+
+    @classmethod
+    def read(
+        cls,
+        filepath: str,
+        start_index: int = 0,
+        end_index: int = 10,
+        downsample: int = 1,
+        quantize: bool = False,
+    ) -> bytes:
+        """
+        Frame range semantics follow `save_tiff2json`:
+        frames [max(start_index - 1, 0), end_index) are returned.
+        """
+        stat = os.stat(filepath)
+        key = (
+            filepath,
+            stat.st_mtime_ns,
+            stat.st_size,
+            start_index,
+            end_index,
+            downsample,
+            quantize,
+        )
+
+        payload = cls.CACHE.get(key)
+        if payload is None:
+            payload = cls.__encode(
+                filepath, start_index, end_index, downsample, quantize
+            )
+            cls.CACHE.put(key, payload)
+
+        return payload
+
+    @classmethod
+    def decode(cls, payload: bytes) -> Tuple[np.ndarray, dict]:
+        (
+            magic,
+            dtype,
+            n_frames,
+            height,
+            width,
+            start_index,
+            value_min,
+            value_max,
+        ) = struct.unpack_from(cls.HEADER_FORMAT, payload)
+        assert magic == cls.MAGIC, "Invalid frame payload"
+
+        frames = np.frombuffer(
+            payload, dtype=dtype.rstrip(b"\0").decode(), offset=cls.HEADER_SIZE
+        ).reshape(n_frames, height, width)
+        header = {
+            "start_index": start_index,
+            "value_min": value_min,
+            "value_max": value_max,
+        }
+        return frames, header
+
+    @classmethod
+    def __encode(cls, filepath, start_index, end_index, downsample, quantize):
+        with tifffile.TiffFile(filepath) as tif:
+            series = tif.series[0]
+            shape, dtype, axes = tuple(series.shape), str(series.dtype), series.axes
+
+        # (height, width) images and (frames, height, width) movies only,
+        # e.g. not RGB (height, width, samples) or multichannel images
+        if len(shape) not in (2, 3) or axes[-2:] != "YX":
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unsupported image shape: {shape} ({axes})",
+            )
+
+        stack = LazyTiffStack([filepath], [shape], dtype)
+
+        if len(shape) == 2:
+            start = 0
+            frames = np.asarray(stack[:])[np.newaxis, :, :]
+        else:
+            start = min(max(start_index - 1, 0), shape[0])
+            stop = min(max(end_index, start), shape[0])
+            frames = np.asarray(stack[start:stop])
+
+        if downsample > 1:
+            frames = cls.__downsample(frames, downsample)
+
+        return cls.encode(frames, start, quantize)
+
+    @classmethod
+    def encode(
+        cls, frames: np.ndarray, start_index: int = 0, quantize: bool = False
+    ) -> bytes:
+        """
+        Payload of frames (n_frames, height, width)
+        """
+        value_min, value_max = 0.0, 0.0
+        if quantize:
+            frames, value_min, value_max = cls.__quantize(frames)
+
+        frames = np.ascontiguousarray(frames, dtype=frames.dtype.newbyteorder("<"))
+        header = struct.pack(
+            cls.HEADER_FORMAT,
+            cls.MAGIC,
+            frames.dtype.str.encode(),
+            *frames.shape,
+            start_index,
+            value_min,
+            value_max,
+        )
+
+        return header + frames.tobytes()
+
+    @staticmethod
+    def __downsample(frames: np.ndarray, factor: int) -> np.ndarray:
+        n, h, w = frames.shape
+        h, w = (h // factor) * factor, (w // factor) * factor
+        if h == 0 or w == 0:
+            return frames
+
+        blocks = frames[:, :h, :w].reshape(n, h // factor, factor, w // factor, factor)
+        return blocks.mean(axis=(2, 4), dtype=np.float32)
+
+    @staticmethod
+    def __quantize(frames: np.ndarray) -> Tuple[np.ndarray, float, float]:
+        if frames.size == 0:
+            return frames.astype(np.uint8), 0.0, 0.0
+
+        value_min = float(np.nanmin(frames))
+        value_max = float(np.nanmax(frames))
+        scale = 255.0 / (value_max - value_min) if value_max > value_min else 0.0
+
+        quantized = np.nan_to_num((frames - value_min) * scale)
+        return np.clip(quantized, 0, 255).astype(np.uint8), value_min, value_max
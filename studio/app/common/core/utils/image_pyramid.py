@@ -0,0 +1,253 @@
+import math
+import os
+import threading
+from concurrent.futures import Future
+from typing import Dict, List
+
+import h5py
+import numpy as np
+from filelock import FileLock
+
+from studio.app.common.core.logger import AppLogger
+from studio.app.common.core.utils.api_executor import ApiExecutor
+from studio.app.common.core.utils.filepath_creater import join_filepath
+from studio.app.common.core.workflow.workflow import (
+    Message,
+    NodeRunStatus,
+    OutputType,
+)
+from studio.app.common.dataclass.image import LazyTiffStack, read_tiff_metadata
+from studio.app.common.schemas.outputs import PyramidMethod
+
+logger = AppLogger.get_logger()
+
+
+class ImagePyramid:
+    """
+    Multiscale pyramid of a TIFF image (movie or 2D image, e.g. ROI label map),
+    stored alongside it ({tiff_dir}/{name}.pyramid.h5):
+        /{method}/{level}: (frames, ceil(height / 2**level), ceil(width / 2**level))
+    for methods mean and max (NaN ignored) and levels 1..MAX_LEVEL,
+    chunked by (1, TILE_SIZE, TILE_SIZE) tiles.
+
+    Level 0 (full resolution) is read from the TIFF itself.
+    Pyramids of 2D images and ROIs are built when their node finishes,
+    pyramids of movies on the first tile request (tiles are reduced on the fly
+    until then).
+    """
+
+    TILE_SIZE = 256
+    MAX_LEVEL = 3
+    # size of the frame batches reduced at once
+    BATCH_BYTES = 2**26
+    LOCK_TIMEOUT = 600  # sec
+
+    # background builds of this process, by tiff path
+    __builds: Dict[str, Future] = {}
+    __builds_lock = threading.Lock()
+
+    @classmethod
+    def get_path(cls, tiff_path: str) -> str:
+        return f"{os.path.splitext(tiff_path)[0]}.pyramid.h5"
+
+    @classmethod
+    def get_source_path(cls, output_path: str) -> str:
+        """
+        TIFF of an image output: outputs of 2D images and ROIs are json files,
+        their TIFF is saved in the node directory ({dir}/tiff/{name}/{name}.tif)
+        """
+        name, ext = os.path.splitext(os.path.basename(output_path))
+        if ext != ".json":
+            return output_path
+        return join_filepath(
+            [os.path.dirname(output_path), "tiff", name, f"{name}.tif"]
+        )
+
+    @classmethod
+    def get_sources(cls, results: Dict[str, Message]) -> List[str]:
+        """
+        TIFFs of the succeeded 2D image and ROI outputs larger than a tile,
+        whose pyramids are built in advance. Pyramids of movies are only built
+        on demand (they take long to build, and about 1.3x the movie size).
+        """
+        sources = []
+        for message in results.values():
+            if message is None or message.status != NodeRunStatus.SUCCESS.value:
+                continue
+            for output_path in (message.outputPaths or {}).values():
+                if output_path.type not in [OutputType.IMAGE, OutputType.ROI]:
+                    continue
+
+                path = cls.get_source_path(output_path.path)
+                if os.path.exists(path):
+                    shape, _ = read_tiff_metadata(path)
+                    if len(shape) == 2 and max(shape) > cls.TILE_SIZE:
+                        sources.append(path)
+        return sources
+
+    @classmethod
+    def is_built(cls, tiff_path: str) -> bool:
+        path = cls.get_path(tiff_path)
+        return os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(
+            tiff_path
+        )
+
+    @classmethod
+    def get_levels(cls, shape: tuple) -> List[tuple]:
+        """
+        (height, width) of each level, from level 0
+        """
+        height, width = shape[-2:]
+        return [
+            (math.ceil(height / 2**level), math.ceil(width / 2**level))
+            for level in range(cls.MAX_LEVEL + 1)
+        ]
+
+    @classmethod
+    def build(cls, tiff_path: str) -> str:
+        """
+        Build the pyramid of tiff_path, unless it is up to date.
+        Frames are reduced by batches, the image is not loaded at once.
+        """
+        path = cls.get_path(tiff_path)
+        with FileLock(f"{path}.lock", timeout=cls.LOCK_TIMEOUT):
+            if cls.is_built(tiff_path):
+                return path
+
+            shape, dtype = read_tiff_metadata(tiff_path)
+            stack = LazyTiffStack([tiff_path], [shape], dtype)
+            n_frames = shape[0] if len(shape) > 2 else 1
+            levels = cls.get_levels(shape)
+            batch = max(1, cls.BATCH_BYTES // (math.prod(shape[-2:]) * 4))
+
+            # written atomically, readers never see a partially built pyramid
+            tmp_path = f"{path}.tmp"
+            with h5py.File(tmp_path, "w") as f:
+                f.attrs["shape"] = shape
+                datasets = {
+                    (method.value, level): f.create_dataset(
+                        f"{method.value}/{level}",
+                        shape=(n_frames, *levels[level]),
+                        dtype=np.float32,
+                        chunks=(
+                            1,
+                            min(cls.TILE_SIZE, levels[level][0]),
+                            min(cls.TILE_SIZE, levels[level][1]),
+                        ),
+                    )
+                    for method in PyramidMethod
+                    for level in range(1, cls.MAX_LEVEL + 1)
+                }
+
+                for start in range(0, n_frames, batch):
+                    if len(shape) > 2:
+                        frames = np.asarray(stack[start : start + batch])
+                    else:
+                        frames = np.asarray(stack[:])[np.newaxis]
+
+                    # each level is reduced from the previous one
+                    mean = maximum = frames.astype(np.float32)
+                    for level in range(1, cls.MAX_LEVEL + 1):
+                        mean = cls.__reduce_mean(mean)
+                        maximum = cls.__reduce_max(maximum)
+                        datasets["mean", level][start : start + len(frames)] = mean
+                        datasets["max", level][start : start + len(frames)] = maximum
+
+            os.replace(tmp_path, path)
+            logger.info(f"built image pyramid: {path}")
+            return path
+
+    @classmethod
+    def build_in_background(cls, tiff_path: str) -> None:
+        """
+        Build the pyramid in the low priority background pool,
+        unless it is up to date or being built
+        """
+        if cls.is_built(tiff_path):
+            return
+
+        # called from threads of the api, a build is submitted once
+        with cls.__builds_lock:
+            future = cls.__builds.get(tiff_path)
+            if future is not None and not future.done():
+                return
+
+            future = ApiExecutor.submit_in_background(cls.build, tiff_path)
+            if future is None:
+                return
+            cls.__builds[tiff_path] = future
+
+        # out of the lock, the callback runs at once if the build is done
+        future.add_done_callback(lambda f: cls.__remove_build(tiff_path, f))
+
+    @classmethod
+    def __remove_build(cls, tiff_path: str, future: Future) -> None:
+        with cls.__builds_lock:
+            if cls.__builds.get(tiff_path) is future:
+                cls.__builds.pop(tiff_path)
+
+    @classmethod
+    def read_tile(
+        cls,
+        tiff_path: str,
+        level: int,
+        frame: int,
+        tile_x: int,
+        tile_y: int,
+        method: PyramidMethod = PyramidMethod.MEAN,
+    ) -> np.ndarray:
+        """
+        (1, height, width) tile of a frame, at most TILE_SIZE on each side.
+        Tiles of a pyramid not built yet are reduced from the full resolution
+        region of the tile (same values as the built pyramid).
+        """
+        method = PyramidMethod(method)
+        if level > 0 and cls.is_built(tiff_path):
+            rows = slice(tile_y * cls.TILE_SIZE, (tile_y + 1) * cls.TILE_SIZE)
+            cols = slice(tile_x * cls.TILE_SIZE, (tile_x + 1) * cls.TILE_SIZE)
+            with h5py.File(cls.get_path(tiff_path), "r") as f:
+                return f[f"{method.value}/{level}"][frame : frame + 1, rows, cols]
+
+        size = cls.TILE_SIZE * 2**level
+        rows = slice(tile_y * size, (tile_y + 1) * size)
+        cols = slice(tile_x * size, (tile_x + 1) * size)
+
+        shape, dtype = read_tiff_metadata(tiff_path)
+        stack = LazyTiffStack([tiff_path], [shape], dtype)
+        if len(shape) > 2:
+            tile = np.asarray(stack[frame : frame + 1, rows, cols])
+        else:
+            assert frame == 0, f"Invalid frame: {frame}"
+            tile = np.asarray(stack[rows, cols])[np.newaxis]
+
+        if level > 0:
+            tile = tile.astype(np.float32)
+            for _ in range(level):
+                if method == PyramidMethod.MAX:
+                    tile = cls.__reduce_max(tile)
+                else:
+                    tile = cls.__reduce_mean(tile)
+        return tile
+
+    @staticmethod
+    def __blocks(frames: np.ndarray) -> np.ndarray:
+        """
+        2x2 blocks of frames, NaN padded to even sizes
+        """
+        n, h, w = frames.shape
+        return np.pad(
+            frames, ((0, 0), (0, h % 2), (0, w % 2)), constant_values=np.nan
+        ).reshape(n, (h + 1) // 2, 2, (w + 1) // 2, 2)
+
+    @classmethod
+    def __reduce_mean(cls, frames: np.ndarray) -> np.ndarray:
+        blocks = cls.__blocks(frames)
+        # blocks entirely NaN (e.g. ROI background) stay NaN, without warnings
+        with np.errstate(invalid="ignore"):
+            return np.nansum(blocks, axis=(2, 4)) / (~np.isnan(blocks)).sum(
+                axis=(2, 4), dtype=np.float32
+            )
+
+    @classmethod
+    def __reduce_max(cls, frames: np.ndarray) -> np.ndarray:
+        return np.fmax.reduce(cls.__blocks(frames), axis=(2, 4))
@@ -0,0 +1,59 @@
+import json
+import math
+
+import numpy as np
+
+try:
+    import orjson
+except ModuleNotFoundError:
+    # optional, the (slower) json module is used instead
+    orjson = None
+
+
+def dumps(obj) -> bytes:
+    """
+    Compact JSON of obj, numpy arrays and scalars included.
+    NaN and infinity are written as null, as pandas does.
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            obj,
+            default=_default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+        )
+    return json.dumps(_to_builtin(obj), separators=(",", ":"), allow_nan=False).encode()
+
+
+def loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _default(obj):
+    # numpy objects orjson does not serialize natively
+    if isinstance(obj, np.ndarray):
+        if not obj.flags.c_contiguous:
+            return np.ascontiguousarray(obj)
+        return obj.tolist()
+    elif isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _to_builtin(obj):
+    if isinstance(obj, np.ndarray):
+        if np.issubdtype(obj.dtype, np.floating):
+            return np.where(np.isfinite(obj), obj, None).tolist()
+        elif obj.dtype == object:
+            return _to_builtin(obj.tolist())
+        return obj.tolist()
+    elif isinstance(obj, np.generic):
+        return _to_builtin(obj.item())
+    elif isinstance(obj, dict):
+        return {str(k): _to_builtin(v) for k, v in obj.items()}
+    elif isinstance(obj, (list, tuple)):
+        return [_to_builtin(v) for v in obj]
+    elif isinstance(obj, float) and not math.isfinite(obj):
+        return None
+    return obj
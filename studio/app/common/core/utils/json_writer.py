@@ -10,17 +10,53 @@ from studio.app.common.core.utils.filepath_creater import (
     create_directory,
     join_filepath,
 )
+from studio.app.common.core.utils.json_codec import dumps
 from studio.app.common.schemas.outputs import PlotMetaData
 
 
 class JsonWriter:
+    # size of the row batches encoded at once by write_as_split
+    BATCH_BYTES = 2**24
+
     @classmethod
     def write(cls, filepath, data):
-        pd.DataFrame(data).to_json(filepath, indent=4)
+        pd.DataFrame(data).to_json(filepath)
 
     @classmethod
-    def write_as_split(cls, filepath, data):
-        pd.DataFrame(data).to_json(filepath, indent=4, orient="split")
+    def write_as_split(cls, filepath, data, columns=None, index=None):
+        """
+        Write data as pandas "split" oriented JSON ({columns, index, data}),
+        without building a DataFrame. Arrays are written compact, by batches
+        of rows, so that large outputs are not encoded in memory at once.
+        """
+        if isinstance(data, pd.DataFrame):
+            columns = data.columns if columns is None else columns
+            index = data.index if index is None else index
+            data = data.values
+
+        data = np.asarray(data)
+        if data.ndim == 1:
+            data = data[:, np.newaxis]
+        if columns is None:
+            columns = range(data.shape[1])
+        if index is None:
+            index = range(data.shape[0])
+
+        batch = max(1, cls.BATCH_BYTES // max(1, data[:1].nbytes))
+
+        with open(filepath, "wb") as f:
+            f.write(b'{"columns":' + dumps(cls.__to_list(columns)))
+            f.write(b',"index":' + dumps(cls.__to_list(index)) + b',"data":[')
+            for start in range(0, len(data), batch):
+                if start > 0:
+                    f.write(b",")
+                # rows of the batch, without the enclosing brackets
+                f.write(dumps(data[start : start + batch])[1:-1])
+            f.write(b"]}")
+
+    @staticmethod
+    def __to_list(labels) -> list:
+        return labels.tolist() if hasattr(labels, "tolist") else list(labels)
 
     @classmethod
     def write_plot_meta(cls, dir_name, file_name, data: Optional[PlotMetaData]):
@@ -32,20 +68,10 @@ class JsonWriter:
 
 def save_tiff2json(tiff_filepath, save_dirpath, start_index=None, end_index=None):
     # Tiff画像を読み込む
-    tiffs = []
     image = tifffile.imread(tiff_filepath)
     if image.ndim == 2:
         image = image[np.newaxis, :, :]
 
-    for i, page in enumerate(image):
-        if i < start_index - 1:
-            continue
-
-        if i >= end_index:
-            break
-
-        tiffs.append(page.tolist())
-
     filename, _ = os.path.splitext(os.path.basename(tiff_filepath))
     create_directory(save_dirpath)
 
@@ -53,5 +79,5 @@ def save_tiff2json(tiff_filepath, save_dirpath, start_index=None, end_index=None
         join_filepath(
             [save_dirpath, f"{filename}_{str(start_index)}_{str(end_index)}.json"]
         ),
-        pd.DataFrame(tiffs),
+        image[max(start_index - 1, 0) : end_index],
     )
@@ -0,0 +1,78 @@
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict
+
+import numpy as np
+
+from studio.app.common.schemas.metrics import LatencySummary
+
+
+class LatencyMetrics:
+    """
+    Latency of the last MAX_SAMPLES requests of each endpoint
+    (method and route path), to compare percentiles under concurrent load
+    """
+
+    MAX_SAMPLES = 1000
+
+    __samples: Dict[str, Deque[float]] = {}
+    __lock = threading.Lock()
+
+    @classmethod
+    def record(cls, endpoint: str, seconds: float) -> None:
+        with cls.__lock:
+            samples = cls.__samples.get(endpoint)
+            if samples is None:
+                samples = cls.__samples[endpoint] = deque(maxlen=cls.MAX_SAMPLES)
+            samples.append(seconds)
+
+    @classmethod
+    def summary(cls) -> Dict[str, LatencySummary]:
+        with cls.__lock:
+            samples = {k: np.array(v) for k, v in cls.__samples.items()}
+
+        return {
+            endpoint: LatencySummary(
+                count=len(values),
+                mean_ms=values.mean() * 1000,
+                p50_ms=np.percentile(values, 50) * 1000,
+                p90_ms=np.percentile(values, 90) * 1000,
+                p99_ms=np.percentile(values, 99) * 1000,
+                max_ms=values.max() * 1000,
+            )
+            for endpoint, values in sorted(samples.items())
+        }
+
+    @classmethod
+    def reset(cls) -> None:
+        with cls.__lock:
+            cls.__samples.clear()
+
+
+class LatencyMetricsMiddleware:
+    """
+    ASGI middleware recording the time until the response starts
+    (streamed responses are not measured until their end)
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        start = time.perf_counter()
+
+        async def send_with_metrics(message):
+            if message["type"] == "http.response.start":
+                # the route is set to the scope by the router
+                route = scope.get("route")
+                if route is not None:
+                    LatencyMetrics.record(
+                        f"{scope['method']} {route.path}", time.perf_counter() - start
+                    )
+            await send(message)
+
+        await self.app(scope, receive, send_with_metrics)
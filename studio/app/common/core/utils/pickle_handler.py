@@ -1,17 +1,92 @@
+import hashlib
+import os
 import pickle
+import shutil
 import traceback
 
+import numpy as np
+
 from studio.app.common.core.utils.filepath_creater import (
     create_directory,
     join_filepath,
 )
 
+# Node result format
+#   {name}.pkl     pickle of the result, holding references to large arrays
+#   {name}.arrays/ arrays of at least ARRAY_MIN_BYTES, one .npy file per array
+#                  named by the hash of its content (shared by equal arrays)
+#
+# Arrays are memory mapped on read (copy-on-write), so that only the parts used
+# by the reader are loaded. Pickles without array references (written before
+# this format) are read as they are.
+ARRAY_MIN_BYTES = 2**20
+ARRAYS_DIR_SUFFIX = ".arrays"
+
+
+def arrays_dirpath(pickle_path: str) -> str:
+    return f"{os.path.splitext(pickle_path)[0]}{ARRAYS_DIR_SUFFIX}"
+
+
+class _ResultPickler(pickle.Pickler):
+    def __init__(self, file, dirpath: str):
+        super().__init__(file)
+        self.arrays_dirpath = dirpath
+        self.array_files = set()
+
+    def persistent_id(self, obj):
+        if type(obj) is not np.ndarray and type(obj) is not np.memmap:
+            return None
+        if obj.nbytes < ARRAY_MIN_BYTES or obj.dtype.hasobject:
+            return None
+
+        filename = self.__save_array(obj)
+        self.array_files.add(filename)
+        return ("npy", filename)
+
+    def __save_array(self, array: np.ndarray) -> str:
+        if not array.flags.c_contiguous and not array.flags.f_contiguous:
+            array = np.ascontiguousarray(array)
+        contiguous = array.T if not array.flags.c_contiguous else array
+
+        h = hashlib.sha256(
+            f"{array.dtype.str}:{array.shape}:{array.flags.c_contiguous}".encode()
+        )
+        h.update(contiguous.reshape(-1).view(np.uint8))
+        filename = f"{h.hexdigest()[:32]}.npy"
+
+        path = join_filepath([self.arrays_dirpath, filename])
+        if not os.path.exists(path):
+            create_directory(self.arrays_dirpath)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "wb") as f:
+                np.save(f, array, allow_pickle=False)
+            os.replace(tmp_path, path)
+
+        return filename
+
+
+class _ResultUnpickler(pickle.Unpickler):
+    def __init__(self, file, dirpath: str):
+        super().__init__(file)
+        self.arrays_dirpath = dirpath
+
+    def persistent_load(self, pid):
+        kind, filename = pid
+        if kind != "npy":
+            raise pickle.UnpicklingError(f"Unsupported persistent id: {pid}")
+
+        return np.load(
+            join_filepath([self.arrays_dirpath, filename]),
+            mmap_mode="c",
+            allow_pickle=False,
+        )
+
 
 class PickleReader:
     @classmethod
     def read(cls, filepath):
         with open(filepath, "rb") as f:
-            return pickle.load(f)
+            return _ResultUnpickler(f, arrays_dirpath(filepath)).load()
 
     @staticmethod
     def check_is_valid_node_pickle(data):
@@ -40,8 +115,7 @@ class PickleWriter:
         # ファイル保存先
         dirpath = join_filepath(pickle_path.split("/")[:-1])
         create_directory(dirpath)
-        with open(pickle_path, "wb") as f:
-            pickle.dump(info, f)
+        cls.__dump(pickle_path, info)
 
     @classmethod
     def write_error(cls, pickle_path, err: Exception):
@@ -51,11 +125,40 @@ class PickleWriter:
 
     @classmethod
     def overwrite(cls, pickle_path, info):
-        with open(pickle_path, "rb") as f:
-            old_pkl = pickle.load(f)
+        old_pkl = PickleReader.read(pickle_path)
 
         if isinstance(old_pkl, dict) and isinstance(info, dict):
             old_pkl.update(info)
 
-            with open(pickle_path, "wb") as f:
-                pickle.dump(old_pkl, f)
+            cls.__dump(pickle_path, old_pkl)
+
+    @classmethod
+    def remove(cls, pickle_path):
+        if os.path.exists(pickle_path):
+            os.remove(pickle_path)
+        shutil.rmtree(arrays_dirpath(pickle_path), ignore_errors=True)
+
+    @classmethod
+    def __dump(cls, pickle_path, info):
+        # replace the file instead of rewriting it in place,
+        # so that hardlinked copies (see NodeCache) are left intact
+        tmp_pickle_path = f"{pickle_path}.tmp"
+        with open(tmp_pickle_path, "wb") as f:
+            pickler = _ResultPickler(f, arrays_dirpath(pickle_path))
+            pickler.dump(info)
+        os.replace(tmp_pickle_path, pickle_path)
+
+        cls.__remove_unused_arrays(pickle_path, pickler.array_files)
+
+    @classmethod
+    def __remove_unused_arrays(cls, pickle_path, array_files):
+        dirpath = arrays_dirpath(pickle_path)
+        if not os.path.isdir(dirpath):
+            return
+
+        # files of the previous result (open memory maps stay valid)
+        for filename in os.listdir(dirpath):
+            if filename not in array_files:
+                os.remove(join_filepath([dirpath, filename]))
+        if not array_files:
+            shutil.rmtree(dirpath, ignore_errors=True)
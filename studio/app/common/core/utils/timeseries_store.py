@@ -0,0 +1,135 @@
+import os
+from typing import List, Optional
+
+import h5py
+import numpy as np
+
+from studio.app.common.core.utils.downsampling import downsample_indices
+from studio.app.common.core.utils.filepath_creater import join_filepath
+from studio.app.common.schemas.outputs import DownsampleMethod, JsonTimeSeriesData
+
+
+class TimeSeriesStore:
+    """
+    Columnar store of a time series output, written once per output:
+    one HDF5 file holding the (cells, frames) data and std matrices,
+    the index (x values) and the cell numbers.
+
+    Rows (cells) and frame ranges are sliced from the file on read.
+    Only numeric data is stored (ValueError otherwise, e.g. csv files with
+    a header row), other data is written as per cell json files by the callers.
+    """
+
+    FILE_NAME = "timeseries.h5"
+
+    @classmethod
+    def get_path(cls, dirpath: str) -> str:
+        return join_filepath([dirpath, cls.FILE_NAME])
+
+    @classmethod
+    def exists(cls, dirpath: str) -> bool:
+        return os.path.exists(cls.get_path(dirpath))
+
+    @classmethod
+    def write(cls, dirpath: str, data, std=None, index=None, cell_numbers=None):
+        data = cls.__to_numeric(data)
+        if std is not None:
+            std = cls.__to_numeric(std)
+        if data.ndim == 1:
+            data = data[np.newaxis, :]
+        if index is None:
+            index = np.arange(data.shape[1])
+        if cell_numbers is None:
+            cell_numbers = range(len(data))
+
+        with h5py.File(cls.get_path(dirpath), "w") as f:
+            f.create_dataset("data", data=data)
+            if std is not None:
+                f.create_dataset("std", data=np.asarray(std).reshape(data.shape))
+            # keys of the json responses
+            f.create_dataset(
+                "index",
+                data=np.array(cls.__format_index(index), dtype=h5py.string_dtype()),
+            )
+            f.create_dataset(
+                "cell_numbers",
+                data=np.array(
+                    [str(i) for i in cell_numbers], dtype=h5py.string_dtype()
+                ),
+            )
+
+    @classmethod
+    def read(
+        cls,
+        dirpath: str,
+        cells: Optional[List[str]] = None,
+        start: Optional[int] = None,
+        stop: Optional[int] = None,
+        max_points: Optional[int] = None,
+        method: DownsampleMethod = DownsampleMethod.MINMAX,
+    ) -> JsonTimeSeriesData:
+        """
+        Frames [start, stop) of the cells (all cells if None),
+        downsampled to about max_points points per cell if given
+        """
+        with h5py.File(cls.get_path(dirpath), "r") as f:
+            cell_numbers = f["cell_numbers"].asstr()[:]
+            index = f["index"].asstr()[:]
+
+            if cells is None:
+                rows = slice(None)
+            else:
+                rows = np.flatnonzero(np.isin(cell_numbers, [str(c) for c in cells]))
+                if len(rows) == 0:
+                    raise KeyError(f"cells not found: {cells}")
+                cell_numbers = cell_numbers[rows]
+                rows = rows.tolist()
+
+            frames = slice(*slice(start, stop).indices(len(index))[:2])
+            data = f["data"][rows, frames]
+            std = f["std"][rows, frames] if "std" in f else None
+
+        index = index[frames]
+        indices = downsample_indices(data, max_points, method)
+
+        return JsonTimeSeriesData(
+            xrange=index.tolist(),
+            data=cls.__to_dict(cell_numbers, index, data, indices),
+            std=None
+            if std is None
+            else cls.__to_dict(cell_numbers, index, std, indices),
+        )
+
+    @staticmethod
+    def __to_dict(cell_numbers, index, values, indices) -> dict:
+        result = {}
+        for cell, row, row_indices in zip(cell_numbers, values, indices):
+            row = row[row_indices]
+            nan = np.flatnonzero(np.isnan(row))
+            row = row.tolist()
+            # NaN are null, as pandas writes them
+            for i in nan:
+                row[i] = None
+            result[cell] = dict(zip(index[row_indices].tolist(), row))
+        return result
+
+    @staticmethod
+    def __to_numeric(values) -> np.ndarray:
+        values = np.asarray(values)
+        if np.issubdtype(values.dtype, np.number):
+            return values
+
+        # e.g. object arrays of numbers read by pandas
+        try:
+            return values.astype(float)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"time series data is not numeric: {e}")
+
+    @staticmethod
+    def __format_index(index) -> List[str]:
+        index = np.asarray(index)
+        if np.issubdtype(index.dtype, np.integer):
+            return [str(int(x)) for x in index]
+        elif np.issubdtype(index.dtype, np.floating):
+            return [str(float(x)) for x in index]
+        return [str(x) for x in index]
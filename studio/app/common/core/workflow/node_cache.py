@@ -0,0 +1,469 @@
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import uuid
+from importlib import metadata
+from typing import Dict, List, Optional
+
+try:
+    import fcntl
+except ModuleNotFoundError:
+    # not available on Windows, files are copied
+    fcntl = None
+
+import numpy as np
+from filelock import FileLock
+from pydantic import BaseSettings, Field
+
+from studio.app.common.core.logger import AppLogger
+from studio.app.common.core.snakemake.smk import Rule
+from studio.app.common.core.utils.filepath_creater import (
+    create_directory,
+    join_filepath,
+)
+from studio.app.common.core.utils.pickle_handler import (
+    ARRAYS_DIR_SUFFIX,
+    PickleReader,
+    PickleWriter,
+)
+from studio.app.common.core.workflow.node_status_index import NodeStatusIndex
+from studio.app.common.dataclass.base import BaseData
+from studio.app.dir_path import DIRPATH
+
+logger = AppLogger.get_logger()
+
+
+class NodeCacheConfig(BaseSettings):
+    NODE_CACHE_ENABLED: bool = Field(default=False, env="NODE_CACHE_ENABLED")
+    NODE_CACHE_DIR: str = Field(
+        default=f"{DIRPATH.DATA_DIR}/node_cache", env="NODE_CACHE_DIR"
+    )
+    NODE_CACHE_MAX_BYTES: int = Field(default=100 * 2**30, env="NODE_CACHE_MAX_BYTES")
+
+    class Config:
+        env_file = f"{DIRPATH.CONFIG_DIR}/.env"
+        env_file_encoding = "utf-8"
+
+
+NODE_CACHE_CONFIG = NodeCacheConfig()
+
+
+class NodeCache:
+    """
+    Content-addressed cache of algorithm node results, shared by all workflows.
+
+    Key: sha256 of (wrapper path, typed params, nwb params, keys of the input
+         nodes, code version). The key of each finished node is recorded
+         in the NodeStatusIndex, so that downstream nodes are keyed by content
+         rather than by the run directory of their inputs.
+         The code version covers the sources of the wrapper package and of the
+         dataclasses, and the installed versions of SOURCE_LIBRARIES.
+
+    Entry ({NODE_CACHE_DIR}/{key[:2]}/{key}/):
+      files/      node output directory
+      inputs/     files the node wrote into its input node directories,
+                  by input key ({input key}/{relative path})
+      entry.json  {"dirpath": node dirpath the result was computed in,
+                   "pickle": pickle file name,
+                   "inputs": {input key: input node dirpath},
+                   "size": total bytes of files}
+
+    Output files are cloned (reflinks where the file system supports them,
+    copies otherwise) to and from the cache: downstream nodes may rewrite
+    files of their input nodes in place (e.g. suite2p registration of the
+    file_convert binary), which must not change cached entries.
+    Only the result arrays of the pickles, which are never rewritten in place
+    (see pickle_handler), are hardlinked.
+    Such writes into input directories (files modified since the node started)
+    are stored in the entry of the writing node, and replayed on its restore:
+    nodes restored downstream of it see the rewritten files, as when run.
+    Paths of the original run in the restored node pickle are rewritten
+    to the new run.
+    Entries are evicted least recently used first, once the total size
+    exceeds NODE_CACHE_MAX_BYTES (last use is the mtime of entry.json).
+    """
+
+    VERSION = 3
+    ENTRY_FILE = "entry.json"
+    FILES_DIR = "files"
+    INPUTS_DIR = "inputs"
+    # file mtimes lag the clock (coarse kernel timestamps, FAT: 2 sec),
+    # files of the inputs modified shortly before the node are stored too
+    MTIME_MARGIN_NS = 2 * 10**9
+    LOCK_TIMEOUT = 60  # sec
+
+    # sources shared by all wrappers (output dataclasses)
+    SOURCE_DIRS = [
+        f"{DIRPATH.APP_DIR}/common/dataclass",
+        f"{DIRPATH.APP_DIR}/optinist/dataclass",
+    ]
+    # installed versions of the app and the algorithm libraries
+    SOURCE_LIBRARIES = [
+        "optinist",
+        "suite2p",
+        "caiman",
+        "numpy",
+        "scipy",
+        "scikit-learn",
+        "pandas",
+    ]
+
+    __source_hashes: Dict[str, str] = {}
+
+    def __init__(
+        self,
+        cache_dirpath: str = NODE_CACHE_CONFIG.NODE_CACHE_DIR,
+        max_bytes: int = NODE_CACHE_CONFIG.NODE_CACHE_MAX_BYTES,
+    ):
+        self.cache_dirpath = cache_dirpath
+        self.max_bytes = max_bytes
+
+    @classmethod
+    def enabled(cls) -> bool:
+        return NODE_CACHE_CONFIG.NODE_CACHE_ENABLED
+
+    @classmethod
+    def node_key(
+        cls, rule: Rule, nwb_params: dict, input_keys: List[str], function
+    ) -> str:
+        content = {
+            "version": cls.VERSION,
+            "path": rule.path,
+            "params": rule.params,
+            "return_arg": rule.return_arg,
+            "nwb": nwb_params,
+            "inputs": input_keys,
+            "source": cls.__source_hash(function),
+        }
+        encoded = json.dumps(content, sort_keys=True, default=_json_default)
+
+        return hashlib.sha256(encoded.encode()).hexdigest()
+
+    @classmethod
+    def data_key(cls, pickle_path: str, input_files) -> str:
+        """
+        Key of a data node: its pickle and the stat of the files it refers to
+        """
+        if isinstance(input_files, str):
+            input_files = [input_files]
+
+        h = hashlib.sha256(_file_digest(pickle_path).encode())
+        for path in input_files or []:
+            stat = os.stat(path)
+            h.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+
+        return h.hexdigest()
+
+    @classmethod
+    def input_key(cls, pickle_path: str) -> str:
+        node_id = os.path.basename(os.path.dirname(pickle_path))
+        node_status = NodeStatusIndex.from_pickle_path(pickle_path).read().get(node_id)
+
+        if node_status and node_status.cache_key and node_status.is_current:
+            return node_status.cache_key
+        return _file_digest(pickle_path)
+
+    def restore(
+        self, key: str, pickle_path: str, input_dirpaths: Dict[str, str]
+    ) -> Optional[dict]:
+        """
+        Materialize the cached result of `key` as the node of `pickle_path`,
+        returns the restored output_info (None if not cached)
+
+        input_dirpaths: {input key: input node dirpath of the current run}
+        """
+        entry_dirpath = self.__entry_dirpath(key)
+        entry_path = join_filepath([entry_dirpath, self.ENTRY_FILE])
+        if not os.path.exists(entry_path):
+            return None
+
+        try:
+            with open(entry_path, "r") as f:
+                entry = json.load(f)
+            os.utime(entry_path)
+
+            node_dirpath = os.path.dirname(pickle_path)
+            files_dirpath = join_filepath([entry_dirpath, self.FILES_DIR])
+            _link_tree(files_dirpath, node_dirpath, skip=[entry["pickle"]])
+
+            # paths of the original run are moved to the current run
+            mapping = {entry["dirpath"]: node_dirpath}
+            for input_key, old_dirpath in entry["inputs"].items():
+                if input_key in input_dirpaths:
+                    mapping[old_dirpath] = input_dirpaths[input_key]
+
+                    # replay the writes of the node into its input directories
+                    written_dirpath = join_filepath(
+                        [entry_dirpath, self.INPUTS_DIR, input_key]
+                    )
+                    if os.path.isdir(written_dirpath):
+                        _link_tree(written_dirpath, input_dirpaths[input_key])
+
+            output_info = _replace_paths(
+                PickleReader.read(join_filepath([files_dirpath, entry["pickle"]])),
+                mapping,
+            )
+            PickleWriter.write(pickle_path, output_info)
+        except Exception as e:
+            # evicted while being restored, or a broken entry
+            logger.warning(f"Failed to restore node cache. [{key}] {e}")
+            return None
+
+        logger.info(f"restored node cache: {key}")
+        return output_info
+
+    def store(
+        self,
+        key: str,
+        pickle_path: str,
+        input_dirpaths: Dict[str, str],
+        started_at_ns: int = None,
+    ) -> None:
+        """
+        started_at_ns: start time of the node (time.time_ns()), files of
+                       the input directories modified since are stored too
+        """
+        entry_dirpath = self.__entry_dirpath(key)
+        if os.path.exists(entry_dirpath):
+            return
+
+        node_dirpath = os.path.dirname(pickle_path)
+        tmp_dirpath = join_filepath([self.cache_dirpath, f"tmp_{uuid.uuid4().hex}"])
+        try:
+            size = _link_tree(
+                node_dirpath, join_filepath([tmp_dirpath, self.FILES_DIR])
+            )
+            if started_at_ns is not None:
+                for input_key, input_dirpath in input_dirpaths.items():
+                    size += _link_tree(
+                        input_dirpath,
+                        join_filepath([tmp_dirpath, self.INPUTS_DIR, input_key]),
+                        modified_since_ns=started_at_ns - self.MTIME_MARGIN_NS,
+                    )
+            with open(join_filepath([tmp_dirpath, self.ENTRY_FILE]), "w") as f:
+                json.dump(
+                    {
+                        "dirpath": node_dirpath,
+                        "pickle": os.path.basename(pickle_path),
+                        "inputs": input_dirpaths,
+                        "size": size,
+                    },
+                    f,
+                )
+
+            create_directory(os.path.dirname(entry_dirpath))
+            os.rename(tmp_dirpath, entry_dirpath)
+        except OSError as e:
+            # stored concurrently by another node, or out of space
+            logger.warning(f"Failed to store node cache. [{key}] {e}")
+            shutil.rmtree(tmp_dirpath, ignore_errors=True)
+            return
+
+        self.evict()
+
+    def evict(self) -> None:
+        """
+        Remove least recently used entries until the cache fits in max_bytes
+        """
+        create_directory(self.cache_dirpath)
+        lock_path = join_filepath([self.cache_dirpath, "evict.lock"])
+        with FileLock(lock_path, timeout=self.LOCK_TIMEOUT):
+            entries = []
+            for entry_path in self.__entry_paths():
+                try:
+                    with open(entry_path, "r") as f:
+                        size = json.load(f)["size"]
+                    entries.append((os.stat(entry_path).st_mtime, size, entry_path))
+                except (OSError, ValueError, KeyError):
+                    continue
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, entry_path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                shutil.rmtree(os.path.dirname(entry_path), ignore_errors=True)
+                total -= size
+
+    def __entry_dirpath(self, key: str) -> str:
+        return join_filepath([self.cache_dirpath, key[:2], key])
+
+    def __entry_paths(self):
+        if not os.path.isdir(self.cache_dirpath):
+            return
+        for prefix in os.listdir(self.cache_dirpath):
+            prefix_dirpath = join_filepath([self.cache_dirpath, prefix])
+            if len(prefix) != 2 or not os.path.isdir(prefix_dirpath):
+                continue
+            for key in os.listdir(prefix_dirpath):
+                yield join_filepath([prefix_dirpath, key, self.ENTRY_FILE])
+
+    @classmethod
+    def __source_hash(cls, function) -> str:
+        package_dirpath = _wrapper_package_dirpath(inspect.getsourcefile(function))
+        if package_dirpath not in cls.__source_hashes:
+            h = hashlib.sha256()
+            for dirpath in [package_dirpath, *cls.SOURCE_DIRS]:
+                h.update(_sources_digest(dirpath).encode())
+            for library in cls.SOURCE_LIBRARIES:
+                h.update(f"{library}:{_library_version(library)}".encode())
+            cls.__source_hashes[package_dirpath] = h.hexdigest()
+        return cls.__source_hashes[package_dirpath]
+
+
+def _file_digest(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(2**20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _sources_digest(dirpath: str) -> str:
+    """
+    Digest of the python sources under dirpath
+    """
+    h = hashlib.sha256()
+    for root, dirnames, filenames in os.walk(dirpath):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            if filename.endswith(".py"):
+                path = join_filepath([root, filename])
+                h.update(os.path.relpath(path, dirpath).encode())
+                h.update(_file_digest(path).encode())
+    return h.hexdigest()
+
+
+def _wrapper_package_dirpath(source_path: str) -> str:
+    """
+    Top level package of a wrapper ({wrappers_dir}/{package}/...),
+    the directory of the source file if not under a wrappers directory
+    """
+    dirpath = os.path.dirname(os.path.abspath(source_path))
+    parent = dirpath
+    while os.path.dirname(parent) != parent:
+        if os.path.basename(os.path.dirname(parent)) == "wrappers":
+            return parent
+        parent = os.path.dirname(parent)
+    return dirpath
+
+
+def _library_version(name: str) -> Optional[str]:
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def _json_default(value):
+    if isinstance(value, np.ndarray):
+        return hashlib.sha256(np.ascontiguousarray(value).tobytes()).hexdigest()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, BaseData):
+        # data nodes are keyed by their files, not by the object identity
+        return [type(value).__name__, getattr(value, "path", None)]
+    return str(value)
+
+
+def _link_tree(
+    src_dirpath: str,
+    dst_dirpath: str,
+    skip: List[str] = (),
+    modified_since_ns: int = None,
+) -> int:
+    """
+    Clone files of src_dirpath into dst_dirpath (result arrays are hardlinked),
+    returns the total size of the files
+
+    modified_since_ns: clone only the files modified since (mtime)
+    """
+    size = 0
+    for dirpath, _, filenames in os.walk(src_dirpath):
+        rel_dirpath = os.path.relpath(dirpath, src_dirpath)
+        if modified_since_ns is None:
+            create_directory(join_filepath([dst_dirpath, rel_dirpath]))
+
+        for filename in filenames:
+            rel_path = os.path.normpath(join_filepath([rel_dirpath, filename]))
+            if rel_path in skip:
+                continue
+
+            src = join_filepath([dirpath, filename])
+            if (
+                modified_since_ns is not None
+                and os.stat(src).st_mtime_ns < modified_since_ns
+            ):
+                continue
+
+            dst = join_filepath([dst_dirpath, rel_path])
+            create_directory(os.path.dirname(dst))
+            if os.path.exists(dst):
+                os.remove(dst)
+
+            if dirpath.endswith(ARRAYS_DIR_SUFFIX):
+                try:
+                    os.link(src, dst)
+                except OSError:
+                    # e.g. the cache is on another file system
+                    shutil.copy2(src, dst)
+            else:
+                _clone_file(src, dst)
+            size += os.stat(dst).st_size
+
+    return size
+
+
+def _clone_file(src: str, dst: str) -> None:
+    """
+    Copy src to dst, as a reflink (copy-on-write, no data copied)
+    where the file system supports it
+    """
+    if fcntl is not None:
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+            shutil.copystat(src, dst)
+            return
+        except OSError:
+            pass
+    shutil.copy2(src, dst)
+
+
+# ioctl request of Linux reflinks (btrfs, xfs)
+_FICLONE = 0x40049409
+
+
+def _replace_paths(value, mapping: Dict[str, str], memo: dict = None):
+    """
+    Replace path prefixes (mapping keys) in strings held by value
+    (dict, list, tuple and BaseData attributes are traversed)
+    """
+    memo = {} if memo is None else memo
+
+    if isinstance(value, str):
+        for old, new in mapping.items():
+            if value == old or value.startswith(f"{old}/"):
+                return new + value[len(old) :]
+        return value
+    elif isinstance(value, (dict, list, tuple, BaseData)):
+        if id(value) in memo:
+            return memo[id(value)]
+
+        if isinstance(value, dict):
+            memo[id(value)] = value
+            for k in list(value):
+                value[k] = _replace_paths(value[k], mapping, memo)
+        elif isinstance(value, list):
+            memo[id(value)] = value
+            value[:] = [_replace_paths(v, mapping, memo) for v in value]
+        elif isinstance(value, tuple):
+            memo[id(value)] = tuple(_replace_paths(v, mapping, memo) for v in value)
+        else:
+            memo[id(value)] = value
+            for k, v in vars(value).items():
+                value.__dict__[k] = _replace_paths(v, mapping, memo)
+        return memo[id(value)]
+
+    return value
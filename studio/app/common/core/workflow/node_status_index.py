@@ -0,0 +1,147 @@
+import json
+import os
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from glob import glob
+from typing import Dict, Optional
+
+from filelock import FileLock
+
+from studio.app.common.core.utils.filepath_creater import join_filepath
+from studio.app.common.core.workflow.workflow import (
+    Message,
+    NodeRunStatus,
+    OutputPath,
+)
+from studio.app.common.dataclass.base import BaseData
+from studio.app.const import DATE_FORMAT
+
+
+def create_output_paths(info: dict, node_dirpath: str) -> Dict[str, OutputPath]:
+    output_paths: Dict[str, OutputPath] = {}
+    for k, v in info.items():
+        if isinstance(v, BaseData):
+            v.save_json(node_dirpath)
+            if v.output_path:
+                output_paths[k] = v.output_path
+
+    return output_paths
+
+
+@dataclass
+class NodeStatus:
+    status: str
+    message: str
+    pickle_path: str
+    pickle_mtime: int
+    finished_at: str
+    hasNWB: bool = False
+    outputPaths: Optional[Dict[str, OutputPath]] = None
+    # content key of the node result (see NodeCache)
+    cache_key: Optional[str] = None
+
+    @property
+    def is_current(self) -> bool:
+        """
+        Whether this status still corresponds to the node pickle on disk
+        (the pickle is removed or rewritten when the node is re-run)
+        """
+        try:
+            return os.stat(self.pickle_path).st_mtime_ns == self.pickle_mtime
+        except FileNotFoundError:
+            return False
+
+    def to_message(self) -> Message:
+        return Message(
+            status=self.status, message=self.message, outputPaths=self.outputPaths
+        )
+
+
+class NodeStatusIndex:
+    """
+    Per-workflow index of finished nodes, written by the rule runners
+    on completion so that result observation does not load node pickles.
+
+    File format ({workflow_dirpath}/node_status.json):
+      {node_id: NodeStatus, ...}
+    """
+
+    FILE_NAME = "node_status.json"
+    LOCK_TIMEOUT = 30  # sec
+
+    def __init__(self, workflow_dirpath: str):
+        self.filepath = join_filepath([workflow_dirpath, self.FILE_NAME])
+
+    @classmethod
+    def from_pickle_path(cls, pickle_path: str) -> "NodeStatusIndex":
+        """
+        pickle_path format
+          - {workflow_dirpath}/{node_id}/{algo_name}.pkl
+        """
+        return cls(os.path.dirname(os.path.dirname(pickle_path)))
+
+    def read(self) -> Dict[str, NodeStatus]:
+        if not os.path.exists(self.filepath):
+            return {}
+
+        with open(self.filepath, "r") as f:
+            index = json.load(f)
+
+        return {
+            node_id: NodeStatus(
+                **{
+                    **value,
+                    "outputPaths": (
+                        {k: OutputPath(**v) for k, v in value["outputPaths"].items()}
+                        if value.get("outputPaths")
+                        else None
+                    ),
+                }
+            )
+            for node_id, value in index.items()
+        }
+
+    def write(self, node_id: str, node_status: NodeStatus) -> None:
+        with FileLock(f"{self.filepath}.lock", timeout=self.LOCK_TIMEOUT):
+            index = {k: asdict(v) for k, v in self.read().items()}
+            index[node_id] = asdict(node_status)
+
+            # write atomically, readers never see a partially written index
+            tmp_filepath = f"{self.filepath}.tmp"
+            with open(tmp_filepath, "w") as f:
+                json.dump(index, f)
+            os.replace(tmp_filepath, self.filepath)
+
+    @classmethod
+    def write_success(
+        cls, pickle_path: str, output_info: dict, cache_key: str = None
+    ) -> None:
+        node_dirpath = os.path.dirname(pickle_path)
+        algo_name = os.path.splitext(os.path.basename(pickle_path))[0]
+
+        cls.__write_node_status(
+            pickle_path,
+            status=NodeRunStatus.SUCCESS.value,
+            message=f"{algo_name} success",
+            outputPaths=create_output_paths(output_info, node_dirpath),
+            hasNWB=len(glob(join_filepath([node_dirpath, "*.nwb"]))) > 0,
+            cache_key=cache_key,
+        )
+
+    @classmethod
+    def write_error(cls, pickle_path: str, message: str) -> None:
+        cls.__write_node_status(
+            pickle_path, status=NodeRunStatus.ERROR.value, message=message
+        )
+
+    @classmethod
+    def __write_node_status(cls, pickle_path: str, **kwargs) -> None:
+        node_id = os.path.basename(os.path.dirname(pickle_path))
+        node_status = NodeStatus(
+            pickle_path=pickle_path,
+            pickle_mtime=os.stat(pickle_path).st_mtime_ns,
+            finished_at=datetime.now().strftime(DATE_FORMAT),
+            **kwargs,
+        )
+
+        cls.from_pickle_path(pickle_path).write(node_id, node_status)
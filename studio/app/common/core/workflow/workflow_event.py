@@ -0,0 +1,141 @@
+import asyncio
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from studio.app.common.core.logger import AppLogger
+from studio.app.common.core.workflow.workflow import Message, WorkflowRunStatus
+
+logger = AppLogger.get_logger()
+
+
+@dataclass
+class WorkflowEventType:
+    NODE_STARTED: str = "node_started"
+    NODE_FINISHED: str = "node_finished"
+    WORKFLOW_FINISHED: str = "workflow_finished"
+
+
+@dataclass
+class WorkflowEvent:
+    type: str
+    nodeId: Optional[str] = None
+    status: Optional[str] = None
+    message: Optional[Message] = None
+
+    def to_sse(self) -> str:
+        return f"event: {self.type}\ndata: {json.dumps(asdict(self))}\n\n"
+
+
+class WorkflowEventBroker:
+    """
+    In-process publish/subscribe of workflow status transitions.
+
+    Events are published from the snakemake thread (see SmkStatusLogger)
+    and delivered to listeners running on the asyncio event loop.
+    Events of recent workflows are kept, so that late listeners
+    receive the transitions which happened before they subscribed.
+
+    Workflows without history (run before a restart, by another server
+    process, or trimmed from the history) are finished from their persisted
+    status instead, checked every KEEPALIVE_INTERVAL.
+    """
+
+    MAX_HISTORY_WORKFLOWS = 100
+    KEEPALIVE_INTERVAL = 15  # sec
+
+    __lock = threading.Lock()
+    __listeners: Dict[Tuple[str, str], List[tuple]] = {}
+    __history: "OrderedDict[Tuple[str, str], List[WorkflowEvent]]" = OrderedDict()
+
+    @classmethod
+    def reset(cls, workspace_id: str, unique_id: str) -> None:
+        """
+        Start the history of a workflow run by this process
+        """
+        key = (workspace_id, unique_id)
+        with cls.__lock:
+            cls.__history[key] = []
+            cls.__history.move_to_end(key)
+            cls.__trim_history()
+
+    @classmethod
+    def publish(cls, workspace_id: str, unique_id: str, event: WorkflowEvent) -> None:
+        key = (workspace_id, unique_id)
+
+        with cls.__lock:
+            cls.__history.setdefault(key, []).append(event)
+            cls.__history.move_to_end(key)
+            cls.__trim_history()
+
+            listeners = list(cls.__listeners.get(key, []))
+
+        for loop, queue in listeners:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, event)
+            except RuntimeError:
+                # event loop of the listener is already closed
+                logger.warning(f"Failed to deliver workflow event. [{key}]")
+
+    @classmethod
+    async def listen(
+        cls,
+        workspace_id: str,
+        unique_id: str,
+        get_status: Optional[Callable[[], str]] = None,
+    ) -> AsyncIterator[Optional[WorkflowEvent]]:
+        """
+        Yield events of the workflow until it finishes,
+        and None after KEEPALIVE_INTERVAL without events (keep-alive).
+
+        get_status: blocking function returning the persisted workflow status
+                    (WorkflowRunStatus), for workflows without history
+        """
+        key = (workspace_id, unique_id)
+        listener = (asyncio.get_running_loop(), asyncio.Queue())
+        loop, queue = listener
+
+        with cls.__lock:
+            for event in cls.__history.get(key, []):
+                queue.put_nowait(event)
+            cls.__listeners.setdefault(key, []).append(listener)
+
+        try:
+            while True:
+                if queue.empty() and get_status is not None and not cls.__tracks(key):
+                    status = await loop.run_in_executor(None, get_status)
+                    if not WorkflowRunStatus.is_running(status):
+                        yield WorkflowEvent(
+                            type=WorkflowEventType.WORKFLOW_FINISHED, status=status
+                        )
+                        break
+
+                try:
+                    event: WorkflowEvent = await asyncio.wait_for(
+                        queue.get(), timeout=cls.KEEPALIVE_INTERVAL
+                    )
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+
+                yield event
+
+                if event.type == WorkflowEventType.WORKFLOW_FINISHED:
+                    break
+        finally:
+            with cls.__lock:
+                cls.__listeners[key].remove(listener)
+                if len(cls.__listeners[key]) == 0:
+                    cls.__listeners.pop(key)
+
+    @classmethod
+    def __tracks(cls, key: Tuple[str, str]) -> bool:
+        with cls.__lock:
+            return key in cls.__history
+
+    @classmethod
+    def __trim_history(cls) -> None:
+        while len(cls.__history) > cls.MAX_HISTORY_WORKFLOWS:
+            cls.__history.popitem(last=False)
@@ -10,15 +10,21 @@ from typing import Dict, List
 from fastapi import HTTPException, status
 from psutil import AccessDenied, NoSuchProcess, Process, ZombieProcess, process_iter
 
+from studio.app.common.core.experiment.experiment import ExptConfig
 from studio.app.common.core.experiment.experiment_reader import ExptConfigReader
 from studio.app.common.core.experiment.experiment_writer import ExptConfigWriter
 from studio.app.common.core.logger import AppLogger
+from studio.app.common.core.rules.rule_worker import RUN_SCRIPT_PREFIX
 from studio.app.common.core.rules.runner import Runner
 from studio.app.common.core.snakemake.smk_status_logger import SmkStatusLogger
 from studio.app.common.core.utils.filepath_creater import join_filepath
 from studio.app.common.core.utils.pickle_handler import PickleReader
-from studio.app.common.core.workflow.workflow import Message, NodeRunStatus, OutputPath
-from studio.app.common.dataclass import BaseData
+from studio.app.common.core.workflow.node_status_index import (
+    NodeStatus,
+    NodeStatusIndex,
+    create_output_paths,
+)
+from studio.app.common.core.workflow.workflow import Message, NodeRunStatus
 from studio.app.common.schemas.workflow import (
     WorkflowErrorInfo,
     WorkflowPIDFileData,
@@ -45,6 +51,7 @@ class WorkflowResult:
             [self.workflow_dirpath, DIRPATH.EXPERIMENT_YML]
         )
         self.monitor = WorkflowMonitor(workspace_id, unique_id)
+        self.status_index = NodeStatusIndex(self.workflow_dirpath)
 
     def observe(self, nodeIdList: List[str]) -> Dict:
         """
@@ -90,6 +97,16 @@ class WorkflowResult:
         self, nodeIdList: List[str], workflow_error: WorkflowErrorInfo
     ) -> Dict[str, Message]:
         results: Dict[str, Message] = {}
+        indexed_statuses: Dict[str, NodeStatus] = {}
+
+        if not workflow_error.has_error:
+            indexed_statuses = {
+                node_id: node_status
+                for node_id, node_status in self.status_index.read().items()
+                if node_id in nodeIdList and node_status.is_current
+            }
+            if indexed_statuses:
+                self.__update_indexed_nodes(indexed_statuses)
 
         for node_id in nodeIdList:
             # Cases with errors in workflow
@@ -104,6 +121,10 @@ class WorkflowResult:
                 )
                 results[node_id] = node_result.observe()
 
+            # Case of finished node registered in the status index
+            elif node_id in indexed_statuses:
+                results[node_id] = indexed_statuses[node_id].to_message()
+
             # Normal case
             else:
                 # search node pickle files
@@ -130,6 +151,35 @@ class WorkflowResult:
 
         return results
 
+    def __update_indexed_nodes(self, node_statuses: Dict[str, NodeStatus]) -> None:
+        """
+        Reflect newly finished nodes to EXPERIMENT_YML (once per node)
+        """
+        expt_config = ExptConfigReader.read(self.expt_filepath)
+
+        updated = False
+        for node_id, node_status in node_statuses.items():
+            function = expt_config.function.get(node_id)
+            if function is None or (
+                function.success == node_status.status
+                and function.finished_at == node_status.finished_at
+            ):
+                continue
+
+            function.success = node_status.status
+            function.message = node_status.message
+            function.finished_at = node_status.finished_at
+            function.hasNWB = function.hasNWB or node_status.hasNWB
+            if NodeRunStatus.is_success(node_status.status):
+                function.outputPaths = node_status.outputPaths
+            updated = True
+
+        if updated:
+            update_expt_status(expt_config)
+            ExptConfigWriter.write_raw(
+                self.workspace_id, self.unique_id, asdict(expt_config)
+            )
+
     def __is_workflow_status_running(
         self, nodeIdList: List[str], messages: Dict[str, Message]
     ) -> bool:
@@ -161,8 +211,12 @@ class WorkflowResult:
                 config = ExptConfigReader.read(self.expt_filepath)
 
                 if target_whole_nwb:
+                    if config.hasNWB:
+                        continue
                     config.hasNWB = True
                 else:
+                    if config.function[node_id].hasNWB:
+                        continue
                     config.function[node_id].hasNWB = True
 
                 # Update EXPERIMENT_YML
@@ -228,14 +282,7 @@ class NodeResult:
         expt_config.function[self.node_id].finished_at = now
         expt_config.function[self.node_id].message = message.message
 
-        statuses = list(map(lambda x: x.success, expt_config.function.values()))
-
-        if NodeRunStatus.RUNNING.value not in statuses:
-            expt_config.finished_at = now
-            if NodeRunStatus.ERROR.value in statuses:
-                expt_config.success = NodeRunStatus.ERROR.value
-            else:
-                expt_config.success = NodeRunStatus.SUCCESS.value
+        update_expt_status(expt_config, now)
 
         # Update EXPERIMENT_YML
         ExptConfigWriter.write_raw(
@@ -262,18 +309,28 @@ class NodeResult:
         return Message(status=NodeRunStatus.ERROR.value, message=message)
 
     def output_paths(self) -> dict:
-        output_paths: Dict[str, OutputPath] = {}
-        for k, v in self.info.items():
-            if isinstance(v, BaseData):
-                v.save_json(self.node_dirpath)
-                if v.output_path:
-                    output_paths[k] = v.output_path
+        return create_output_paths(self.info, self.node_dirpath)
 
-        return output_paths
+
+def update_expt_status(expt_config: ExptConfig, finished_at: str = None) -> None:
+    """
+    Update the workflow status from the statuses of its functions
+    """
+    statuses = list(map(lambda x: x.success, expt_config.function.values()))
+
+    if NodeRunStatus.RUNNING.value not in statuses:
+        expt_config.finished_at = finished_at or datetime.now().strftime(DATE_FORMAT)
+        if NodeRunStatus.ERROR.value in statuses:
+            expt_config.success = NodeRunStatus.ERROR.value
+        else:
+            expt_config.success = NodeRunStatus.SUCCESS.value
 
 
 class WorkflowMonitor:
     PROCESS_SNAKEMAKE_CMDLINE = "python .*/\\.snakemake/scripts/"
+    PROCESS_RULE_WORKER_CMDLINE = (
+        "python.* -m studio\\.app\\.common\\.core\\.rules\\.rule_worker "
+    )
     PROCESS_SNAKEMAKE_WAIT_TIMEOUT = 7200  # sec
     PROCESS_CONDA_CMDLINE = "conda env create .*/\\.snakemake/conda/"
     PROCESS_CONDA_WAIT_TIMEOUT = 3600  # sec
@@ -325,7 +382,9 @@ class WorkflowMonitor:
 
             # validate process name
             process_cmdline = " ".join(process.cmdline())
-            if not re.search(self.PROCESS_SNAKEMAKE_CMDLINE, process_cmdline):
+            if not re.search(
+                self.PROCESS_SNAKEMAKE_CMDLINE, process_cmdline
+            ) and not re.search(self.PROCESS_RULE_WORKER_CMDLINE, process_cmdline):
                 logger.warning(
                     "Found another process with same PID:"
                     f" [{last_pid}] [{process_cmdline}]"
@@ -436,7 +495,11 @@ class WorkflowMonitor:
             )
         pid_data = current_process.pid_data
 
-        if os.path.exists(pid_data.last_script_file):
+        if pid_data.last_script_file.startswith(RUN_SCRIPT_PREFIX):
+            # run by a warm rule worker (no run script)
+            pass
+
+        elif os.path.exists(pid_data.last_script_file):
             # force remove run script file
             os.remove(pid_data.last_script_file)
 
@@ -1,6 +1,7 @@
 import uuid
+from collections import deque
 from dataclasses import asdict
-from typing import Dict, List
+from typing import Dict, List, Set
 
 from studio.app.common.core.experiment.experiment_writer import ExptConfigWriter
 from studio.app.common.core.snakemake.smk import FlowConfig, Rule, SmkParam
@@ -82,6 +83,8 @@ class WorkflowRunner:
 
         nwbfile = get_typecheck_params(self.runItem.nwbParam, "nwb")
 
+        forceRunNodeIds = self.get_forceRunNodeIds()
+
         rule_dict: Dict[str, Rule] = {}
         last_outputs = []
 
@@ -120,6 +123,7 @@ class WorkflowRunner:
                     node=node,
                     edgeDict=self.edgeDict,
                 ).algo(nodeDict=self.nodeDict)
+                algo_rule.forcerun = node.id in forceRunNodeIds
 
                 rule_dict[node.id] = algo_rule
 
@@ -130,6 +134,24 @@ class WorkflowRunner:
 
         return rule_dict, last_outputs
 
+    def get_forceRunNodeIds(self) -> Set[str]:
+        """
+        Force-run nodes and their downstream nodes (see delete_dependencies)
+        """
+        nodeIds = set()
+        queue = deque(param.nodeId for param in self.runItem.forceRunList)
+        while len(queue) > 0:
+            node_id = queue.pop()
+            if node_id in nodeIds:
+                continue
+            nodeIds.add(node_id)
+
+            for edge in self.edgeDict.values():
+                if node_id == edge.source:
+                    queue.append(edge.target)
+
+        return nodeIds
+
     def get_endNodeList(self) -> List[str]:
         returnCntDict = {key: 0 for key in self.nodeDict.keys()}
         for edge in self.edgeDict.values():
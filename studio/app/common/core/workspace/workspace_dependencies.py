@@ -9,7 +9,7 @@ from studio.app.common.db.database import get_db
 from studio.app.common.schemas.users import User
 
 
-async def is_workspace_owner(
+def is_workspace_owner(
     workspace_id: Union[int, str],
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
@@ -30,7 +30,7 @@ async def is_workspace_owner(
         return True
 
 
-async def is_workspace_available(
+def is_workspace_available(
     workspace_id: Union[int, str],
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
@@ -0,0 +1,224 @@
+import json
+import os
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional
+
+from filelock import FileLock
+
+from studio.app.common.core.utils.filepath_creater import (
+    create_directory,
+    join_filepath,
+)
+from studio.app.common.dataclass.image import read_tiff_metadata
+from studio.app.const import ACCEPT_FILE_EXT
+from studio.app.dir_path import DIRPATH
+
+
+@dataclass
+class FileMetadata:
+    size: int
+    mtime: int
+    # TIFF files only ([] if the headers could not be read)
+    shape: Optional[List[int]] = None
+    dtype: Optional[str] = None
+
+
+class WorkspaceFileIndex:
+    """
+    Per-workspace index of the input files, so that the file tree is not
+    listed (and TIFF files not read) on each request.
+
+    File format ({DATA_DIR}/file_index/{workspace_id}.json):
+      {
+        "dirs": {relative_dirpath: mtime, ...},
+        "files": {relative_filepath: FileMetadata, ...}
+      }
+
+    Uploads, downloads and deletes update the index. Other changes are
+    found on read: only the directories whose mtime changed are listed again,
+    the other indexed files are checked by their size and mtime (files
+    rewritten in place), and only new or modified TIFF files are probed
+    (headers only).
+
+    The index is kept out of the input directory, so that reading the file tree
+    does not write into the workspace of the user.
+    """
+
+    INDEX_DIR = f"{DIRPATH.DATA_DIR}/file_index"
+    LOCK_TIMEOUT = 30  # sec
+
+    def __init__(self, workspace_id: str):
+        self.dirpath = join_filepath([DIRPATH.INPUT_DIR, workspace_id])
+        self.filepath = join_filepath([self.INDEX_DIR, f"{workspace_id}.json"])
+
+    def get(self) -> Dict[str, FileMetadata]:
+        """
+        Metadata of the accepted input files, by path relative to the workspace
+        """
+        if not os.path.exists(self.dirpath):
+            return {}
+
+        create_directory(os.path.dirname(self.filepath))
+        with FileLock(f"{self.filepath}.lock", timeout=self.LOCK_TIMEOUT):
+            index = self.__read()
+            if self.__refresh(index):
+                self.__write(index)
+
+        return {k: FileMetadata(**v) for k, v in index["files"].items()}
+
+    def update(self, relative_path: str) -> FileMetadata:
+        """
+        (Re)index a file, after its upload or download
+        """
+        create_directory(os.path.dirname(self.filepath))
+        with FileLock(f"{self.filepath}.lock", timeout=self.LOCK_TIMEOUT):
+            index = self.__read()
+            metadata = self.__probe(
+                relative_path, os.stat(self.__abspath(relative_path))
+            )
+            index["files"][relative_path] = asdict(metadata)
+            self.__write(index)
+
+        return metadata
+
+    def remove(self, relative_path: str) -> None:
+        if not os.path.exists(self.filepath):
+            return
+
+        with FileLock(f"{self.filepath}.lock", timeout=self.LOCK_TIMEOUT):
+            index = self.__read()
+            if index["files"].pop(relative_path, None) is not None:
+                self.__write(index)
+
+    def __read(self) -> dict:
+        try:
+            with open(self.filepath, "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {"dirs": {}, "files": {}}
+
+    def __write(self, index: dict) -> None:
+        # write atomically, readers never see a partially written index
+        tmp_filepath = f"{self.filepath}.tmp"
+        with open(tmp_filepath, "w") as f:
+            json.dump(index, f)
+        os.replace(tmp_filepath, self.filepath)
+
+    def __refresh(self, index: dict) -> bool:
+        """
+        List again the new and modified directories, returns if index changed
+        """
+        pending = [
+            dirname
+            for dirname, mtime in index["dirs"].items()
+            if self.__mtime(dirname) != mtime
+        ]
+        if "" not in index["dirs"]:
+            pending.append("")
+
+        changed = len(pending) > 0
+        scanned = set()
+        while pending:
+            dirname = pending.pop()
+            scanned.add(dirname)
+            pending.extend(self.__scan(index, dirname))
+
+        # files rewritten in place do not change the mtime of their directory
+        files = index["files"]
+        for relative_path in list(files):
+            if self.__parent(relative_path) in scanned:
+                continue
+
+            try:
+                stat = os.stat(self.__abspath(relative_path))
+            except FileNotFoundError:
+                del files[relative_path]
+                changed = True
+                continue
+
+            if self.__is_modified(files[relative_path], stat):
+                files[relative_path] = asdict(self.__probe(relative_path, stat))
+                changed = True
+
+        return changed
+
+    def __scan(self, index: dict, dirname: str) -> List[str]:
+        """
+        Index the direct children of a directory, returns its new subdirectories
+        """
+        files, dirs = index["files"], index["dirs"]
+        mtime = self.__mtime(dirname)
+
+        # removed directory: its children are dropped with it
+        if mtime is None:
+            self.__drop(index, dirname)
+            return []
+
+        new_dirs = []
+        children_dirs, children_files = set(), set()
+        with os.scandir(self.__abspath(dirname)) as entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+
+                relative_path = self.__relpath(dirname, entry.name)
+                if entry.is_dir():
+                    children_dirs.add(relative_path)
+                    if relative_path not in dirs:
+                        new_dirs.append(relative_path)
+                elif entry.name.endswith(tuple(ACCEPT_FILE_EXT.ALL_EXT.value)):
+                    children_files.add(relative_path)
+                    stat = entry.stat()
+                    metadata = files.get(relative_path)
+                    if metadata is None or self.__is_modified(metadata, stat):
+                        files[relative_path] = asdict(self.__probe(relative_path, stat))
+
+        for path in list(files):
+            if self.__parent(path) == dirname and path not in children_files:
+                del files[path]
+        for path in list(dirs):
+            if self.__parent(path) == dirname and path not in children_dirs:
+                self.__drop(index, path)
+
+        dirs[dirname] = mtime
+        return new_dirs
+
+    def __drop(self, index: dict, dirname: str) -> None:
+        prefix = f"{dirname}/"
+        for key in ["files", "dirs"]:
+            for path in list(index[key]):
+                if path == dirname or path.startswith(prefix):
+                    del index[key][path]
+
+    def __probe(self, relative_path: str, stat: os.stat_result) -> FileMetadata:
+        metadata = FileMetadata(size=stat.st_size, mtime=stat.st_mtime_ns)
+        if relative_path.endswith(tuple(ACCEPT_FILE_EXT.TIFF_EXT.value)):
+            try:
+                shape, dtype = read_tiff_metadata(self.__abspath(relative_path))
+                metadata.shape, metadata.dtype = list(shape), dtype
+            except Exception:
+                metadata.shape = []
+        return metadata
+
+    @staticmethod
+    def __is_modified(metadata: dict, stat: os.stat_result) -> bool:
+        return metadata["size"] != stat.st_size or metadata["mtime"] != stat.st_mtime_ns
+
+    def __mtime(self, dirname: str) -> Optional[int]:
+        try:
+            return os.stat(self.__abspath(dirname)).st_mtime_ns
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+
+    def __abspath(self, relative_path: str) -> str:
+        if relative_path == "":
+            return self.dirpath
+        return join_filepath([self.dirpath, relative_path])
+
+    @staticmethod
+    def __relpath(dirname: str, name: str) -> str:
+        return name if dirname == "" else join_filepath([dirname, name])
+
+    @staticmethod
+    def __parent(relative_path: str) -> str:
+        return os.path.dirname(relative_path)
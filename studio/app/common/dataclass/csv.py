@@ -8,6 +8,7 @@ from studio.app.common.core.utils.filepath_creater import (
     join_filepath,
 )
 from studio.app.common.core.utils.json_writer import JsonWriter
+from studio.app.common.core.utils.timeseries_store import TimeSeriesStore
 from studio.app.common.dataclass.base import BaseData
 from studio.app.common.schemas.outputs import PlotMetaData
 
@@ -38,7 +39,11 @@ class CsvData(BaseData):
         create_directory(self.json_path)
         JsonWriter.write_plot_meta(json_dir, self.file_name, self.meta)
 
-        for i, data in enumerate(self.data):
-            JsonWriter.write_as_split(
-                join_filepath([self.json_path, f"{str(i)}.json"]), data
-            )
+        try:
+            TimeSeriesStore.write(self.json_path, self.data)
+        except ValueError:
+            # non numeric data (e.g. a header row), served from per cell json files
+            for i, data in enumerate(self.data):
+                JsonWriter.write_as_split(
+                    join_filepath([self.json_path, f"{str(i)}.json"]), data
+                )
@@ -1,7 +1,6 @@
 from typing import Optional
 
 import numpy as np
-import pandas as pd
 
 from studio.app.common.core.utils.filepath_creater import join_filepath
 from studio.app.common.core.utils.json_writer import JsonWriter
@@ -30,11 +29,7 @@ class HeatMapData(BaseData):
 
     def save_json(self, json_dir):
         self.json_path = join_filepath([json_dir, f"{self.file_name}.json"])
-        df = pd.DataFrame(
-            self.data,
-            columns=self.columns,
-        )
-        JsonWriter.write_as_split(self.json_path, df)
+        JsonWriter.write_as_split(self.json_path, self.data, columns=self.columns)
         JsonWriter.write_plot_meta(json_dir, self.file_name, self.meta)
 
     @property
@@ -2,7 +2,6 @@ from typing import Optional
 
 import matplotlib.pyplot as plt
 import numpy as np
-import pandas as pd
 
 from studio.app.common.core.utils.filepath_creater import join_filepath
 from studio.app.common.core.utils.json_writer import JsonWriter
@@ -29,8 +28,7 @@ class HistogramData(BaseData):
 
     def save_json(self, json_dir):
         self.json_path = join_filepath([json_dir, f"{self.file_name}.json"])
-        df = pd.DataFrame(self.data)
-        JsonWriter.write_as_split(self.json_path, df)
+        JsonWriter.write_as_split(self.json_path, self.data)
 
     @property
     def output_path(self) -> OutputPath:
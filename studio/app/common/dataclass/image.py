@@ -1,7 +1,7 @@
 import gc
 import math
 import os
-from typing import Optional
+from typing import List, Optional, Tuple
 
 import imageio
 import numpy as np
@@ -19,6 +19,136 @@ from studio.app.common.schemas.outputs import PlotMetaData
 from studio.app.dir_path import DIRPATH
 
 
+def read_tiff_metadata(path: str) -> Tuple[tuple, str]:
+    """
+    Read shape and dtype of a TIFF file from its headers only.
+    """
+    with tifffile.TiffFile(path) as tif:
+        series = tif.series[0]
+        return tuple(series.shape), str(series.dtype)
+
+
+def write_tiff(path: str, data, batch_bytes: int = 2**26) -> None:
+    """
+    Write an image to a TIFF file. Frames of a movie are copied in batches
+    (of about batch_bytes), so that memory-mapped, strided or lazily read
+    movies (frame-indexable objects) are not loaded into memory at once.
+    """
+    if data.ndim < 3:
+        tifffile.imwrite(path, np.asarray(data))
+        return
+
+    shape, dtype = tuple(data.shape), np.dtype(data.dtype)
+    batch = max(1, batch_bytes // max(1, math.prod(shape[1:]) * dtype.itemsize))
+
+    image = tifffile.memmap(path, shape=shape, dtype=dtype)
+    for start in range(0, shape[0], batch):
+        image[start : start + batch] = data[start : start + batch]
+    image.flush()
+    del image
+
+
+class LazyTiffStack:
+    """
+    Read-only, frame-indexable view over one or more TIFF files.
+    Frames are concatenated along the first axis, as ImageData.data does,
+    but pixel data is only read (memory-mapped when possible) on slicing.
+    """
+
+    def __init__(self, paths: List[str], shapes: List[tuple], dtype: str):
+        self.paths = paths
+        self.shapes = shapes
+        self.dtype = np.dtype(dtype)
+
+        self.__offsets = np.cumsum([0] + [s[0] for s in shapes])
+        self.__sources = [None] * len(paths)
+
+    @property
+    def shape(self) -> tuple:
+        if len(self.shapes) == 1:
+            return self.shapes[0]
+        return (int(self.__offsets[-1]), *self.shapes[0][1:])
+
+    @property
+    def ndim(self) -> int:
+        return len(self.shape)
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def __array__(self, dtype=None):
+        array = self[:]
+        return array if dtype is None else array.astype(dtype)
+
+    def __getitem__(self, key):
+        if self.ndim < 3:
+            return self.__source(0)[key]
+
+        frame_key, rest = (key[0], key[1:]) if isinstance(key, tuple) else (key, ())
+
+        if isinstance(frame_key, (int, np.integer)):
+            index = range(len(self))[frame_key]
+            return self.__read_frames(index, index + 1, rest)[0]
+        elif isinstance(frame_key, slice):
+            start, stop, step = frame_key.indices(len(self))
+            if step != 1:
+                return self[np.arange(start, stop, step)][(slice(None), *rest)]
+            return self.__read_frames(start, stop, rest)
+        else:
+            indices = np.arange(len(self))[frame_key]
+            frames = [self.__read_frames(i, i + 1, rest) for i in indices]
+            if len(frames) == 0:
+                return self.__read_frames(0, 0, rest)
+            return np.concatenate(frames)
+
+    def __read_frames(self, start: int, stop: int, rest: tuple = ()) -> np.ndarray:
+        """
+        Frames [start, stop), indexed by `rest` within each frame
+        (applied per file, so that only the indexed pixels are read)
+        """
+        frames = []
+        for i, offset in enumerate(self.__offsets[:-1]):
+            file_start = max(start - offset, 0)
+            file_stop = min(stop - offset, self.shapes[i][0])
+            if file_start < file_stop:
+                frames.append(
+                    self.__source(i)[file_start:file_stop][(slice(None), *rest)]
+                )
+
+        if len(frames) == 0:
+            empty = np.empty((0, *self.shape[1:]), dtype=self.dtype)
+            return empty[(slice(None), *rest)]
+        elif len(frames) == 1:
+            return frames[0]
+        return np.concatenate(frames)
+
+    def __source(self, i: int):
+        if self.__sources[i] is None:
+            try:
+                self.__sources[i] = tifffile.memmap(self.paths[i], mode="r")
+            except ValueError:
+                # not memory-mappable (e.g. compressed), read pages on demand
+                self.__sources[i] = _TiffPageReader(self.paths[i])
+        return self.__sources[i]
+
+
+class _TiffPageReader:
+    def __init__(self, path: str):
+        self.path = path
+
+    def __getitem__(self, key):
+        with tifffile.TiffFile(self.path) as tif:
+            series = tif.series[0]
+            frames = range(series.shape[0])[key] if len(series.shape) > 2 else None
+            if (
+                isinstance(frames, range)
+                and len(series.pages) == series.shape[0]
+                and series.keyframe.ndim == len(series.shape) - 1
+            ):
+                return np.stack([series.pages[i].asarray() for i in frames])
+            return series.asarray()[key]
+
+
 class ImageData(BaseData):
     def __init__(
         self,
@@ -31,6 +161,8 @@ class ImageData(BaseData):
 
         self.json_path = None
         self.meta = meta
+        self._shapes = None
+        self._dtype = None
 
         if data is None:
             self.path = None
@@ -43,16 +175,89 @@ class ImageData(BaseData):
             create_directory(_dir)
 
             _path = join_filepath([_dir, f"{file_name}.tif"])
-            tifffile.imsave(_path, data)
+            write_tiff(_path, data)
             self.path = [_path]
+            self._shapes = [tuple(data.shape)]
+            self._dtype = str(data.dtype)
 
             del data
             gc.collect()
 
+        if self.path is not None and self._shapes is None:
+            self.__load_metadata()
+
+    def __load_metadata(self):
+        metadata = []
+        for path in self.paths:
+            try:
+                metadata.append(read_tiff_metadata(path))
+            except Exception:
+                # fallback for files whose headers tifffile cannot interpret
+                image = self.__read_path(path)
+                metadata.append((image.shape, str(image.dtype)))
+        self._shapes = [shape for shape, _ in metadata]
+        self._dtype = metadata[0][1]
+
+    @staticmethod
+    def __read_path(path):
+        return np.array(imageio.volread(path))
+
+    @property
+    def paths(self) -> List[str]:
+        return self.path if isinstance(self.path, list) else [self.path]
+
+    @property
+    def file_shapes(self) -> Optional[List[tuple]]:
+        if self.path is None:
+            return None
+        if getattr(self, "_shapes", None) is None:
+            # pickles created before metadata caching was introduced
+            self.__load_metadata()
+        return self._shapes
+
+    @property
+    def shape(self) -> Optional[tuple]:
+        shapes = self.file_shapes
+        if shapes is None:
+            return None
+        elif len(shapes) == 1:
+            return shapes[0]
+        return (sum(s[0] for s in shapes), *shapes[0][1:])
+
+    @property
+    def ndim(self) -> Optional[int]:
+        return None if self.shape is None else len(self.shape)
+
+    @property
+    def dtype(self) -> Optional[np.dtype]:
+        return None if self.file_shapes is None else np.dtype(self._dtype)
+
+    @property
+    def frame_count(self) -> int:
+        """
+        Number of frames (1 for a single 2D image)
+        """
+        return self.shape[0] if self.ndim >= 3 else 1
+
+    @property
+    def lazy_data(self) -> LazyTiffStack:
+        """
+        Memory-mapped view of the image, frames are read only on slicing
+        """
+        return LazyTiffStack(self.paths, self.file_shapes, self._dtype)
+
+    def get_frames(self, start: int = 0, stop: int = None) -> np.ndarray:
+        """
+        Read frames [start, stop) without loading the whole image
+        """
+        if self.ndim < 3:
+            return self.data[np.newaxis, :, :]
+        return np.asarray(self.lazy_data[start:stop])
+
     def split_image(self, output_dir: str, n_files: int = 2):
         assert n_files > 1, "n_files should be greater than 1"
 
-        image = self.data
+        image = self.lazy_data
         frames = image.shape[0]
         frames_per_part = math.ceil(frames // n_files)
 
@@ -77,19 +282,19 @@ class ImageData(BaseData):
     @property
     def data(self):
         if isinstance(self.path, list):
-            return np.concatenate([imageio.volread(p) for p in self.path])
+            return np.concatenate([self.__read_path(p) for p in self.path])
         else:
-            return np.array(imageio.volread(self.path))
+            return self.__read_path(self.path)
 
     def save_json(self, json_dir):
-        if self.data.ndim < 3:
+        if self.ndim < 3:
             self.json_path = join_filepath([json_dir, f"{self.file_name}.json"])
             JsonWriter.write_as_split(self.json_path, create_images_list(self.data))
             JsonWriter.write_plot_meta(json_dir, self.file_name, self.meta)
 
     @property
     def output_path(self) -> OutputPath:
-        if self.data.ndim >= 3:
+        if self.ndim >= 3:
             # self.path will be a list if self.data got into else statement on __init__
             if isinstance(self.path, list) and isinstance(self.path[0], str):
                 _path = self.path[0]
@@ -98,7 +303,7 @@ class ImageData(BaseData):
             return OutputPath(
                 path=_path,
                 type=OutputType.IMAGE,
-                max_index=len(self.data),
+                max_index=self.frame_count,
             )
         else:
             return OutputPath(
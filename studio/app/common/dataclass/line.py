@@ -1,7 +1,6 @@
 from typing import Optional
 
 import matplotlib.pyplot as plt
-import pandas as pd
 
 from studio.app.common.core.utils.filepath_creater import join_filepath
 from studio.app.common.core.utils.json_writer import JsonWriter
@@ -22,8 +21,7 @@ class LineData(BaseData):
 
     def save_json(self, json_dir):
         self.json_path = join_filepath([json_dir, f"{self.file_name}.json"])
-        df = pd.DataFrame(self.data, columns=self.columns)
-        JsonWriter.write_as_split(self.json_path, df)
+        JsonWriter.write_as_split(self.json_path, self.data, columns=self.columns)
 
     @property
     def output_path(self) -> OutputPath:
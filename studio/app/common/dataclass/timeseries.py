@@ -8,6 +8,7 @@ from studio.app.common.core.utils.filepath_creater import (
     join_filepath,
 )
 from studio.app.common.core.utils.json_writer import JsonWriter
+from studio.app.common.core.utils.timeseries_store import TimeSeriesStore
 from studio.app.common.core.workflow.workflow import OutputPath, OutputType
 from studio.app.common.dataclass.base import BaseData
 from studio.app.common.schemas.outputs import PlotMetaData
@@ -60,6 +61,19 @@ class TimeSeriesData(BaseData):
         create_directory(self.json_path, delete_dir=True)
         JsonWriter.write_plot_meta(json_dir, self.file_name, self.meta)
 
+        try:
+            TimeSeriesStore.write(
+                self.json_path,
+                self.data,
+                std=self.std,
+                index=self.index,
+                cell_numbers=self.cell_numbers,
+            )
+        except ValueError:
+            # non numeric data (e.g. a header row), served from per cell json files
+            self.__save_cell_jsons()
+
+    def __save_cell_jsons(self):
         for i, cell_i in enumerate(self.cell_numbers):
             data = self.data[i]
             if self.std is not None:
@@ -60,7 +60,7 @@ class NestDictGetter:
 
 
 @router.get("/algolist", response_model=AlgoList, tags=["others"])
-async def get_algolist() -> Dict[str, Algo]:
+def get_algolist() -> Dict[str, Algo]:
     """_summary_
 
     Returns:
@@ -27,7 +27,7 @@ logger = AppLogger.get_logger()
     response_model=Dict[str, ExptConfig],
     dependencies=[Depends(is_workspace_available)],
 )
-async def get_experiments(workspace_id: str):
+def get_experiments(workspace_id: str):
     exp_config = {}
     config_paths = glob(
         join_filepath([DIRPATH.OUTPUT_DIR, workspace_id, "*", DIRPATH.EXPERIMENT_YML])
@@ -48,7 +48,7 @@ async def get_experiments(workspace_id: str):
     response_model=ExptConfig,
     dependencies=[Depends(is_workspace_owner)],
 )
-async def rename_experiment(workspace_id: str, unique_id: str, item: RenameItem):
+def rename_experiment(workspace_id: str, unique_id: str, item: RenameItem):
     config = ExptDataWriter(
         workspace_id,
         unique_id,
@@ -72,7 +72,7 @@ async def rename_experiment(workspace_id: str, unique_id: str, item: RenameItem)
     response_model=bool,
     dependencies=[Depends(is_workspace_owner)],
 )
-async def delete_experiment(workspace_id: str, unique_id: str):
+def delete_experiment(workspace_id: str, unique_id: str):
     try:
         ExptDataWriter(
             workspace_id,
@@ -92,7 +92,7 @@ async def delete_experiment(workspace_id: str, unique_id: str):
     response_model=bool,
     dependencies=[Depends(is_workspace_owner)],
 )
-async def delete_experiment_list(workspace_id: str, deleteItem: DeleteItem):
+def delete_experiment_list(workspace_id: str, deleteItem: DeleteItem):
     try:
         for unique_id in deleteItem.uidList:
             ExptDataWriter(
@@ -112,7 +112,7 @@ async def delete_experiment_list(workspace_id: str, deleteItem: DeleteItem):
     "/download/config/{workspace_id}/{unique_id}",
     dependencies=[Depends(is_workspace_available)],
 )
-async def download_config_experiment(workspace_id: str, unique_id: str):
+def download_config_experiment(workspace_id: str, unique_id: str):
     config_filepath = join_filepath(
         [DIRPATH.OUTPUT_DIR, workspace_id, unique_id, DIRPATH.SNAKEMAKE_CONFIG_YML]
     )
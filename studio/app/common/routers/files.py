@@ -1,18 +1,14 @@
-import json
 import os
 import shutil
-from glob import glob
 from pathlib import PurePath
 from typing import Dict, List
 from urllib.parse import urlparse
 
 import requests
-import tifffile
 from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, UploadFile
 from requests.models import Response
 from tqdm import tqdm
 
-from studio.app.common.core.utils.file_reader import JsonReader
 from studio.app.common.core.utils.filepath_creater import (
     create_directory,
     join_filepath,
@@ -21,6 +17,10 @@ from studio.app.common.core.workspace.workspace_dependencies import (
     is_workspace_available,
     is_workspace_owner,
 )
+from studio.app.common.core.workspace.workspace_file_index import (
+    FileMetadata,
+    WorkspaceFileIndex,
+)
 from studio.app.common.schemas.files import (
     DownloadFileRequest,
     DownloadStatus,
@@ -38,106 +38,57 @@ class DirTreeGetter:
     def get_tree(
         cls, workspace_id, file_types: List[str], dirname: str = None
     ) -> List[TreeNode]:
-        nodes: List[TreeNode] = []
-
-        if dirname is None:
-            absolute_dirpath = join_filepath([DIRPATH.INPUT_DIR, workspace_id])
-        else:
-            absolute_dirpath = join_filepath([DIRPATH.INPUT_DIR, workspace_id, dirname])
+        files = {
+            path: metadata
+            for path, metadata in WorkspaceFileIndex(workspace_id).get().items()
+            if path.endswith(tuple(file_types))
+        }
+        with_shape = file_types == ACCEPT_FILE_EXT.TIFF_EXT.value
 
-        if not os.path.exists(absolute_dirpath):
-            return nodes
-
-        sorted_listdir = sorted(
-            os.listdir(absolute_dirpath),
-            key=lambda x: (not os.path.isdir(join_filepath([absolute_dirpath, x])), x),
-        )
+        return cls.__get_nodes(files, with_shape, dirname)
 
-        IMAGE_SHAPE_DICT = (
-            get_image_shape_dict(workspace_id)
-            if file_types == ACCEPT_FILE_EXT.TIFF_EXT.value
-            else {}
-        )
+    @classmethod
+    def __get_nodes(
+        cls, files: Dict[str, FileMetadata], with_shape: bool, dirname: str = None
+    ) -> List[TreeNode]:
+        prefix = "" if dirname is None else f"{dirname}/"
 
-        for node_name in sorted_listdir:
-            if dirname is None:
-                relative_path = node_name
-            else:
-                relative_path = join_filepath([dirname, node_name])
+        # direct children of dirname: {name: isdir}
+        children: Dict[str, bool] = {}
+        for path in files:
+            if path.startswith(prefix):
+                name, *rest = path[len(prefix) :].split("/", 1)
+                children[name] = len(rest) > 0
 
-            search_dirpath = join_filepath([absolute_dirpath, node_name])
+        nodes: List[TreeNode] = []
+        for node_name in sorted(children, key=lambda x: (not children[x], x)):
+            relative_path = f"{prefix}{node_name}"
 
-            if os.path.isfile(search_dirpath) and node_name.endswith(tuple(file_types)):
-                shape = IMAGE_SHAPE_DICT.get(relative_path, {}).get("shape")
-                if shape is None and file_types == ACCEPT_FILE_EXT.TIFF_EXT.value:
-                    shape = update_image_shape(workspace_id, relative_path)
+            if children[node_name]:
                 nodes.append(
                     TreeNode(
-                        path=relative_path,
+                        path=node_name,
                         name=node_name,
-                        isdir=False,
-                        nodes=[],
-                        shape=shape,
+                        isdir=True,
+                        nodes=cls.__get_nodes(files, with_shape, relative_path),
                     )
                 )
-            elif (
-                os.path.isdir(search_dirpath)
-                and len(cls.accept_files(search_dirpath, file_types)) > 0
-            ):
+            else:
                 nodes.append(
                     TreeNode(
-                        path=node_name,
+                        path=relative_path,
                         name=node_name,
-                        isdir=True,
-                        nodes=cls.get_tree(workspace_id, file_types, relative_path),
+                        isdir=False,
+                        nodes=[],
+                        shape=files[relative_path].shape if with_shape else None,
                     )
                 )
 
         return nodes
 
-    @classmethod
-    def accept_files(cls, path: str, file_types: List[str]):
-        files_list = []
-        for file_type in file_types:
-            files_list.extend(
-                glob(join_filepath([path, "**", f"*{file_type}"]), recursive=True)
-            )
-
-        return files_list
-
-
-def get_image_shape_dict(workspace_id):
-    dirpath = join_filepath([DIRPATH.INPUT_DIR, workspace_id])
-    try:
-        tiff_format_dict = JsonReader.read(
-            join_filepath([dirpath, ".image_shape.json"])
-        )
-        return tiff_format_dict
-    except FileNotFoundError:
-        return {}
-
 
 def update_image_shape(workspace_id, relative_file_path):
-    dirpath = join_filepath([DIRPATH.INPUT_DIR, workspace_id])
-    filepath = join_filepath([dirpath, relative_file_path])
-
-    try:
-        img = tifffile.imread(filepath)
-        shape = img.shape
-    except:  # noqa
-        shape = []
-
-    tiff_format_file = join_filepath([dirpath, ".image_shape.json"])
-    try:
-        tiff_format_dict = JsonReader.read(tiff_format_file)
-    except FileNotFoundError:
-        tiff_format_dict = {}
-    tiff_format_dict[relative_file_path] = {"shape": shape}
-
-    with open(tiff_format_file, "w") as f:
-        json.dump(tiff_format_dict, f, indent=4)
-
-    return shape
+    return WorkspaceFileIndex(workspace_id).update(relative_file_path).shape
 
 
 @router.get(
@@ -145,7 +96,7 @@ def update_image_shape(workspace_id, relative_file_path):
     response_model=List[TreeNode],
     dependencies=[Depends(is_workspace_available)],
 )
-async def get_files(workspace_id: str, file_type: str = None):
+def get_files(workspace_id: str, file_type: str = None):
     if file_type == FILETYPE.IMAGE:
         return DirTreeGetter.get_tree(workspace_id, ACCEPT_FILE_EXT.TIFF_EXT.value)
     elif file_type == FILETYPE.CSV:
@@ -167,7 +118,7 @@ async def get_files(workspace_id: str, file_type: str = None):
     response_model=bool,
     dependencies=[Depends(is_workspace_owner)],
 )
-async def set_shape(workspace_id: str, filepath: str):
+def set_shape(workspace_id: str, filepath: str):
     try:
         update_image_shape(workspace_id, filepath)
     except Exception as e:
@@ -180,7 +131,7 @@ async def set_shape(workspace_id: str, filepath: str):
     response_model=FilePath,
     dependencies=[Depends(is_workspace_owner)],
 )
-async def create_file(workspace_id: str, filename: str, file: UploadFile = File(...)):
+def create_file(workspace_id: str, filename: str, file: UploadFile = File(...)):
     create_directory(join_filepath([DIRPATH.INPUT_DIR, workspace_id]))
 
     filepath = join_filepath([DIRPATH.INPUT_DIR, workspace_id, filename])
@@ -201,12 +152,13 @@ DOWNLOAD_STATUS: Dict[str, DownloadStatus] = {}
     response_model=bool,
     dependencies=[Depends(is_workspace_owner)],
 )
-async def delete_file(workspace_id: str, filename: str):
+def delete_file(workspace_id: str, filename: str):
     filepath = join_filepath([DIRPATH.INPUT_DIR, workspace_id, filename])
     if not os.path.exists(filepath):
         raise HTTPException(status_code=404, detail="File not found.")
     try:
         os.remove(filepath)
+        WorkspaceFileIndex(workspace_id).remove(filename)
         return True
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -217,7 +169,7 @@ async def delete_file(workspace_id: str, filename: str):
     response_model=DownloadStatus,
     dependencies=[Depends(is_workspace_available)],
 )
-async def get_download_status(workspace_id: str, file_name: str):
+def get_download_status(workspace_id: str, file_name: str):
     filepath = join_filepath([DIRPATH.INPUT_DIR, workspace_id, file_name])
     try:
         return DOWNLOAD_STATUS[filepath]
@@ -229,7 +181,7 @@ async def get_download_status(workspace_id: str, file_name: str):
     "/{workspace_id}/download",
     dependencies=[Depends(is_workspace_owner)],
 )
-async def download_file(
+def download_file(
     workspace_id: str,
     file: DownloadFileRequest,
     background_tasks: BackgroundTasks,
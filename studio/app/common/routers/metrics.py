@@ -0,0 +1,19 @@
+from typing import Dict
+
+from fastapi import APIRouter
+
+from studio.app.common.core.utils.latency_metrics import LatencyMetrics
+from studio.app.common.schemas.metrics import LatencySummary
+
+router = APIRouter(prefix="/metrics", tags=["others"])
+
+
+@router.get("/latency", response_model=Dict[str, LatencySummary])
+def get_latency():
+    return LatencyMetrics.summary()
+
+
+@router.delete("/latency", response_model=bool)
+def reset_latency():
+    LatencyMetrics.reset()
+    return True
@@ -2,16 +2,30 @@ import os
 from glob import glob
 from typing import Optional
 
+import numpy as np
 import pandas as pd
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Response, status
+from fastapi.concurrency import run_in_threadpool
 
+from studio.app.common.core.utils.api_executor import ApiExecutor
+from studio.app.common.core.utils.downsampling import block_reduce
 from studio.app.common.core.utils.file_reader import JsonReader, Reader
 from studio.app.common.core.utils.filepath_creater import (
     create_directory,
     join_filepath,
 )
+from studio.app.common.core.utils.frame_reader import TiffFrameReader
+from studio.app.common.core.utils.image_pyramid import ImagePyramid
 from studio.app.common.core.utils.json_writer import JsonWriter, save_tiff2json
-from studio.app.common.schemas.outputs import JsonTimeSeriesData, OutputData
+from studio.app.common.core.utils.timeseries_store import TimeSeriesStore
+from studio.app.common.dataclass.image import read_tiff_metadata
+from studio.app.common.schemas.outputs import (
+    DownsampleMethod,
+    ImagePyramidInfo,
+    JsonTimeSeriesData,
+    OutputData,
+    PyramidMethod,
+)
 from studio.app.const import ACCEPT_FILE_EXT
 from studio.app.dir_path import DIRPATH
 
@@ -30,8 +44,45 @@ def get_initial_timeseries_data(dirpath) -> JsonTimeSeriesData:
     )
 
 
-@router.get("/inittimedata/{dirpath:path}", response_model=JsonTimeSeriesData)
-async def get_inittimedata(dirpath: str):
+def get_image_filepath(filepath: str, workspace_id: str) -> str:
+    if not filepath.startswith(join_filepath([DIRPATH.OUTPUT_DIR, workspace_id])):
+        filepath = join_filepath([DIRPATH.INPUT_DIR, workspace_id, filepath])
+    return filepath
+
+
+def get_image_tiff_path(filepath: str, workspace_id: str) -> str:
+    tiff_path = ImagePyramid.get_source_path(get_image_filepath(filepath, workspace_id))
+    if not os.path.exists(tiff_path):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="File not found."
+        )
+    return tiff_path
+
+
+def block_reduce_output(output_data: OutputData, max_points: int) -> OutputData:
+    try:
+        values = np.array(output_data.data, dtype=float)
+    except (TypeError, ValueError):
+        # not a numeric matrix
+        return output_data
+    if values.ndim != 2:
+        return output_data
+
+    reduced, rows, cols = block_reduce(values, max_points, max_points)
+    if reduced.shape == values.shape:
+        return output_data
+
+    data = reduced.astype(object)
+    data[np.isnan(reduced)] = None
+    output_data.data = data.tolist()
+    if output_data.index is not None:
+        output_data.index = [output_data.index[i] for i in rows]
+    if output_data.columns is not None:
+        output_data.columns = [output_data.columns[i] for i in cols]
+    return output_data
+
+
+def get_json_inittimedata(dirpath: str) -> JsonTimeSeriesData:
     file_numbers = sorted(
         [
             os.path.splitext(os.path.basename(x))[0]
@@ -70,8 +121,7 @@ async def get_inittimedata(dirpath: str):
     return return_data
 
 
-@router.get("/timedata/{dirpath:path}", response_model=JsonTimeSeriesData)
-async def get_timedata(dirpath: str, index: int):
+def get_json_timedata(dirpath: str, index: int) -> JsonTimeSeriesData:
     json_data = JsonReader.read_as_timeseries(
         join_filepath([dirpath, f"{str(index)}.json"])
     )
@@ -86,8 +136,7 @@ async def get_timedata(dirpath: str, index: int):
     return return_data
 
 
-@router.get("/alltimedata/{dirpath:path}", response_model=JsonTimeSeriesData)
-async def get_alltimedata(dirpath: str):
+def get_json_alltimedata(dirpath: str) -> JsonTimeSeriesData:
     return_data = get_initial_timeseries_data(dirpath)
 
     for i, path in enumerate(glob(join_filepath([dirpath, "*.json"]))):
@@ -103,13 +152,99 @@ async def get_alltimedata(dirpath: str):
     return return_data
 
 
+@router.get("/inittimedata/{dirpath:path}", response_model=JsonTimeSeriesData)
+def get_inittimedata(
+    dirpath: str,
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    max_points: Optional[int] = None,
+    method: DownsampleMethod = DownsampleMethod.MINMAX,
+):
+    """
+    Frames [start, end) of the first cell, and the first frame of the others.
+    With max_points, the first cell is downsampled to about max_points.
+    """
+    if not TimeSeriesStore.exists(dirpath):
+        # per cell json files of outputs written before TimeSeriesStore
+        return get_json_inittimedata(dirpath)
+
+    # first frame of all cells
+    first = TimeSeriesStore.read(dirpath, start=start, stop=(start or 0) + 1)
+    cell = next(iter(first.data))
+    json_data = TimeSeriesStore.read(dirpath, [cell], start, end, max_points, method)
+
+    return_data = get_initial_timeseries_data(dirpath)
+    return_data.xrange = json_data.xrange
+    return_data.data = {**first.data, **json_data.data}
+    if json_data.std is not None:
+        return_data.std = {**first.std, **json_data.std}
+
+    return return_data
+
+
+@router.get("/timedata/{dirpath:path}", response_model=JsonTimeSeriesData)
+def get_timedata(
+    dirpath: str,
+    index: int,
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    max_points: Optional[int] = None,
+    method: DownsampleMethod = DownsampleMethod.MINMAX,
+):
+    if not TimeSeriesStore.exists(dirpath):
+        return get_json_timedata(dirpath, index)
+
+    try:
+        json_data = TimeSeriesStore.read(
+            dirpath, [index], start, end, max_points, method
+        )
+    except KeyError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+    return_data = get_initial_timeseries_data(dirpath)
+    return_data.data = json_data.data
+    if json_data.std is not None:
+        return_data.std = json_data.std
+
+    return return_data
+
+
+@router.get("/alltimedata/{dirpath:path}", response_model=JsonTimeSeriesData)
+def get_alltimedata(
+    dirpath: str,
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    max_points: Optional[int] = None,
+    method: DownsampleMethod = DownsampleMethod.MINMAX,
+):
+    if not TimeSeriesStore.exists(dirpath):
+        return get_json_alltimedata(dirpath)
+
+    json_data = TimeSeriesStore.read(dirpath, None, start, end, max_points, method)
+
+    return_data = get_initial_timeseries_data(dirpath)
+    return_data.xrange = json_data.xrange
+    return_data.data = json_data.data
+    if json_data.std is not None:
+        return_data.std = json_data.std
+
+    return return_data
+
+
 @router.get("/data/{filepath:path}", response_model=OutputData)
-async def get_file(filepath: str):
-    return JsonReader.read_as_output(filepath)
+def get_file(filepath: str, max_points: Optional[int] = None):
+    """
+    With max_points, matrices (e.g. heatmaps) are reduced to at most
+    (max_points, max_points) by the mean of blocks of rows and columns.
+    """
+    output_data = JsonReader.read_as_output(filepath)
+    if max_points:
+        output_data = block_reduce_output(output_data, max_points)
+    return output_data
 
 
 @router.get("/html/{filepath:path}", response_model=OutputData)
-async def get_html(filepath: str):
+def get_html(filepath: str):
     return Reader.read_as_output(filepath)
 
 
@@ -122,8 +257,7 @@ async def get_image(
 ):
     filename, ext = os.path.splitext(os.path.basename(filepath))
     if ext in ACCEPT_FILE_EXT.TIFF_EXT.value:
-        if not filepath.startswith(join_filepath([DIRPATH.OUTPUT_DIR, workspace_id])):
-            filepath = join_filepath([DIRPATH.INPUT_DIR, workspace_id, filepath])
+        filepath = get_image_filepath(filepath, workspace_id)
 
         save_dirpath = join_filepath(
             [
@@ -135,15 +269,101 @@ async def get_image(
             [save_dirpath, f"{filename}_{str(start_index)}_{str(end_index)}.json"]
         )
         if not os.path.exists(json_filepath):
-            save_tiff2json(filepath, save_dirpath, start_index, end_index)
+            # cpu-heavy, run out of the server process
+            await ApiExecutor.run_in_process(
+                save_tiff2json, filepath, save_dirpath, start_index, end_index
+            )
     else:
         json_filepath = filepath
 
-    return JsonReader.read_as_output(json_filepath)
+    return await run_in_threadpool(JsonReader.read_as_output, json_filepath)
+
+
+@router.get("/image_frames/{filepath:path}", response_class=Response)
+def get_image_frames(
+    filepath: str,
+    workspace_id: str,
+    start_index: Optional[int] = 0,
+    end_index: Optional[int] = 10,
+    downsample: Optional[int] = 1,
+    quantize: Optional[bool] = False,
+):
+    """
+    Binary counterpart of `/outputs/image`, reads only the requested frames.
+    See `TiffFrameReader` for the payload layout.
+    """
+    _, ext = os.path.splitext(os.path.basename(filepath))
+    if ext not in ACCEPT_FILE_EXT.TIFF_EXT.value:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Not a tiff file."
+        )
+    if downsample < 1:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid downsample."
+        )
+
+    filepath = get_image_filepath(filepath, workspace_id)
+    if not os.path.exists(filepath):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="File not found."
+        )
+
+    payload = TiffFrameReader.read(
+        filepath, start_index, end_index, downsample, quantize
+    )
+    return Response(content=payload, media_type="application/octet-stream")
+
+
+@router.get("/image_levels/{filepath:path}", response_model=ImagePyramidInfo)
+def get_image_levels(filepath: str, workspace_id: str):
+    tiff_path = get_image_tiff_path(filepath, workspace_id)
+    shape, _ = read_tiff_metadata(tiff_path)
+
+    return ImagePyramidInfo(
+        shape=list(shape),
+        tile_size=ImagePyramid.TILE_SIZE,
+        levels=[list(level) for level in ImagePyramid.get_levels(shape)],
+    )
+
+
+@router.get("/image_tile/{filepath:path}", response_class=Response)
+def get_image_tile(
+    filepath: str,
+    workspace_id: str,
+    level: int = 0,
+    frame: int = 0,
+    tile_x: int = 0,
+    tile_y: int = 0,
+    method: PyramidMethod = PyramidMethod.MEAN,
+    quantize: Optional[bool] = False,
+):
+    """
+    Tile of a frame of an image or ROI output, at a level of its pyramid
+    (level 0 is the full resolution, level n is downsampled by 2**n).
+    The pyramid is built in the background on the first request if not built
+    yet, tiles are reduced on the fly until then.
+    Payload layout is the one of `/outputs/image_frames`.
+    """
+    tiff_path = get_image_tiff_path(filepath, workspace_id)
+    shape, _ = read_tiff_metadata(tiff_path)
+    n_frames = shape[0] if len(shape) > 2 else 1
+    if not 0 <= level <= ImagePyramid.MAX_LEVEL or not 0 <= frame < n_frames:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid level or frame."
+        )
+
+    if level > 0:
+        ImagePyramid.build_in_background(tiff_path)
+
+    tile = ImagePyramid.read_tile(tiff_path, level, frame, tile_x, tile_y, method)
+    return Response(
+        content=TiffFrameReader.encode(tile, frame, quantize),
+        media_type="application/octet-stream",
+    )
 
 
 @router.get("/csv/{filepath:path}", response_model=OutputData)
-async def get_csv(filepath: str, workspace_id: str):
+def get_csv(filepath: str, workspace_id: str):
     filepath = join_filepath([DIRPATH.INPUT_DIR, workspace_id, filepath])
 
     filename, _ = os.path.splitext(os.path.basename(filepath))
@@ -10,13 +10,13 @@ router = APIRouter(tags=["params"])
 
 
 @router.get("/params/{name}", response_model=Dict[str, Any])
-async def get_params(name: str):
+def get_params(name: str):
     filepath = find_param_filepath(name)
     config = ConfigReader.read(filepath)
     return config
 
 
 @router.get("/snakemake", response_model=SnakemakeParams)
-async def get_snakemake_params():
+def get_snakemake_params():
     filepath = find_param_filepath("snakemake")
     return ConfigReader.read(filepath)
@@ -1,9 +1,25 @@
+from functools import partial
 from typing import Dict
 
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 
+from studio.app.common.core.experiment.experiment_reader import ExptConfigReader
 from studio.app.common.core.logger import AppLogger
-from studio.app.common.core.workflow.workflow import Message, NodeItem, RunItem
+from studio.app.common.core.utils.filepath_creater import join_filepath
+from studio.app.common.core.utils.image_pyramid import ImagePyramid
+from studio.app.common.core.workflow.workflow import (
+    Message,
+    NodeItem,
+    NodeRunStatus,
+    RunItem,
+    WorkflowRunStatus,
+)
+from studio.app.common.core.workflow.workflow_event import (
+    WorkflowEventBroker,
+    WorkflowEventType,
+)
 from studio.app.common.core.workflow.workflow_result import (
     WorkflowMonitor,
     WorkflowResult,
@@ -13,18 +29,56 @@ from studio.app.common.core.workspace.workspace_dependencies import (
     is_workspace_available,
     is_workspace_owner,
 )
+from studio.app.dir_path import DIRPATH
 
 router = APIRouter(prefix="/run", tags=["run"])
 
 logger = AppLogger.get_logger()
 
 
+def build_image_pyramids(results: Dict[str, Message]) -> None:
+    """
+    Build the pyramids of the produced 2D image and ROI outputs in the background
+    """
+    try:
+        for tiff_path in ImagePyramid.get_sources(results):
+            ImagePyramid.build_in_background(tiff_path)
+    except Exception as e:
+        # pyramids are built on demand otherwise
+        logger.error(e, exc_info=True)
+
+
+def get_workflow_status(workspace_id: str, uid: str) -> str:
+    """
+    Persisted status of a workflow, for workflows not run by this process
+    """
+    try:
+        expt_filepath = join_filepath(
+            [DIRPATH.OUTPUT_DIR, workspace_id, uid, DIRPATH.EXPERIMENT_YML]
+        )
+        expt_config = ExptConfigReader.read(expt_filepath)
+        if WorkflowRunStatus.is_running(expt_config.success):
+            # statuses of finished nodes (and lost processes) are persisted
+            WorkflowResult(workspace_id, uid).observe(
+                [
+                    node_id
+                    for node_id, function in expt_config.function.items()
+                    if function.success == NodeRunStatus.RUNNING.value
+                ]
+            )
+            expt_config = ExptConfigReader.read(expt_filepath)
+        return expt_config.success
+    except Exception as e:
+        logger.error(e, exc_info=True)
+        return WorkflowRunStatus.ERROR.value
+
+
 @router.post(
     "/{workspace_id}",
     response_model=str,
     dependencies=[Depends(is_workspace_owner)],
 )
-async def run(workspace_id: str, runItem: RunItem, background_tasks: BackgroundTasks):
+def run(workspace_id: str, runItem: RunItem, background_tasks: BackgroundTasks):
     try:
         unique_id = WorkflowRunner.create_workflow_unique_id()
         WorkflowRunner(workspace_id, unique_id, runItem).run_workflow(background_tasks)
@@ -46,7 +100,7 @@ async def run(workspace_id: str, runItem: RunItem, background_tasks: BackgroundT
     response_model=str,
     dependencies=[Depends(is_workspace_owner)],
 )
-async def run_id(
+def run_id(
     workspace_id: str, uid: str, runItem: RunItem, background_tasks: BackgroundTasks
 ):
     try:
@@ -70,9 +124,11 @@ async def run_id(
     response_model=Dict[str, Message],
     dependencies=[Depends(is_workspace_available)],
 )
-async def run_result(workspace_id: str, uid: str, nodeDict: NodeItem):
+def run_result(workspace_id: str, uid: str, nodeDict: NodeItem):
     try:
-        return WorkflowResult(workspace_id, uid).observe(nodeDict.pendingNodeIdList)
+        results = WorkflowResult(workspace_id, uid).observe(nodeDict.pendingNodeIdList)
+        build_image_pyramids(results)
+        return results
     except Exception as e:
         logger.error(e, exc_info=True)
         raise HTTPException(
@@ -81,12 +137,48 @@ async def run_result(workspace_id: str, uid: str, nodeDict: NodeItem):
         )
 
 
+@router.get(
+    "/events/{workspace_id}/{uid}",
+    dependencies=[Depends(is_workspace_available)],
+)
+async def run_events(workspace_id: str, uid: str):
+    """
+    Server-Sent Events stream of node status transitions,
+    push alternative to polling `/run/result`.
+    """
+
+    async def event_stream():
+        async for event in WorkflowEventBroker.listen(
+            workspace_id, uid, partial(get_workflow_status, workspace_id, uid)
+        ):
+            if event is None:
+                # keep-alive comment, the connection is not left idle
+                yield ": keep-alive\n\n"
+                continue
+
+            # Node result is resolved once, on completion of the node
+            if event.type == WorkflowEventType.NODE_FINISHED and event.message is None:
+                try:
+                    results = await run_in_threadpool(
+                        WorkflowResult(workspace_id, uid).observe, [event.nodeId]
+                    )
+                    event.message = results.get(event.nodeId)
+                    event.status = event.message.status if event.message else None
+                    await run_in_threadpool(build_image_pyramids, results)
+                except Exception as e:
+                    logger.error(e, exc_info=True)
+
+            yield event.to_sse()
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
 @router.post(
     "/cancel/{workspace_id}/{uid}",
     response_model=bool,
     dependencies=[Depends(is_workspace_owner)],
 )
-async def cancel_run(workspace_id: str, uid: str):
+def cancel_run(workspace_id: str, uid: str):
     try:
         return WorkflowMonitor(workspace_id, uid).cancel_run()
     except HTTPException as e:
@@ -30,7 +30,7 @@ logger = AppLogger.get_logger()
     response_model=WorkflowWithResults,
     dependencies=[Depends(is_workspace_available)],
 )
-async def fetch_last_experiment(workspace_id: str):
+def fetch_last_experiment(workspace_id: str):
     try:
         last_expt_config = ExptUtils.get_last_experiment(workspace_id)
         if last_expt_config:
@@ -68,7 +68,7 @@ async def fetch_last_experiment(workspace_id: str):
     response_model=WorkflowWithResults,
     dependencies=[Depends(is_workspace_available)],
 )
-async def reproduce_experiment(workspace_id: str, unique_id: str):
+def reproduce_experiment(workspace_id: str, unique_id: str):
     try:
         experiment_config_path = join_filepath(
             [DIRPATH.OUTPUT_DIR, workspace_id, unique_id, DIRPATH.EXPERIMENT_YML]
@@ -104,7 +104,7 @@ async def reproduce_experiment(workspace_id: str, unique_id: str):
     "/download/{workspace_id}/{unique_id}",
     dependencies=[Depends(is_workspace_available)],
 )
-async def download_workspace_config(workspace_id: str, unique_id: str):
+def download_workspace_config(workspace_id: str, unique_id: str):
     config_filepath = join_filepath(
         [DIRPATH.OUTPUT_DIR, workspace_id, unique_id, DIRPATH.WORKFLOW_YML]
     )
@@ -136,7 +136,7 @@ async def import_workflow_config(file: UploadFile = File(...)):
     "/sample_data/{workspace_id}",
     dependencies=[Depends(is_workspace_available)],
 )
-async def copy_sample_data(workspace_id: str):
+def copy_sample_data(workspace_id: str):
     sample_data_dir_name = "sample_data"
     folders = ["input", "output"]
 
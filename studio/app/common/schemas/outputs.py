@@ -1,4 +1,5 @@
 from dataclasses import asdict, dataclass
+from enum import Enum
 from typing import Dict, List, Optional, Union
 
 
@@ -24,3 +25,21 @@ class OutputData:
 class JsonTimeSeriesData(OutputData):
     xrange: list = None
     std: Dict[str, dict] = None
+
+
+@dataclass
+class ImagePyramidInfo:
+    shape: List[int]
+    tile_size: int
+    # (height, width) of each level, level 0 is the full resolution
+    levels: List[List[int]]
+
+
+class DownsampleMethod(str, Enum):
+    MINMAX = "minmax"
+    LTTB = "lttb"
+
+
+class PyramidMethod(str, Enum):
+    MEAN = "mean"
+    MAX = "max"
@@ -15,10 +15,12 @@ from studio.app.common.core.utils.filepath_creater import join_filepath
 from studio.app.common.core.utils.filepath_finder import find_condaenv_filepath
 from studio.app.common.core.utils.pickle_handler import PickleReader, PickleWriter
 from studio.app.common.dataclass.base import BaseData
+from studio.app.common.dataclass.image import ImageData
 from studio.app.dir_path import DIRPATH
 from studio.app.optinist.core.edit_ROI.utils import create_ellipse_mask
 from studio.app.optinist.core.edit_ROI.wrappers import edit_roi_wrapper_dict
 from studio.app.optinist.core.nwb.nwb_creater import overwrite_nwb
+from studio.app.optinist.core.nwb.nwb_dataio import NWBDataIO
 from studio.app.optinist.dataclass import EditRoiData, IscellData, RoiData
 from studio.app.optinist.schemas.roi import RoiStatus
 
@@ -75,6 +77,7 @@ class EditROI:
     def __init__(self, file_path):
         self.node_dirpath = os.path.dirname(file_path)
         self.workflow_dirpath = os.path.dirname(self.node_dirpath)
+
         self.function_id = ExptOutputPathIds(self.node_dirpath).function_id
 
         self.output_info: Dict = PickleReader.read(self.pickle_file_path)
@@ -92,7 +95,10 @@ class EditROI:
         if not isinstance(self.tmp_data, EditRoiData):
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST)
 
-        self.tmp_data.images = None
+        # keep the movie reference only (older pickles hold the movie itself)
+        self.tmp_data.images = (
+            self.data.images if isinstance(self.data.images, ImageData) else None
+        )
 
         self.tmp_iscell = self.tmp_output_info.get(
             "iscell", self.output_info.get("iscell")
@@ -116,28 +122,25 @@ class EditROI:
 
     @property
     def shape(self):
-        return self.tmp_data.im.shape[1:]
+        return self.tmp_data.im.frame_shape
 
     @property
     def num_cell(self):
-        return self.tmp_data.im.shape[0]
+        return len(self.tmp_data.im)
 
     def get_status(self) -> RoiStatus:
         return self.tmp_data.status()
 
     def add(self, roi_pos):
         new_roi = create_ellipse_mask(self.shape, roi_pos)
-        new_roi = new_roi[np.newaxis, :, :] * self.num_cell
 
         self.tmp_data.temp_add_roi[self.num_cell] = roi_pos
         self.tmp_iscell = np.append(self.tmp_iscell, CellType.TEMP_ADD)
-        self.tmp_data.im = np.vstack((self.tmp_data.im, new_roi))
+        self.tmp_data.im = self.tmp_data.im.append(new_roi)
 
         info = {
             "cell_roi": RoiData(
-                np.nanmax(
-                    self.tmp_data.im[self.tmp_iscell != CellType.NON_ROI], axis=0
-                ),
+                self.tmp_data.im.label_image(self.tmp_iscell != CellType.NON_ROI),
                 output_dir=self.node_dirpath,
                 file_name="cell_roi",
             ),
@@ -148,22 +151,17 @@ class EditROI:
         self.__save_json(info)
 
     def merge(self, ids: List[int]):
-        merging_rois = self.tmp_data.im[ids, :, :]
-        merging_rois[np.isnan(merging_rois)] = -np.inf
-        merged_roi = np.maximum.reduce(merging_rois)
-        merged_roi = np.where(merged_roi == -np.inf, np.nan, self.num_cell)
+        merged_roi = self.tmp_data.im.union(ids)
 
         self.tmp_data.temp_merge_roi[float(self.num_cell)] = ids
-        self.tmp_data.im = np.vstack((self.tmp_data.im, merged_roi[np.newaxis, :, :]))
+        self.tmp_data.im = self.tmp_data.im.append(merged_roi)
 
         self.tmp_iscell[ids] = CellType.TEMP_DELETE
         self.tmp_iscell = np.append(self.tmp_iscell, CellType.TEMP_ADD)
 
         info = {
             "cell_roi": RoiData(
-                np.nanmax(
-                    self.tmp_data.im[self.tmp_iscell != CellType.NON_ROI], axis=0
-                ),
+                self.tmp_data.im.label_image(self.tmp_iscell != CellType.NON_ROI),
                 output_dir=self.node_dirpath,
                 file_name="cell_roi",
             ),
@@ -189,6 +187,8 @@ class EditROI:
         self.__save_json(info)
 
     def commit(self):
+        self.tmp_data.images = self.data.images
+
         if "suite2p" in self.function_id:
             from studio.app.optinist.core.edit_ROI.wrappers.suite2p_edit_roi import (
                 commit_edit as suite2p_commit,
@@ -207,7 +207,6 @@ class EditROI:
             )
 
             info = lccd_commit(
-                self.data.images,
                 self.tmp_data,
                 self.output_info.get("fluorescence"),
                 self.tmp_iscell,
@@ -221,7 +220,6 @@ class EditROI:
             )
 
             info = caiman_commit(
-                self.data.images,
                 self.tmp_data,
                 self.output_info.get("fluorescence"),
                 self.tmp_iscell,
@@ -235,11 +233,7 @@ class EditROI:
         self.__save_json(info)
         self.__update_whole_nwb(info)
 
-        (
-            os.remove(self.tmp_pickle_file_path)
-            if os.path.exists(self.tmp_pickle_file_path)
-            else None
-        )
+        PickleWriter.remove(self.tmp_pickle_file_path)
 
     def cancel(self):
         original_num_cell = len(self.output_info.get("fluorescence").data)
@@ -249,19 +243,13 @@ class EditROI:
 
         info = {
             "cell_roi": RoiData(
-                np.nanmax(
-                    self.tmp_data.im[self.tmp_iscell != CellType.NON_ROI], axis=0
-                ),
+                self.tmp_data.im.label_image(self.tmp_iscell != CellType.NON_ROI),
                 output_dir=self.node_dirpath,
                 file_name="cell_roi",
             ),
         }
         self.__save_json(info)
-        (
-            os.remove(self.tmp_pickle_file_path)
-            if os.path.exists(self.tmp_pickle_file_path)
-            else None
-        )
+        PickleWriter.remove(self.tmp_pickle_file_path)
 
     def __update_whole_nwb(self, output_info):
         smk_config_file = join_filepath(
@@ -288,7 +276,16 @@ class EditROI:
                 nwb_files = glob(join_filepath([self.node_dirpath, "[!tmp_]*.nwb"]))
 
                 if len(nwb_files) > 0:
-                    overwrite_nwb(v, self.node_dirpath, os.path.basename(nwb_files[0]))
+                    # chunking and compression of the input nwb settings
+                    input_nwbfile = (self.output_info.get("nwbfile") or {}).get(
+                        "input"
+                    ) or {}
+                    overwrite_nwb(
+                        v,
+                        self.node_dirpath,
+                        os.path.basename(nwb_files[0]),
+                        NWBDataIO.from_config(input_nwbfile.get("dataset_io")),
+                    )
 
     def __update_pickle_for_roi_edition(self, file_path, new_output_info):
         func_name = os.path.splitext(os.path.basename(self.pickle_file_path))[0]
@@ -1,3 +1,5 @@
+import numpy as np
+
 from studio.app.optinist.core.nwb.nwb import NWBDATASET
 from studio.app.optinist.dataclass.roi import EditRoiData
 
@@ -8,10 +10,11 @@ def set_nwbfile(edit_roi_data: EditRoiData, iscell, function_id, fluorescence=No
 
     # NWBにROIを追加
     roi_list = []
-    n_cells = edit_roi_data.im.shape[0]
+    n_cells = len(edit_roi_data.im)
     for i in range(n_cells):
+        ypix, xpix = edit_roi_data.im.yx(i)
         kargs = {}
-        kargs["image_mask"] = edit_roi_data.im[i, :]
+        kargs["pixel_mask"] = np.array([ypix, xpix, np.ones(len(ypix))]).T
         roi_list.append(kargs)
     nwbfile[NWBDATASET.ROI] = {function_id: roi_list}
 
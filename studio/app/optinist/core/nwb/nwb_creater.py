@@ -1,8 +1,9 @@
 import os
-import shutil
 from datetime import datetime
 
+import numpy as np
 from dateutil.tz import tzlocal
+from hdmf.common import VectorData, VectorIndex
 from pynwb import NWBHDF5IO, NWBFile
 from pynwb.ophys import (
     CorrectedImageStack,
@@ -17,12 +18,19 @@ from pynwb.ophys import (
 )
 
 from studio.app.optinist.core.nwb.nwb import NWBDATASET
+from studio.app.optinist.core.nwb.nwb_dataio import NWBDataIO
 from studio.app.optinist.core.nwb.optinist_data import PostProcess
+from studio.app.optinist.dataclass.roi import RoiMasks
 
 
 class NWBCreater:
+    # compound dtype of PlaneSegmentation pixel_mask rows
+    PIXEL_MASK_DTYPE = np.dtype([("x", "<u4"), ("y", "<u4"), ("weight", "<f4")])
+
     @classmethod
     def acquisition(cls, config):
+        dataset_io = NWBDataIO.from_config(config.get("dataset_io"))
+
         nwbfile = NWBFile(
             session_description=config["session_description"],
             identifier=config["identifier"],
@@ -92,7 +100,11 @@ class NWBCreater:
                 starting_time=float(config[NWBDATASET.IMAGE_SERIES]["starting_time"]),
                 rate=1.0,
                 unit="normalized amplitude",
-                data=external_file.data if save_raw_image_to_nwb else None,
+                data=(
+                    dataset_io.image_series(external_file)
+                    if save_raw_image_to_nwb
+                    else None
+                ),
             )
             nwbfile.add_acquisition(image_series)
 
@@ -123,7 +135,7 @@ class NWBCreater:
         return nwbfile
 
     @classmethod
-    def add_plane_segmentation(cls, nwbfile, function_id):
+    def add_plane_segmentation(cls, nwbfile, function_id, **kwargs):
         image_seg = nwbfile.processing["ophys"].data_interfaces["ImageSegmentation"]
         if "TwoPhotonSeries" in nwbfile.acquisition:
             reference_images = nwbfile.acquisition["TwoPhotonSeries"]
@@ -139,12 +151,16 @@ class NWBCreater:
                 description="output",
                 imaging_plane=nwbfile.imaging_planes["ImagingPlane"],
                 reference_images=reference_images,
+                **kwargs,
             )
 
         return nwbfile
 
     @classmethod
-    def motion_correction(cls, nwbfile, function_id, mc_data, xy_trans_data):
+    def motion_correction(
+        cls, nwbfile, function_id, mc_data, xy_trans_data, dataset_io=None
+    ):
+        dataset_io = dataset_io or NWBDataIO()
         # image_data = mc_data.data
         image_path = mc_data.path
         corrected = ImageSeries(
@@ -159,7 +175,7 @@ class NWBCreater:
 
         xy_translation = TimeSeries(
             name="xy_translation",
-            data=xy_trans_data,
+            data=dataset_io.wrap(xy_trans_data),
             unit="pixels",
             starting_time=0.0,
             rate=1.0,
@@ -188,31 +204,75 @@ class NWBCreater:
         return nwbfile
 
     @classmethod
-    def roi(cls, nwbfile, function_id, roi_list):
-        nwbfile = cls.add_plane_segmentation(nwbfile, function_id)
-        image_seg = nwbfile.processing["ophys"].data_interfaces["ImageSegmentation"]
-        plane_seg = image_seg.plane_segmentations[function_id]
+    def roi(cls, nwbfile, function_id, roi_list, dataset_io=None):
+        dataset_io = dataset_io or NWBDataIO()
 
+        # all ROIs are inserted at once, as whole table columns
         if roi_list:
-            for col in roi_list[0]:
-                if col != "pixel_mask" and col not in plane_seg.colnames:
-                    plane_seg.add_column(col, f"{col} list")
-
-        for col in roi_list:
-            plane_seg.add_roi(**col)
+            nwbfile = cls.add_plane_segmentation(
+                nwbfile,
+                function_id,
+                id=list(range(len(roi_list))),
+                columns=cls.__roi_columns(roi_list, dataset_io),
+            )
+        else:
+            nwbfile = cls.add_plane_segmentation(nwbfile, function_id)
 
         return nwbfile
 
     @classmethod
-    def column(cls, nwbfile, function_id, name, description, data):
+    def __roi_columns(cls, roi_list, dataset_io: NWBDataIO) -> list:
+        columns = []
+        # additional columns precede the masks, as in row-wise insertion
+        keys = sorted(roi_list[0], key=lambda k: k in ("pixel_mask", "image_mask"))
+        for col in keys:
+            values = [roi[col] for roi in roi_list]
+
+            if col == "pixel_mask":
+                masks = [np.asarray(v).reshape(-1, 3) for v in values]
+                pixels = np.concatenate(masks)
+                pixel_mask = np.empty(len(pixels), dtype=cls.PIXEL_MASK_DTYPE)
+                for i, field in enumerate(cls.PIXEL_MASK_DTYPE.names):
+                    pixel_mask[field] = pixels[:, i]
+
+                data = VectorData(
+                    name=col,
+                    description="Pixel masks for each ROI",
+                    data=dataset_io.wrap(pixel_mask),
+                )
+                index = VectorIndex(
+                    name=f"{col}_index",
+                    target=data,
+                    data=np.cumsum([len(m) for m in masks]).tolist(),
+                )
+                columns.extend([data, index])
+            elif col == "image_mask":
+                columns.append(
+                    VectorData(
+                        name=col,
+                        description="Image masks for each ROI",
+                        data=dataset_io.wrap(np.stack(values)),
+                    )
+                )
+            else:
+                columns.append(
+                    VectorData(name=col, description=f"{col} list", data=values)
+                )
+
+        return columns
+
+    @classmethod
+    def column(cls, nwbfile, function_id, name, description, data, dataset_io=None):
+        dataset_io = dataset_io or NWBDataIO()
         image_seg = nwbfile.processing["ophys"].data_interfaces["ImageSegmentation"]
         plane_seg = image_seg.plane_segmentations[function_id]
-        plane_seg.add_column(name, description, data)
+        plane_seg.add_column(name, description, dataset_io.wrap(data))
 
         return nwbfile
 
     @classmethod
-    def fluorescence(cls, nwbfile, function_id, roi_list):
+    def fluorescence(cls, nwbfile, function_id, roi_list, dataset_io=None):
+        dataset_io = dataset_io or NWBDataIO()
         image_seg = nwbfile.processing["ophys"].data_interfaces["ImageSegmentation"]
         plane_seg = image_seg.plane_segmentations[function_id]
         fluo = Fluorescence(name=function_id)
@@ -224,7 +284,7 @@ class NWBCreater:
 
             roi_resp_dict = {
                 "name": roi["name"],
-                "data": roi["data"],
+                "data": dataset_io.wrap(roi["data"]),
                 "rois": region_roi,
                 "unit": roi["unit"],
                 "timestamps": roi.get("timestamps"),
@@ -242,10 +302,11 @@ class NWBCreater:
         return nwbfile
 
     @classmethod
-    def timeseries(cls, nwbfile, key, value):
+    def timeseries(cls, nwbfile, key, value, dataset_io=None):
+        dataset_io = dataset_io or NWBDataIO()
         timeseries_data = TimeSeries(
             name=key,
-            data=value.data,
+            data=dataset_io.wrap(value.data),
             unit="second",
             starting_time=0.0,
             rate=1.0,
@@ -256,10 +317,11 @@ class NWBCreater:
         return nwbfile
 
     @classmethod
-    def behavior(cls, nwbfile, key, value):
+    def behavior(cls, nwbfile, key, value, dataset_io=None):
+        dataset_io = dataset_io or NWBDataIO()
         timeseries_data = TimeSeries(
             name=key,
-            data=value.data,
+            data=dataset_io.wrap(value.data),
             unit="second",
             starting_time=0.0,
             rate=1.0,
@@ -270,10 +332,16 @@ class NWBCreater:
         return nwbfile
 
     @classmethod
-    def postprocess(cls, nwbfile, function_id, data):
+    def postprocess(cls, nwbfile, function_id, data, dataset_io=None):
+        dataset_io = dataset_io or NWBDataIO()
         for key, value in data.items():
             process_name = f"{function_id}_{key}"
-            postprocess = PostProcess(name=process_name, data=value)
+
+            # sparse ROI masks are stored as (n_pixels, 3) rows of (roi index, y, x)
+            if isinstance(value, RoiMasks):
+                value = value.pixel_table().astype(float)
+
+            postprocess = PostProcess(name=process_name, data=dataset_io.wrap(value))
 
             try:
                 nwbfile.processing["optinist"].add_container(postprocess)
@@ -353,20 +421,25 @@ class NWBCreater:
         return new_nwbfile
 
 
-def set_nwbconfig(nwbfile, config):
+def set_nwbconfig(nwbfile, config, dataset_io: NWBDataIO = None):
+    dataset_io = dataset_io or NWBDataIO()
+
     if NWBDATASET.POSTPROCESS in config:
         for function_key in config[NWBDATASET.POSTPROCESS]:
             NWBCreater.postprocess(
-                nwbfile, function_key, config[NWBDATASET.POSTPROCESS][function_key]
+                nwbfile,
+                function_key,
+                config[NWBDATASET.POSTPROCESS][function_key],
+                dataset_io=dataset_io,
             )
 
     if NWBDATASET.TIMESERIES in config:
         for key, value in config[NWBDATASET.TIMESERIES].items():
-            NWBCreater.timeseries(nwbfile, key, value)
+            NWBCreater.timeseries(nwbfile, key, value, dataset_io=dataset_io)
 
     if NWBDATASET.BEHAVIOR in config:
         for key, value in config[NWBDATASET.BEHAVIOR].items():
-            NWBCreater.behavior(nwbfile, key, value)
+            NWBCreater.behavior(nwbfile, key, value, dataset_io=dataset_io)
 
     if NWBDATASET.MOTION_CORRECTION in config:
         for function_key in config[NWBDATASET.MOTION_CORRECTION]:
@@ -374,18 +447,25 @@ def set_nwbconfig(nwbfile, config):
                 nwbfile,
                 function_key,
                 **config[NWBDATASET.MOTION_CORRECTION][function_key],
+                dataset_io=dataset_io,
             )
 
     if NWBDATASET.ROI in config:
         for function_key in config[NWBDATASET.ROI]:
             nwbfile = NWBCreater.roi(
-                nwbfile, function_key, config[NWBDATASET.ROI][function_key]
+                nwbfile,
+                function_key,
+                config[NWBDATASET.ROI][function_key],
+                dataset_io=dataset_io,
             )
 
     if NWBDATASET.COLUMN in config:
         for function_key in config[NWBDATASET.COLUMN]:
             nwbfile = NWBCreater.column(
-                nwbfile, function_key, **config[NWBDATASET.COLUMN][function_key]
+                nwbfile,
+                function_key,
+                **config[NWBDATASET.COLUMN][function_key],
+                dataset_io=dataset_io,
             )
 
     if NWBDATASET.FLUORESCENCE in config:
@@ -394,6 +474,7 @@ def set_nwbconfig(nwbfile, config):
                 nwbfile,
                 function_key,
                 config[NWBDATASET.FLUORESCENCE][function_key],
+                dataset_io=dataset_io,
             )
 
     return nwbfile
@@ -402,28 +483,28 @@ def set_nwbconfig(nwbfile, config):
 def save_nwb(save_path, input_config, config):
     nwbfile = NWBCreater.acquisition(input_config)
 
-    nwbfile = set_nwbconfig(nwbfile, config)
+    dataset_io = NWBDataIO.from_config(input_config.get("dataset_io"))
+    nwbfile = set_nwbconfig(nwbfile, config, dataset_io)
 
     with NWBHDF5IO(save_path, "w") as f:
         f.write(nwbfile)
 
 
-def overwrite_nwbfile(save_path, config):
+def overwrite_nwbfile(save_path, config, dataset_io: NWBDataIO = None):
     tmp_save_path = os.path.join(
         os.path.dirname(save_path),
         "tmp_" + os.path.basename(save_path),
     )
     with NWBHDF5IO(save_path, "r") as src_io:
         old_nwbfile = src_io.read()
-        nwbfile = set_nwbconfig(old_nwbfile, config)
+        nwbfile = set_nwbconfig(old_nwbfile, config, dataset_io)
         nwbfile.set_modified()
         with NWBHDF5IO(tmp_save_path, mode="w") as io:
             io.export(src_io=src_io, nwbfile=nwbfile)
-    shutil.copyfile(tmp_save_path, save_path)
-    os.remove(tmp_save_path)
+    os.replace(tmp_save_path, save_path)
 
 
-def overwrite_nwb(config, save_path, nwb_file_name):
+def overwrite_nwb(config, save_path, nwb_file_name, dataset_io: NWBDataIO = None):
     # バックアップファイルを作成
     nwb_path = os.path.join(save_path, nwb_file_name)
     tmp_nwb_path = os.path.join(save_path, "tmp_" + nwb_file_name)
@@ -433,12 +514,11 @@ def overwrite_nwb(config, save_path, nwb_file_name):
         nwbfile = io.read()
         # acquisition を元ファイルから作成する
         new_nwbfile = NWBCreater.reaqcuisition(nwbfile)
-        new_nwbfile = set_nwbconfig(new_nwbfile, config)
+        new_nwbfile = set_nwbconfig(new_nwbfile, config, dataset_io)
 
         with NWBHDF5IO(tmp_nwb_path, "w") as io:
             io.write(new_nwbfile)
-    shutil.copyfile(tmp_nwb_path, nwb_path)
-    os.remove(tmp_nwb_path)
+    os.replace(tmp_nwb_path, nwb_path)
 
 
 def merge_nwbfile(old_nwbfile, new_nwbfile):
@@ -0,0 +1,119 @@
+from typing import Optional
+
+import numpy as np
+from hdmf.backends.hdf5 import H5DataIO
+from hdmf.data_utils import DataChunkIterator
+
+from studio.app.common.dataclass.image import ImageData
+
+
+class NWBDataIO:
+    """
+    Storage options of the datasets written to NWB files.
+
+    Arrays of at least `min_bytes` are written chunked along their first
+    (frame / time) axis with about `chunk_bytes` per chunk, and compressed
+    with `compression` ("gzip", "lzf" or None for no compression).
+
+    config (nwb params "dataset_io"):
+      compression: gzip
+      compression_opts: 4
+      chunk_bytes: 1048576
+      min_bytes: 65536
+    """
+
+    COMPRESSIONS = ("gzip", "lzf")
+
+    def __init__(
+        self,
+        compression: Optional[str] = "gzip",
+        compression_opts: Optional[int] = 4,
+        chunk_bytes: int = 2**20,
+        min_bytes: int = 2**16,
+    ):
+        if compression in ("", "none", "None"):
+            compression = None
+        if compression is not None and compression not in self.COMPRESSIONS:
+            raise ValueError(
+                f"Unsupported NWB compression: {compression}. "
+                f"Choose one of {self.COMPRESSIONS} or none."
+            )
+
+        self.compression = compression
+        # lzf takes no options
+        self.compression_opts = compression_opts if compression == "gzip" else None
+        self.chunk_bytes = int(chunk_bytes)
+        self.min_bytes = int(min_bytes)
+
+    @classmethod
+    def from_config(cls, config: Optional[dict]) -> "NWBDataIO":
+        if not config:
+            return cls()
+        return cls(
+            **{
+                k: config[k]
+                for k in ("compression", "compression_opts", "chunk_bytes", "min_bytes")
+                if k in config
+            }
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.compression is not None
+
+    def chunk_shape(self, shape: tuple, itemsize: int) -> tuple:
+        """
+        Chunks holding whole frames (all trailing axes),
+        as many as fit in `chunk_bytes`
+        """
+        shape = tuple(int(s) for s in shape)
+        frame_bytes = max(1, int(np.prod(shape[1:], dtype=np.int64)) * itemsize)
+        frames = max(1, min(shape[0], self.chunk_bytes // frame_bytes))
+        return (frames, *shape[1:])
+
+    def wrap(self, data):
+        """
+        Wrap `data` in a chunked, compressed H5DataIO,
+        small or non-array data is returned as is
+        """
+        if not self.enabled or not isinstance(data, np.ndarray):
+            return data
+        if data.ndim == 0 or data.size == 0 or data.nbytes < self.min_bytes:
+            return data
+        if data.dtype.kind not in "biufc" and data.dtype.names is None:
+            return data
+
+        return H5DataIO(
+            data=data,
+            chunks=self.chunk_shape(data.shape, data.dtype.itemsize),
+            compression=self.compression,
+            compression_opts=self.compression_opts,
+            shuffle=True,
+        )
+
+    def image_series(self, image: ImageData):
+        """
+        Frames of `image` streamed from its files while writing,
+        the movie is never loaded at once
+        """
+        movie = image.lazy_data
+        chunks = self.chunk_shape(movie.shape, np.dtype(movie.dtype).itemsize)
+
+        def iter_frames():
+            for start in range(0, len(movie), chunks[0]):
+                yield from np.asarray(movie[start : start + chunks[0]])
+
+        data = DataChunkIterator(
+            data=iter_frames(),
+            maxshape=movie.shape,
+            dtype=np.dtype(movie.dtype),
+            buffer_size=chunks[0],
+        )
+
+        return H5DataIO(
+            data=data,
+            chunks=chunks,
+            compression=self.compression,
+            compression_opts=self.compression_opts,
+            shuffle=self.enabled,
+        )
@@ -4,7 +4,7 @@ from studio.app.optinist.dataclass.fluo import FluoData
 from studio.app.optinist.dataclass.iscell import IscellData
 from studio.app.optinist.dataclass.lccd import LccdData
 from studio.app.optinist.dataclass.nwb import NWBFile
-from studio.app.optinist.dataclass.roi import EditRoiData, RoiData
+from studio.app.optinist.dataclass.roi import EditRoiData, RoiData, RoiMasks
 from studio.app.optinist.dataclass.spiking_activity import SpikingActivityData
 from studio.app.optinist.dataclass.suite2p import Suite2pData
 
@@ -16,6 +16,7 @@ __all__ = [
     "LccdData",
     "NWBFile",
     "RoiData",
+    "RoiMasks",
     "SpikingActivityData",
     "Suite2pData",
     "EditRoiData",
@@ -1,5 +1,5 @@
 import gc
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
 import imageio
 import numpy as np
@@ -19,6 +19,160 @@ from studio.app.dir_path import DIRPATH
 from studio.app.optinist.schemas.roi import RoiPos, RoiStatus
 
 
+class RoiMasks:
+    """
+    Sparse pixel masks of ROIs on a (height, width) plane.
+
+    Pixels of ROI i are the flat (row-major) pixel indices
+    indices[indptr[i] : indptr[i + 1]], so that memory is proportional
+    to the ROI pixels instead of cells x frame area.
+    Label images (pixel value = ROI index, NaN background) are rendered on demand.
+    """
+
+    def __init__(
+        self,
+        frame_shape: Tuple[int, int],
+        indptr: Optional[np.ndarray] = None,
+        indices: Optional[np.ndarray] = None,
+    ):
+        self.frame_shape = tuple(int(v) for v in frame_shape)
+        self.indptr = (
+            np.zeros(1, dtype=np.int64)
+            if indptr is None
+            else np.asarray(indptr, dtype=np.int64)
+        )
+        self.indices = (
+            np.zeros(0, dtype=np.int32)
+            if indices is None
+            else np.asarray(indices, dtype=np.int32)
+        )
+
+    @classmethod
+    def from_masks(
+        cls, masks: Iterable[np.ndarray], frame_shape: Tuple[int, int] = None
+    ) -> "RoiMasks":
+        """
+        masks: 2D arrays, pixels of the ROI are non-zero (NaN is background)
+        """
+        pixels = []
+        for mask in masks:
+            mask = np.asarray(mask)
+            frame_shape = mask.shape if frame_shape is None else frame_shape
+            pixels.append(np.flatnonzero(np.nan_to_num(mask, nan=0.0)))
+
+        assert frame_shape is not None, "frame_shape is required for no masks"
+        return cls.__from_pixel_list(frame_shape, pixels)
+
+    @classmethod
+    def from_label_stack(cls, im: np.ndarray) -> "RoiMasks":
+        """
+        im: (n_cells, height, width) stack, NaN outside of each ROI
+        """
+        return cls.__from_pixel_list(
+            im.shape[1:], [np.flatnonzero(~np.isnan(layer)) for layer in im]
+        )
+
+    @classmethod
+    def from_pixels(
+        cls,
+        frame_shape: Tuple[int, int],
+        ypixs: Sequence[np.ndarray],
+        xpixs: Sequence[np.ndarray],
+    ) -> "RoiMasks":
+        return cls.__from_pixel_list(
+            frame_shape,
+            [
+                np.unique(np.ravel_multi_index((ypix, xpix), frame_shape))
+                for ypix, xpix in zip(ypixs, xpixs)
+            ],
+        )
+
+    @classmethod
+    def __from_pixel_list(cls, frame_shape, pixels: List[np.ndarray]) -> "RoiMasks":
+        indptr = np.zeros(len(pixels) + 1, dtype=np.int64)
+        np.cumsum([len(p) for p in pixels], out=indptr[1:])
+        indices = np.concatenate(pixels) if pixels else None
+        return cls(frame_shape, indptr, indices)
+
+    def __len__(self) -> int:
+        return len(self.indptr) - 1
+
+    def __getitem__(self, key: slice) -> "RoiMasks":
+        assert isinstance(key, slice), "RoiMasks only supports slicing"
+        ids = range(len(self))[key]
+        return self.__from_pixel_list(self.frame_shape, [self.pixels(i) for i in ids])
+
+    @property
+    def num_cell(self) -> int:
+        return len(self)
+
+    def pixels(self, i: int) -> np.ndarray:
+        return self.indices[self.indptr[i] : self.indptr[i + 1]]
+
+    def yx(self, i: int) -> Tuple[np.ndarray, np.ndarray]:
+        return np.unravel_index(self.pixels(i), self.frame_shape)
+
+    def mask(self, i: int) -> np.ndarray:
+        mask = np.zeros(self.frame_shape, dtype=bool)
+        mask.flat[self.pixels(i)] = True
+        return mask
+
+    def union(self, ids: Iterable[int]) -> np.ndarray:
+        mask = np.zeros(self.frame_shape, dtype=bool)
+        for i in ids:
+            mask.flat[self.pixels(i)] = True
+        return mask
+
+    def append(self, *masks: np.ndarray) -> "RoiMasks":
+        return self.extend(RoiMasks.from_masks(masks, self.frame_shape))
+
+    def extend(self, other: "RoiMasks") -> "RoiMasks":
+        assert other.frame_shape == self.frame_shape, "frame shape mismatch"
+        return RoiMasks(
+            self.frame_shape,
+            np.concatenate([self.indptr, self.indptr[-1] + other.indptr[1:]]),
+            np.concatenate([self.indices, other.indices]),
+        )
+
+    def label_image(self, selection: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        (height, width) image of the selected ROIs (bool mask or ids),
+        pixel value is the largest index of the ROIs covering it, NaN elsewhere.
+        Same as np.nanmax(label_stack[selection], axis=0).
+        """
+        ids = np.arange(len(self))
+        if selection is not None:
+            ids = ids[selection]
+
+        labels = np.full(int(np.prod(self.frame_shape)), -1, dtype=np.int64)
+        if len(ids) > 0:
+            counts = self.indptr[ids + 1] - self.indptr[ids]
+            pixels = np.concatenate([self.pixels(i) for i in ids])
+            np.maximum.at(labels, pixels, np.repeat(ids, counts))
+
+        image = labels.astype(float).reshape(self.frame_shape)
+        image[image < 0] = np.nan
+        return image
+
+    def to_label_stack(self) -> np.ndarray:
+        """
+        Dense (n_cells, height, width) stack, pixel value is the ROI index,
+        NaN outside of each ROI
+        """
+        im = np.full((len(self), *self.frame_shape), np.nan)
+        for i in range(len(self)):
+            im[i].flat[self.pixels(i)] = i
+        return im
+
+    def pixel_table(self) -> np.ndarray:
+        """
+        (n_pixels, 3) rows of (roi index, y, x)
+        """
+        roi_ids = np.repeat(np.arange(len(self)), np.diff(self.indptr))
+        y, x = np.unravel_index(self.indices, self.frame_shape)
+        return np.column_stack([roi_ids, y, x])
+
+
 class RoiData(BaseData):
     def __init__(
         self,
@@ -30,6 +184,9 @@ class RoiData(BaseData):
         super().__init__(file_name)
         self.meta = meta
 
+        if isinstance(data, RoiMasks):
+            data = data.label_image()
+
         images = create_images_list(data)
 
         _dir = join_filepath([output_dir, "tiff", file_name])
@@ -59,9 +216,23 @@ class RoiData(BaseData):
 
 
 class EditRoiData(BaseData):
-    def __init__(self, images, im):
+    """
+    ROI edition state of a ROI detection node.
+
+    images: source movie (frames, height, width) the ROIs were detected on.
+            Only the ImageData reference (file paths) is pickled, the movie is
+            memory-mapped when traces of edited ROIs are extracted.
+            (pickles of older versions hold the movie array itself)
+    """
+
+    # frames read at once when extracting traces
+    TRACE_CHUNK_FRAMES = 1000
+
+    def __init__(self, images: ImageData, im):
         self.images: ImageData = images
-        self.im = im
+        self.im: RoiMasks = (
+            im if isinstance(im, RoiMasks) else RoiMasks.from_label_stack(im)
+        )
         self.temp_add_roi: Dict[int, RoiPos] = {}
         self.temp_merge_roi: Dict[float, List[int]] = {}
         self.temp_delete_roi: Dict[float, None] = {}
@@ -69,6 +240,43 @@ class EditRoiData(BaseData):
         self.merge_roi = []
         self.delete_roi = []
 
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
+        # pickles written before RoiMasks hold dense (n_cells, height, width) stacks
+        if isinstance(self.im, np.ndarray):
+            self.im = RoiMasks.from_label_stack(self.im)
+
+    @property
+    def movie(self):
+        if isinstance(self.images, ImageData):
+            return self.images.lazy_data
+        return self.images
+
+    def roi_traces(self, ids: List[int]) -> np.ndarray:
+        """
+        Mean pixel value of each ROI per frame (len(ids), frames).
+        Only the ROI pixels of the source movie are read, in chunks of frames.
+        """
+        movie = self.movie
+        pixels = [self.im.yx(i) for i in ids]
+        ys = np.concatenate([y for y, _ in pixels]).astype(np.intp)
+        xs = np.concatenate([x for _, x in pixels]).astype(np.intp)
+        bounds = np.cumsum([0] + [len(y) for y, _ in pixels])
+
+        num_frames = len(movie)
+        traces = np.full((len(ids), num_frames), np.nan)
+        for start in range(0, num_frames, self.TRACE_CHUNK_FRAMES):
+            stop = min(start + self.TRACE_CHUNK_FRAMES, num_frames)
+            values = np.asarray(movie[start:stop, ys, xs], dtype=float)
+            for k in range(len(ids)):
+                if bounds[k] < bounds[k + 1]:
+                    traces[k, start:stop] = values[:, bounds[k] : bounds[k + 1]].mean(
+                        axis=1
+                    )
+
+        return traces
+
     @property
     def temp_merge_roi_list(self) -> list:
         merge_roi = [(k, *v, -1.0) for k, v in self.temp_merge_roi.items()]
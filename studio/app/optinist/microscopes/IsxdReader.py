@@ -156,15 +156,30 @@ class IsxdReader(MicroscopeDataReaderBase):
             dtype=self.ome_metadata.pixel_np_dtype,
         )
 
-        # get frame data's np.ndarray.dtype
-        # Note: Individual support for `isx v1.0.3`
-        pixel_np_dtype = self.ome_metadata.pixel_np_dtype
-
         # loop for each channels
         for channel_no in range(channels_count):
             for i in range(movie.timing.num_samples):
-                single_plane_buffer = movie.get_frame_data(i).astype(pixel_np_dtype)
-                single_plane_buffer = single_plane_buffer.T  # rotate YX->XY
-                result_channels_stacks[channel_no, i] = single_plane_buffer
+                result_channels_stacks[channel_no, i] = self._read_frame(channel_no, i)
 
         return result_channels_stacks
+
+    def _get_frame_count(self) -> int:
+        movie: isx.Movie = None
+        (movie,) = self.resource_handles
+
+        return movie.timing.num_samples
+
+    def _read_frame(self, channel: int, index: int) -> np.ndarray:
+        movie: isx.Movie = None
+        (movie,) = self.resource_handles
+
+        # NOTE: the number of channels is fixed to '1'
+        if channel != 0:
+            raise IndexError(f"Invalid channel: {channel}")
+
+        # get frame data's np.ndarray.dtype
+        # Note: Individual support for `isx v1.0.3`
+        pixel_np_dtype = self.ome_metadata.pixel_np_dtype
+
+        single_plane_buffer = movie.get_frame_data(index).astype(pixel_np_dtype)
+        return single_plane_buffer.T  # rotate YX->XY
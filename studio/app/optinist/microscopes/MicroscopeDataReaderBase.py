@@ -2,7 +2,9 @@ import os
 from abc import ABCMeta, abstractmethod
 from ctypes import c_uint8, c_uint16, c_uint32
 from dataclasses import dataclass
+from typing import Iterator, Sequence
 
+import numpy as np
 from numpy import uint8 as np_uint8
 from numpy import uint16 as np_uint16
 from numpy import uint32 as np_uint32
@@ -174,6 +176,50 @@ class MicroscopeDataReaderBase(metaclass=ABCMeta):
         """Return microscope image stacks"""
         return self._get_image_stacks()
 
+    def get_frame_count(self) -> int:
+        """Return the number of frames (T) of each channel"""
+        return self._get_frame_count()
+
+    def read_frames(self, channel: int, indices: Sequence[int]) -> np.ndarray:
+        """Return frames of a channel: (frames, y, x) or (frames, z, y, x)
+
+        Same as get_image_stacks()[channel, indices],
+        but only the frames of indices are read.
+        """
+        frame_count = self.get_frame_count()
+        frames = None
+
+        for i, index in enumerate(indices):
+            # validate (and normalize negative) index
+            frame = self._read_frame(channel, range(frame_count)[index])
+
+            if frames is None:
+                frames = np.empty((len(indices), *frame.shape), dtype=frame.dtype)
+            frames[i] = frame
+
+        if frames is None:
+            frames = np.empty(
+                (0, self.ome_metadata.size_y, self.ome_metadata.size_x),
+                dtype=self.ome_metadata.pixel_np_dtype,
+            )
+
+        return frames
+
+    def iter_frames(
+        self, channel: int = 0, start: int = 0, stop: int = None, batch: int = 100
+    ) -> Iterator[np.ndarray]:
+        """Yield frames [start, stop) of a channel, in batches of frames"""
+        start, stop, _ = slice(start, stop).indices(self.get_frame_count())
+
+        for batch_start in range(start, stop, batch):
+            yield self.read_frames(
+                channel, range(batch_start, min(batch_start + batch, stop))
+            )
+
+    def get_frames(self, channel: int = 0) -> "MicroscopeFrames":
+        """Return frame-indexable view of a channel (see MicroscopeFrames)"""
+        return MicroscopeFrames(self, channel)
+
     @abstractmethod
     def _init_library(self) -> dict:
         """Initialize microscope library"""
@@ -216,6 +262,16 @@ class MicroscopeDataReaderBase(metaclass=ABCMeta):
         """Return microscope image stacks"""
         pass
 
+    @abstractmethod
+    def _get_frame_count(self) -> int:
+        """Return the number of frames (T) of each channel"""
+        pass
+
+    @abstractmethod
+    def _read_frame(self, channel: int, index: int) -> np.ndarray:
+        """Return a frame of a channel: (y, x) or (z, y, x)"""
+        pass
+
     @property
     def data_file_path(self) -> str:
         return self.__data_file_path
@@ -235,3 +291,39 @@ class MicroscopeDataReaderBase(metaclass=ABCMeta):
     @property
     def lab_specific_metadata(self) -> dict:
         return self.__lab_specific_metadata
+
+
+class MicroscopeFrames:
+    """Read-only, frame-indexable view of a channel of microscope data
+
+    Frames are read (by MicroscopeDataReaderBase.read_frames) only on slicing,
+    so that the channel can be written to a file frame-batch by frame-batch.
+    """
+
+    def __init__(self, reader: MicroscopeDataReaderBase, channel: int):
+        self.reader = reader
+        self.channel = channel
+
+        first_frame = reader.read_frames(channel, [0])
+        self.shape = (reader.get_frame_count(), *first_frame.shape[1:])
+        self.dtype = first_frame.dtype
+
+    @property
+    def ndim(self) -> int:
+        return len(self.shape)
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def __array__(self, dtype=None):
+        array = self[:]
+        return array if dtype is None else array.astype(dtype)
+
+    def __getitem__(self, key):
+        frame_key, rest = (key[0], key[1:]) if isinstance(key, tuple) else (key, ())
+
+        if isinstance(frame_key, (int, np.integer)):
+            return self.reader.read_frames(self.channel, [frame_key])[0][rest]
+
+        indices = np.arange(len(self))[frame_key]
+        return self.reader.read_frames(self.channel, indices)[(slice(None), *rest)]
@@ -4,6 +4,7 @@ import os
 import platform
 import re
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum, IntEnum
 
 import numpy as np
@@ -48,9 +49,42 @@ class LIMPICTURE(ctypes.Structure):
     ]
 
 
+def picture_to_array(pic: LIMPICTURE, dtype) -> np.ndarray:
+    """Return image plane of a picture: (y, x, components)
+
+    A strided view of the picture buffer (lines are uiWidthBytes apart),
+    valid until the picture is read again.
+    """
+    dtype = np.dtype(dtype)
+
+    # calculate pixel byte size
+    # Note: pixcel_bytes is assumed to be [1/2/4/6/8]
+    pixcel_bytes = int(pic.uiComponents * int((pic.uiBitsPerComp + 7) / 8))
+    if pixcel_bytes not in (1, 2, 4, 6, 8):
+        raise AttributeError(f"Invalid pixcel_bytes: {pixcel_bytes}")
+
+    buffer = (ctypes.c_uint8 * (pic.uiHeight * pic.uiWidthBytes)).from_address(
+        pic.pImageData
+    )
+
+    # The pixel values of each component are adjacent to each other,
+    #     one pixel at a time.
+    #   Image: [px1: [c1][c2]..[cN]]..[pxN: [c1][c2]..[cN]]
+    return np.ndarray(
+        shape=(pic.uiHeight, pic.uiWidth, pic.uiComponents),
+        dtype=dtype,
+        buffer=buffer,
+        strides=(pic.uiWidthBytes, dtype.itemsize * pic.uiComponents, dtype.itemsize),
+    )
+
+
 class ND2Reader(MicroscopeDataReaderBase):
     """Nikon ND2 data reader"""
 
+    # threads decoding sequences of get_image_stacks in parallel
+    # (each with its own file handle), 1: decoded sequentially
+    DECODE_THREADS_ENV = "ND2_DECODE_THREADS"
+
     SDK_LIBRARY_FILES = {
         "Windows": {
             "main": "/nikon/windows/nd2readsdk-shared.dll",
@@ -61,6 +95,16 @@ class ND2Reader(MicroscopeDataReaderBase):
         },
     }
 
+    def __init__(self, decode_threads: int = None):
+        """
+        decode_threads: threads of get_image_stacks,
+            defaults to the ND2_DECODE_THREADS env (.env), or 1
+        """
+        self.decode_threads = int(
+            decode_threads or os.environ.get(self.DECODE_THREADS_ENV, 1)
+        )
+        super().__init__()
+
     @staticmethod
     def unpack_libs():
         """Unpack library files"""
@@ -144,6 +188,11 @@ class ND2Reader(MicroscopeDataReaderBase):
         self.__dll.Lim_FileGetImageData.restype = ctypes.c_int
 
         self.__dll.Lim_FileClose.argtypes = (ctypes.c_void_p,)
+        self.__dll.Lim_DestroyPicture.argtypes = (ctypes.POINTER(LIMPICTURE),)
+        self.__dll.Lim_DestroyPicture.restype = None
+
+        # picture buffer (for Lim_FileGetImageData)
+        self.__pic = LIMPICTURE()
 
     def _load_file(self, data_file_path: str) -> object:
         handle = self.__dll.Lim_FileOpenForReadUtf8(data_file_path.encode("utf-8"))
@@ -348,6 +397,7 @@ class ND2Reader(MicroscopeDataReaderBase):
         (handle,) = self.resource_handles
 
         self.__dll.Lim_FileClose(handle)
+        self.__dll.Lim_DestroyPicture(ctypes.byref(self.__pic))
 
     def _get_image_stacks(self) -> list:
         """Return microscope image stacks"""
@@ -355,7 +405,6 @@ class ND2Reader(MicroscopeDataReaderBase):
         (handle,) = self.resource_handles
 
         # initialization
-        pic: LIMPICTURE = LIMPICTURE()
         seq_count = self.__dll.Lim_FileGetSeqCount(handle)
 
         # read image attributes
@@ -377,69 +426,28 @@ class ND2Reader(MicroscopeDataReaderBase):
             dtype=self.ome_metadata.pixel_np_dtype,
         )
 
-        # loop for each sequence
-        for seq_idx in range(seq_count):
-            # read image attributes
-            if LimCode.LIM_OK != self.__dll.Lim_FileGetImageData(
-                handle, seq_idx, ctypes.byref(pic)
-            ):
-                break
-
-            # calculate pixel byte size
-            # Note: pixcel_bytes is assumed to be [1/2/4/6/8]
-            pixcel_bytes = int(pic.uiComponents * int((pic.uiBitsPerComp + 7) / 8))
-            if pixcel_bytes not in (1, 2, 4, 6, 8):
-                raise AttributeError(f"Invalid pixcel_bytes: {pixcel_bytes}")
-
-            # # debug print
-            # print(
-            #     f"Picture info: #{seq_idx + 1}",
-            #     pic.uiWidth, pic.uiHeight, bytes, pic.uiComponents,
-            #     pic.uiBitsPerComp, pixcel_bytes,
-            # )
-
-            # Calculate the number of bytes per line (ctypes._CData format)
-            # * Probably the same value as pic.uiWidthBytes,
-            #     but ported based on the logic of the SDK sample code.
-            line_bytes = int(pixcel_bytes * pic.uiWidth / 2)
-            line_ctypes_bytes = self.ome_metadata.pixel_ct_type * line_bytes
-
-            # allocate image plane buffer
-            single_plane_buffer = np.empty(
-                [image_height, image_width, image_component_count],
-                dtype=self.ome_metadata.pixel_np_dtype,
-            )
-
-            # scan image lines
-            for line_idx in range(pic.uiHeight):
-                # Data acquisition for line and conversion to np.ndarray format
-                line_buffer = line_ctypes_bytes.from_address(
-                    pic.pImageData + (line_idx * pic.uiWidthBytes)
-                )
-                line_buffer_array = np.ctypeslib.as_array(line_buffer)
-
-                # mapping to plane buffer
-                single_plane_buffer[line_idx] = line_buffer_array.reshape(
-                    image_width, image_component_count
-                )
-
-            # extract image data for each channel(component)
-            for component_idx in range(pic.uiComponents):
-                channel_idx = component_idx
-
-                # A frame image is cut out from a raw frame image
-                #     in units of channel(component).
-                # Note: The pixel values of each component are adjacent to each other,
-                #     one pixel at a time.
-                #   Image: [px1: [c1][c2]..[cN]]..[pxN: [c1][c2]..[cN]]
-                channel_plane_buffer = single_plane_buffer[:, :, component_idx]
-
-                # construct return value (each channel's stack)
-                result_channels_stacks[channel_idx, seq_idx] = channel_plane_buffer
+        # decode sequences directly to the return value buffer
+        decode_threads = max(1, min(self.decode_threads, seq_count))
+        if decode_threads == 1:
+            self.__decode_sequences(handle, self.__pic, result_channels_stacks, 0)
+        else:
+            seq_ranges = np.array_split(np.arange(seq_count), decode_threads)
+            with ThreadPoolExecutor(decode_threads) as executor:
+                futures = [
+                    executor.submit(
+                        self.__decode_sequences_with_new_handle,
+                        result_channels_stacks,
+                        int(seq_indexes[0]),
+                        int(seq_indexes[-1]) + 1,
+                    )
+                    for seq_indexes in seq_ranges
+                ]
+                for future in futures:
+                    future.result()  # raise errors of threads
 
         # reshape operation.
         # Note: For 4D data(XYZT), reshape 3D format(XY(Z|T)) to 4D format(XYZT)
-        if self.ome_metadata.size_z > 1 and self.ome_metadata.size_t > 1:
+        if self.__is_4d():
             raw_result_channels_stacks = result_channels_stacks
             result_channels_stacks = raw_result_channels_stacks.reshape(
                 self.ome_metadata.size_c,
@@ -450,3 +458,91 @@ class ND2Reader(MicroscopeDataReaderBase):
             )
 
         return result_channels_stacks
+
+    def _get_frame_count(self) -> int:
+        (handle,) = self.resource_handles
+        seq_count = self.__dll.Lim_FileGetSeqCount(handle)
+
+        # Note: For 4D data(XYZT), a frame consists of size_z sequences
+        return seq_count // self.ome_metadata.size_z if self.__is_4d() else seq_count
+
+    def _read_frame(self, channel: int, index: int) -> np.ndarray:
+        if self.__is_4d():
+            seq_indexes = range(
+                index * self.ome_metadata.size_z, (index + 1) * self.ome_metadata.size_z
+            )
+        else:
+            seq_indexes = [index]
+
+        planes = []
+        for seq_idx in seq_indexes:
+            single_plane_buffer = self.__read_sequence(seq_idx)
+            if single_plane_buffer is None:
+                raise IndexError(f"Lim_FileGetImageData Error: #{seq_idx}")
+
+            # A frame image is cut out from a raw frame image
+            #     in units of channel(component).
+            # Note: copied, the picture buffer is reused by the next sequence
+            planes.append(single_plane_buffer[:, :, channel].copy())
+
+        return planes[0] if len(planes) == 1 else np.stack(planes)
+
+    def __is_4d(self) -> bool:
+        return self.ome_metadata.size_z > 1 and self.ome_metadata.size_t > 1
+
+    def __decode_sequences(
+        self,
+        handle,
+        pic: LIMPICTURE,
+        result_channels_stacks: np.ndarray,
+        start: int,
+        stop: int = None,
+    ) -> None:
+        """Decode sequences [start, stop) to (channels, sequences, y, x) buffer"""
+
+        stop = result_channels_stacks.shape[1] if stop is None else stop
+
+        for seq_idx in range(start, stop):
+            single_plane_buffer = self.__read_sequence(seq_idx, handle, pic)
+            if single_plane_buffer is None:
+                break
+
+            # extract image data for each channel(component) at once
+            result_channels_stacks[:, seq_idx] = single_plane_buffer.transpose(2, 0, 1)
+
+    def __decode_sequences_with_new_handle(
+        self, result_channels_stacks: np.ndarray, start: int, stop: int
+    ) -> None:
+        handle = self.__dll.Lim_FileOpenForReadUtf8(self.data_file_path.encode("utf-8"))
+        if handle is None:
+            raise FileNotFoundError(f"Open Error: {self.data_file_path}")
+
+        # picture buffer of the thread, allocated by the sdk on read
+        pic = LIMPICTURE()
+        try:
+            self.__decode_sequences(handle, pic, result_channels_stacks, start, stop)
+        finally:
+            self.__dll.Lim_DestroyPicture(ctypes.byref(pic))
+            self.__dll.Lim_FileClose(handle)
+
+    def __read_sequence(
+        self, seq_idx: int, handle=None, pic: LIMPICTURE = None
+    ) -> np.ndarray:
+        """Return image plane of a sequence: (y, x, components)
+
+        Note: A view of the picture buffer, which is reused by the sdk
+              between sequences (copy it before reading the next sequence).
+        """
+
+        if handle is None:
+            (handle,) = self.resource_handles
+        if pic is None:
+            pic = self.__pic
+
+        # read image attributes
+        if LimCode.LIM_OK != self.__dll.Lim_FileGetImageData(
+            handle, seq_idx, ctypes.byref(pic)
+        ):
+            return None
+
+        return picture_to_array(pic, self.ome_metadata.pixel_np_dtype)
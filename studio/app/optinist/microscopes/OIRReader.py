@@ -116,6 +116,7 @@ class OIRReader(MicroscopeDataReaderBase):
 
     def _load_file(self, data_file_path: str) -> object:
         ida = self.__dll
+        self.__frame_context = None
 
         # Get Accessor
         hAccessor = self.__hAccessor = ctypes.c_void_p()
@@ -373,6 +374,81 @@ class OIRReader(MicroscopeDataReaderBase):
     def _get_image_stacks(self) -> list:
         """Return microscope image stacks"""
 
+        frame_context = self.__get_frame_context()
+        rect = frame_context["rect"]
+        (nLLoop, nZLoop, nTLoop) = frame_context["loops"]
+
+        # Get the number of channels
+        channels_count = frame_context["channel_info"].get_num_of_channel()
+
+        # allocate return value buffer (all channel's stack)
+        # *using numpy.ndarray
+        result_channels_stacks = np.empty(
+            [channels_count, (nLLoop * nTLoop * nZLoop), rect.height, rect.width],
+            dtype=self.ome_metadata.pixel_np_dtype,
+        )
+
+        # Retrieve Image data and TimeStamp frame-by-frame
+        for channel_no in range(channels_count):
+            # Sequential index through nLLoop/nZLoop/nTLoop
+            serial_loops_index = 0
+
+            for i in range(nLLoop):
+                for j in range(nZLoop):
+                    for k in range(nTLoop):
+                        # construct return value (each channel's stack)
+                        result_channels_stacks[
+                            channel_no, serial_loops_index
+                        ] = self.__read_plane(channel_no, i, j, k)
+                        serial_loops_index += 1
+
+        # reshape/transpose operation.
+        # Note: To be performed for 4D data
+        # TODO: Need to test
+        if self.__is_4d():
+            # 1. For OIR 4D data(XYTZ), reshape 3D format(XY(T*Z)) to 4D format(XYTZ)
+            # 2. For OIR 4D data(XYTZ), transpose to 4D format(XYZT)
+            raw_result_channels_stacks = result_channels_stacks
+            result_channels_stacks = raw_result_channels_stacks.reshape(
+                self.ome_metadata.size_c,
+                self.ome_metadata.size_z,
+                self.ome_metadata.size_t,
+                self.ome_metadata.size_y,
+                self.ome_metadata.size_x,
+            ).transpose(
+                0, 2, 1, 3, 4
+            )  # transpose Z<->T
+
+        return result_channels_stacks
+
+    def _get_frame_count(self) -> int:
+        (nLLoop, nZLoop, nTLoop) = self.__get_frame_context()["loops"]
+
+        # Note: For 4D data(XYZT), a frame consists of nZLoop planes
+        return nTLoop if self.__is_4d() else nLLoop * nZLoop * nTLoop
+
+    def _read_frame(self, channel: int, index: int) -> np.ndarray:
+        loops = self.__get_frame_context()["loops"]
+
+        if self.__is_4d():
+            # planes of all z at time index (same as _get_image_stacks)
+            return np.stack(
+                [self.__read_plane(channel, 0, j, index) for j in range(loops[1])]
+            )
+
+        # Sequential index through nLLoop/nZLoop/nTLoop
+        (i, j, k) = np.unravel_index(index, loops)
+        return self.__read_plane(channel, int(i), int(j), int(k))
+
+    def __is_4d(self) -> bool:
+        return self.ome_metadata.size_z > 1 and self.ome_metadata.size_t > 1
+
+    def __get_frame_context(self) -> dict:
+        """Return (cached) parameters for reading frames"""
+
+        if self.__frame_context is not None:
+            return self.__frame_context
+
         (hAccessor, hFile, hGroup, hArea) = self.resource_handles
 
         rect = CMN_RECT()
@@ -391,8 +467,6 @@ class OIRReader(MicroscopeDataReaderBase):
         # Axes Information
         axis_info = AxisInfo(hAccessor, hArea)
 
-        pAxes = (IDA_AXIS_INFO * 3)()
-
         nLLoop = nTLoop = nZLoop = 0
 
         # For Max Loop Values for lambda, z, t
@@ -411,67 +485,48 @@ class OIRReader(MicroscopeDataReaderBase):
         rect.width = area_image_size.get_x()
         rect.height = area_image_size.get_y()
 
-        # Get the number of channels
-        channels_count = channel_info.get_num_of_channel()
+        self.__frame_context = {
+            "rect": rect,
+            "imaging_roi": imaging_roi,
+            "channel_info": channel_info,
+            "axis_info": axis_info,
+            "loops": (nLLoop, nZLoop, nTLoop),
+        }
 
-        # allocate return value buffer (all channel's stack)
-        # *using numpy.ndarray
-        result_channels_stacks = np.empty(
-            [channels_count, (nLLoop * nTLoop * nZLoop), rect.height, rect.width],
-            dtype=self.ome_metadata.pixel_np_dtype,
-        )
+        return self.__frame_context
 
-        # Retrieve Image data and TimeStamp frame-by-frame
-        for channel_no in range(channels_count):
-            # Sequential index through nLLoop/nZLoop/nTLoop
-            serial_loops_index = 0
+    def __read_plane(self, channel: int, i: int, j: int, k: int) -> np.ndarray:
+        """Return image plane of a channel at lambda/z/t loop index (i, j, k)"""
 
-            for i in range(nLLoop):
-                for j in range(nZLoop):
-                    for k in range(nTLoop):
-                        nAxisCount = lib.set_frame_axis_index(
-                            i, j, k, imaging_roi, axis_info, pAxes, 0
-                        )
-
-                        # Create Frame Manager
-                        frame_manager = FrameManager(
-                            hAccessor,
-                            hArea,
-                            channel_info.get_channel_id(channel_no),
-                            pAxes,
-                            nAxisCount,
-                        )
-
-                        # Get Image Body
-                        buffer_pointer = frame_manager.get_image_body(rect)
-                        ctypes_buffer_ptr = buffer_pointer[1]
-
-                        # Obtain image data in ndarray format
-                        single_plane_buffer = np.ctypeslib.as_array(ctypes_buffer_ptr)
+        (hAccessor, hFile, hGroup, hArea) = self.resource_handles
+        frame_context = self.__get_frame_context()
+        channel_info = frame_context["channel_info"]
 
-                        # construct return value (each channel's stack)
-                        result_channels_stacks[
-                            channel_no, serial_loops_index
-                        ] = single_plane_buffer
-                        serial_loops_index += 1
+        pAxes = (IDA_AXIS_INFO * 3)()
+        nAxisCount = lib.set_frame_axis_index(
+            i, j, k, frame_context["imaging_roi"], frame_context["axis_info"], pAxes, 0
+        )
 
-                        frame_manager.release_image_body()
+        # Create Frame Manager
+        frame_manager = FrameManager(
+            hAccessor,
+            hArea,
+            channel_info.get_channel_id(channel),
+            pAxes,
+            nAxisCount,
+        )
 
-        # reshape/transpose operation.
-        # Note: To be performed for 4D data
-        # TODO: Need to test
-        if self.ome_metadata.size_z > 1 and self.ome_metadata.size_t > 1:
-            # 1. For OIR 4D data(XYTZ), reshape 3D format(XY(T*Z)) to 4D format(XYTZ)
-            # 2. For OIR 4D data(XYTZ), transpose to 4D format(XYZT)
-            raw_result_channels_stacks = result_channels_stacks
-            result_channels_stacks = raw_result_channels_stacks.reshape(
-                self.ome_metadata.size_c,
-                self.ome_metadata.size_z,
-                self.ome_metadata.size_t,
-                self.ome_metadata.size_y,
-                self.ome_metadata.size_x,
-            ).transpose(
-                0, 2, 1, 3, 4
-            )  # transpose Z<->T
+        # Get Image Body
+        buffer_pointer = frame_manager.get_image_body(frame_context["rect"])
+        ctypes_buffer_ptr = buffer_pointer[1]
 
-        return result_channels_stacks
+        # Obtain image data in ndarray format
+        # Note: copied, the buffer is released with the image body
+        single_plane_buffer = np.array(
+            np.ctypeslib.as_array(ctypes_buffer_ptr),
+            dtype=self.ome_metadata.pixel_np_dtype,
+        )
+
+        frame_manager.release_image_body()
+
+        return single_plane_buffer
@@ -6,6 +6,7 @@ import zipfile
 from datetime import datetime
 from glob import glob
 
+import numpy as np
 import tifffile
 import xmltodict
 
@@ -257,3 +258,26 @@ class ThorlabsReader(MicroscopeDataReaderBase):
         )  # transpose to XYCT -> XYTC
 
         return result_channels_stacks
+
+    def _get_frame_count(self) -> int:
+        handle_tiff = None
+        (handle_tiff,) = self.resource_handles
+
+        # Note: series shape is (T, C, Y, X) (see _get_image_stacks)
+        return handle_tiff.series[0].shape[0]
+
+    def _read_frame(self, channel: int, index: int) -> np.ndarray:
+        handle_tiff = None
+        (handle_tiff,) = self.resource_handles
+
+        # read the page of (T, C) index only
+        # Note: pages of split OME-TIFF files are read from the files as series
+        series = handle_tiff.series[0]
+        page_index = np.ravel_multi_index((index, channel), series.shape[:2])
+        page = series.pages[page_index]
+
+        if page is None:
+            # missing split tiff file (processed as a black image, as asarray)
+            return np.zeros(series.shape[2:], dtype=series.dtype)
+
+        return page.asarray()
@@ -4,6 +4,7 @@ import h5py
 import numpy as np
 from fastapi import APIRouter
 
+from studio.app.common.core.utils.api_executor import ApiExecutor
 from studio.app.common.core.utils.filepath_creater import join_filepath
 from studio.app.dir_path import DIRPATH
 from studio.app.optinist.schemas.hdf5 import HDF5Node
@@ -79,4 +80,5 @@ class HDF5Getter:
 @router.get("/hdf5/{file_path:path}", response_model=List[HDF5Node], tags=["outputs"])
 async def get_files(file_path: str, workspace_id: str):
     file_path = join_filepath([DIRPATH.INPUT_DIR, workspace_id, file_path])
-    return HDF5Getter.get(file_path)
+    # cpu-heavy (reads the datasets), run out of the server process
+    return await ApiExecutor.run_in_process(HDF5Getter.get, file_path)
@@ -67,5 +67,5 @@ class MatGetter:
     response_model=List[MatNode],
     tags=["outputs"],
 )
-async def get_matfiles(file_path: str, workspace_id: str):
+def get_matfiles(file_path: str, workspace_id: str):
     return MatGetter.get(file_path, workspace_id)
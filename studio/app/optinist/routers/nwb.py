@@ -16,7 +16,7 @@ router = APIRouter()
 
 
 @router.get("/nwb", response_model=NWBParams, tags=["params"])
-async def get_nwb_params():
+def get_nwb_params():
     filepath = find_param_filepath("nwb")
     return ConfigReader.read(filepath)
 
@@ -26,7 +26,7 @@ async def get_nwb_params():
     dependencies=[Depends(is_workspace_available)],
     tags=["experiments"],
 )
-async def download_nwb_experiment(workspace_id: str, unique_id: str):
+def download_nwb_experiment(workspace_id: str, unique_id: str):
     nwb_path_list = glob(
         join_filepath([DIRPATH.OUTPUT_DIR, workspace_id, unique_id, "*.nwb"])
     )
@@ -41,7 +41,7 @@ async def download_nwb_experiment(workspace_id: str, unique_id: str):
     dependencies=[Depends(is_workspace_available)],
     tags=["experiments"],
 )
-async def download_nwb_experiment_with_function_id(
+def download_nwb_experiment_with_function_id(
     workspace_id: str, unique_id: str, function_id: str
 ):
     nwb_path_list = glob(
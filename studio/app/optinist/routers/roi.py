@@ -15,7 +15,7 @@ logger = AppLogger.get_logger()
     response_model=RoiStatus,
     dependencies=[Depends(is_workspace_owner)],
 )
-async def status_roi(filepath: str):
+def status_roi(filepath: str):
     return EditROI(file_path=filepath).get_status()
 
 
@@ -24,7 +24,7 @@ async def status_roi(filepath: str):
     response_model=bool,
     dependencies=[Depends(is_workspace_owner)],
 )
-async def add_roi(filepath: str, pos: RoiPos):
+def add_roi(filepath: str, pos: RoiPos):
     EditROI(file_path=filepath).add(pos)
     return True
 
@@ -34,7 +34,7 @@ async def add_roi(filepath: str, pos: RoiPos):
     response_model=bool,
     dependencies=[Depends(is_workspace_owner)],
 )
-async def merge_roi(filepath: str, roi_list: RoiList):
+def merge_roi(filepath: str, roi_list: RoiList):
     EditROI(file_path=filepath).merge(roi_list.ids)
     return True
 
@@ -44,7 +44,7 @@ async def merge_roi(filepath: str, roi_list: RoiList):
     response_model=bool,
     dependencies=[Depends(is_workspace_owner)],
 )
-async def delete_roi(filepath: str, roi_list: RoiList):
+def delete_roi(filepath: str, roi_list: RoiList):
     EditROI(file_path=filepath).delete(roi_list.ids)
     return True
 
@@ -54,7 +54,7 @@ async def delete_roi(filepath: str, roi_list: RoiList):
     response_model=bool,
     dependencies=[Depends(is_workspace_owner)],
 )
-async def commit_edit(filepath: str):
+def commit_edit(filepath: str):
     try:
         EditRoiUtils.execute(filepath)
 
@@ -73,6 +73,6 @@ async def commit_edit(filepath: str):
     response_model=bool,
     dependencies=[Depends(is_workspace_owner)],
 )
-async def cancel_edit(filepath: str):
+def cancel_edit(filepath: str):
     EditROI(file_path=filepath).cancel()
     return True
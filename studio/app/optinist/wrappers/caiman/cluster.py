@@ -0,0 +1,63 @@
+import atexit
+from contextlib import contextmanager
+from typing import Optional
+
+from studio.app.common.core.logger import AppLogger
+
+logger = AppLogger.get_logger()
+
+# local cluster shared by the CaImAn nodes run in the same process,
+# stopped when the process exits.
+# Consecutive nodes share it only when run by a warm rule worker: the warm_pool
+# run param on, and "caiman" in RULE_WORKER_CONDA_ENVS (default). Otherwise each
+# node runs in its own snakemake script process, with its own cluster.
+_cluster = {}
+
+
+@contextmanager
+def caiman_cluster(threads: Optional[int], max_processes: Optional[int] = None):
+    """
+    Multiprocessing cluster of a CaImAn node, sized by the threads allotted
+    to the node (snakemake threads) and capped by the n_processes param.
+
+    Yields (dview, n_processes), dview is None for a single process.
+    The cluster is kept for the next node of the process (see _cluster),
+    unless the node failed.
+    """
+    n_processes = max(1, int(threads or 1))
+    if max_processes:
+        n_processes = max(1, min(n_processes, int(max_processes)))
+
+    if n_processes == 1:
+        stop_caiman_cluster()
+        yield None, 1
+        return
+
+    if _cluster.get("n_processes") != n_processes:
+        from caiman.cluster import setup_cluster
+
+        stop_caiman_cluster()
+        _, dview, n_processes = setup_cluster(
+            backend="multiprocessing", n_processes=n_processes, single_thread=False
+        )
+        _cluster.update(dview=dview, n_processes=n_processes)
+        logger.info(f"started caiman cluster: {n_processes} processes")
+
+    try:
+        yield _cluster["dview"], _cluster["n_processes"]
+    except BaseException:
+        # workers may be left busy or broken
+        stop_caiman_cluster()
+        raise
+
+
+def stop_caiman_cluster() -> None:
+    dview = _cluster.pop("dview", None)
+    _cluster.clear()
+    if dview is not None:
+        from caiman import stop_server
+
+        stop_server(dview=dview)
+
+
+atexit.register(stop_caiman_cluster)
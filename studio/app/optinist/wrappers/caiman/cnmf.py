@@ -1,4 +1,3 @@
-import gc
 import os
 
 import numpy as np
@@ -12,19 +11,31 @@ from studio.app.common.core.utils.filepath_creater import (
 )
 from studio.app.common.dataclass import ImageData
 from studio.app.optinist.core.nwb.nwb import NWBDATASET
-from studio.app.optinist.dataclass import EditRoiData, FluoData, IscellData, RoiData
+from studio.app.optinist.dataclass import (
+    EditRoiData,
+    FluoData,
+    IscellData,
+    RoiData,
+    RoiMasks,
+)
+from studio.app.optinist.wrappers.caiman.cluster import caiman_cluster
 
 logger = AppLogger.get_logger()
 
 
-def get_roi(A, roi_thr, thr_method, swap_dim, dims):
+def get_roi(A, roi_thr, thr_method, swap_dim, dims) -> RoiMasks:
+    return RoiMasks.from_masks(
+        _iter_roi_masks(A, roi_thr, thr_method, swap_dim, dims), dims
+    )
+
+
+def _iter_roi_masks(A, roi_thr, thr_method, swap_dim, dims):
     from scipy.ndimage import binary_fill_holes
     from skimage.measure import find_contours
 
     d, nr = np.shape(A)
 
     # for each patches
-    ims = []
     coordinates = []
     for i in range(nr):
         pars = dict()
@@ -66,42 +77,64 @@ def get_roi(A, roi_thr, thr_method, swap_dim, dims):
             r_mask[np.round(c[:, 0]).astype("int"), np.round(c[:, 1]).astype("int")] = 1
 
         # Fill in the hole created by the contour boundary
-        r_mask = binary_fill_holes(r_mask)
-        ims.append(r_mask + (i * r_mask))
+        yield binary_fill_holes(r_mask)
 
-    return ims
 
-
-def util_get_memmap(images: np.ndarray, file_path: str):
+def util_get_memmap(images, file_path: str, batch_bytes: int = 2**26):
     """
-    convert np.ndarray to mmap
+    convert images (np.ndarray or ImageData.lazy_data) to mmap
+
+    frames are copied in batches, and an existing mmap of file_path
+    (e.g. saved with the motion corrected images by caiman_mc) is reused
     """
     from caiman.mmapping import prepare_shape
-    from caiman.paths import memmap_frames_filename
 
     order = "C"
-    dims = images.shape[1:]
+    dims = tuple(images.shape[1:])
     T = images.shape[0]
     shape_mov = (np.prod(dims), T)
+    mmap_path = util_memmap_path(file_path, dims, T)
 
-    dir_path = join_filepath(file_path.split("/")[:-1])
-    basename = file_path.split("/")[-1]
-    fname_tot = memmap_frames_filename(basename, dims, T, order)
-    mmap_path = join_filepath([dir_path, fname_tot])
-
+    # an existing mmap is opened copy-on-write, so that it is left unchanged
+    is_valid = util_is_memmap_valid(mmap_path, file_path, np.prod(shape_mov) * 4)
     mmap_images = np.memmap(
         mmap_path,
-        mode="w+",
+        mode="c" if is_valid else "w+",
         dtype=np.float32,
         shape=prepare_shape(shape_mov),
         order=order,
     )
 
     mmap_images = np.reshape(mmap_images.T, [T] + list(dims), order="F")
-    mmap_images[:] = images[:]
+    if not is_valid:
+        batch = max(1, batch_bytes // max(1, int(np.prod(dims)) * 4))
+        for start in range(0, T, batch):
+            mmap_images[start : start + batch] = images[start : start + batch]
+        mmap_images.flush()
     return mmap_images, dims, mmap_path
 
 
+def util_memmap_path(file_path: str, dims: tuple, T: int) -> str:
+    """
+    path of the (C order) mmap of the image file_path
+    """
+    from caiman.paths import memmap_frames_filename
+
+    dir_path = join_filepath(file_path.split("/")[:-1])
+    basename = file_path.split("/")[-1]
+    fname_tot = memmap_frames_filename(basename, dims, T, "C")
+    return join_filepath([dir_path, fname_tot])
+
+
+def util_is_memmap_valid(mmap_path: str, file_path: str, nbytes: int) -> bool:
+    # a mmap older than the image was created from a previous file
+    return (
+        os.path.exists(mmap_path)
+        and os.path.getsize(mmap_path) == nbytes
+        and os.path.getmtime(mmap_path) >= os.path.getmtime(file_path)
+    )
+
+
 def util_recursive_flatten_params(params, result_params: dict, nest_counter=0):
     """
     Recursively flatten node parameters (operation for CaImAn CNMFParams)
@@ -154,8 +187,7 @@ def util_download_model_files():
 def caiman_cnmf(
     images: ImageData, output_dir: str, params: dict = None, **kwargs
 ) -> dict(fluorescence=FluoData, iscell=IscellData):
-    from caiman import local_correlations, stop_server
-    from caiman.cluster import setup_cluster
+    from caiman import local_correlations
     from caiman.source_extraction.cnmf import cnmf, online_cnmf
     from caiman.source_extraction.cnmf.params import CNMFParams
 
@@ -173,16 +205,14 @@ def caiman_cnmf(
     do_refit = reshaped_params.pop("do_refit", None)
     roi_thr = reshaped_params.pop("roi_thr", None)
     use_online = reshaped_params.pop("use_online", False)
+    max_processes = reshaped_params.pop("n_processes", None)
 
     file_path = images.path
     if isinstance(file_path, list):
         file_path = file_path[0]
 
-    images = images.data
-    mmap_images, dims, mmap_path = util_get_memmap(images, file_path)
-
-    del images
-    gc.collect()
+    input_images = images
+    mmap_images, dims, mmap_path = util_get_memmap(images.lazy_data, file_path)
 
     nwbfile = kwargs.get("nwbfile", {})
     fr = nwbfile.get("imaging_plane", {}).get("imaging_rate", 30)
@@ -192,36 +222,29 @@ def caiman_cnmf(
     else:
         ops = CNMFParams(params_dict={**reshaped_params, "fr": fr})
 
-    if "dview" in locals():
-        stop_server(dview=dview)  # noqa: F821
-
-    c, dview, n_processes = setup_cluster(
-        backend="local", n_processes=None, single_thread=True
-    )
-
-    if use_online:
-        ops.change_params(
-            {
-                "fnames": [mmap_path],
-                # NOTE: These params uses np.inf as default in CaImAn.
-                # Yaml cannot serialize np.inf, so default value in yaml is None.
-                "max_comp_update_shape": reshaped_params["max_comp_update_shape"]
-                or np.inf,
-                "num_times_comp_updated": reshaped_params["update_num_comps"] or np.inf,
-            }
-        )
-        cnm = online_cnmf.OnACID(dview=dview, Ain=Ain, params=ops)
-        cnm.fit_online()
-    else:
-        cnm = cnmf.CNMF(n_processes=n_processes, dview=dview, Ain=Ain, params=ops)
-        cnm = cnm.fit(mmap_images)
-
-        if do_refit:
-            cnm = cnm.refit(mmap_images, dview=dview)
+    with caiman_cluster(kwargs.get("threads"), max_processes) as (dview, n_processes):
+        if use_online:
+            ops.change_params(
+                {
+                    "fnames": [mmap_path],
+                    # NOTE: These params uses np.inf as default in CaImAn.
+                    # Yaml cannot serialize np.inf, so default value in yaml is None.
+                    "max_comp_update_shape": reshaped_params["max_comp_update_shape"]
+                    or np.inf,
+                    "num_times_comp_updated": reshaped_params["update_num_comps"]
+                    or np.inf,
+                }
+            )
+            cnm = online_cnmf.OnACID(dview=dview, Ain=Ain, params=ops)
+            cnm.fit_online()
+        else:
+            cnm = cnmf.CNMF(n_processes=n_processes, dview=dview, Ain=Ain, params=ops)
+            cnm = cnm.fit(mmap_images)
 
-    cnm.estimates.evaluate_components(mmap_images, cnm.params, dview=dview)
+            if do_refit:
+                cnm = cnm.refit(mmap_images, dview=dview)
 
-    stop_server(dview=dview)
+        cnm.estimates.evaluate_components(mmap_images, cnm.params, dview=dview)
 
     # contours plot
     Cn = local_correlations(mmap_images.transpose(1, 2, 0))
@@ -247,28 +270,20 @@ def caiman_cnmf(
     cell_ims = get_roi(
         cnm.estimates.A[:, idx_good], roi_thr, thr_method, swap_dim, dims
     )
-    cell_ims = np.stack(cell_ims).astype(float)
-    cell_ims[cell_ims == 0] = np.nan
-    cell_ims -= 1
     n_rois = len(cell_ims)
 
     if len(idx_bad) > 0:
         non_cell_ims = get_roi(
             cnm.estimates.A[:, idx_bad], roi_thr, thr_method, swap_dim, dims
         )
-        non_cell_ims = np.stack(non_cell_ims).astype(float)
-        for i, j in enumerate(range(n_rois, n_rois + len(non_cell_ims))):
-            non_cell_ims[i, :] = np.where(non_cell_ims[i, :] != 0, j, 0)
-        non_cell_roi = np.nanmax(non_cell_ims, axis=0).astype(float)
     else:
-        non_cell_ims = np.zeros((0, *dims))
-        non_cell_roi = np.zeros(dims)
-        non_cell_roi[non_cell_roi == 0] = np.nan
-    non_cell_ims[non_cell_ims == 0] = np.nan
+        non_cell_ims = RoiMasks(dims)
 
     n_noncell_rois = len(non_cell_ims)
 
-    im = np.vstack([cell_ims, non_cell_ims])
+    # non cell ROIs are labeled after the cell ROIs
+    im = cell_ims.extend(non_cell_ims)
+    non_cell_roi = im.label_image(np.arange(n_rois, n_rois + n_noncell_rois))
 
     # NWBの追加
     nwbfile = {}
@@ -320,17 +335,17 @@ def caiman_cnmf(
         "fluorescence": FluoData(fluorescence, file_name="fluorescence"),
         "iscell": IscellData(iscell, file_name="iscell"),
         "all_roi": RoiData(
-            np.nanmax(im, axis=0), output_dir=output_dir, file_name="all_roi"
+            im.label_image(), output_dir=output_dir, file_name="all_roi"
         ),
         "cell_roi": RoiData(
-            np.nanmax(im[iscell != 0], axis=0),
+            im.label_image(iscell != 0),
             output_dir=output_dir,
             file_name="cell_roi",
         ),
         "non_cell_roi": RoiData(
             non_cell_roi, output_dir=output_dir, file_name="non_cell_roi"
         ),
-        "edit_roi_data": EditRoiData(mmap_images, im),
+        "edit_roi_data": EditRoiData(input_images, im),
         "nwbfile": nwbfile,
     }
 
@@ -8,6 +8,7 @@ from studio.app.common.core.logger import AppLogger
 from studio.app.common.dataclass import ImageData
 from studio.app.optinist.core.nwb.nwb import NWBDATASET
 from studio.app.optinist.dataclass import EditRoiData, FluoData, IscellData, RoiData
+from studio.app.optinist.wrappers.caiman.cluster import caiman_cluster
 from studio.app.optinist.wrappers.caiman.cnmf import (
     get_roi,
     util_download_model_files,
@@ -21,9 +22,8 @@ logger = AppLogger.get_logger()
 def caiman_cnmf_multisession(
     images: ImageData, output_dir: str, params: dict = None, **kwargs
 ) -> dict(fluorescence=FluoData, iscell=IscellData):
-    from caiman import load, local_correlations, stop_server
+    from caiman import load, local_correlations
     from caiman.base.rois import register_multisession
-    from caiman.cluster import setup_cluster
     from caiman.source_extraction.cnmf import cnmf
     from caiman.source_extraction.cnmf.params import CNMFParams
 
@@ -39,6 +39,7 @@ def caiman_cnmf_multisession(
 
     Ain = reshaped_params.pop("Ain", None)
     roi_thr = reshaped_params.pop("roi_thr", None)
+    max_processes = reshaped_params.pop("n_processes", None)
 
     # mulisiession params
     n_reg_files = reshaped_params.pop("n_reg_files", 2)
@@ -71,31 +72,23 @@ def caiman_cnmf_multisession(
     else:
         ops = CNMFParams(params_dict={**reshaped_params, "fr": fr})
 
-    if "dview" in locals():
-        stop_server(dview=dview)  # noqa: F821
-
-    c, dview, n_processes = setup_cluster(
-        backend="local", n_processes=None, single_thread=True
-    )
-
     cnm_list = []
     templates = []
-    for split_image_path in split_image_paths:
-        split_image = imageio.volread(split_image_path)
-        split_image_mmap, _, _ = util_get_memmap(split_image, split_image_path)
-        del split_image
-        gc.collect()
-
-        # ops.change_params("fnames", [image_path])
-        cnm = cnmf.CNMF(n_processes=n_processes, dview=dview, Ain=Ain, params=ops)
-        cnm = cnm.fit(split_image_mmap)
-        cnm_list.append(cnm)
-        templates.append(load(split_image_path).mean(0))
-
-        del split_image_mmap
-        gc.collect()
-
-    stop_server(dview=dview)
+    with caiman_cluster(kwargs.get("threads"), max_processes) as (dview, n_processes):
+        for split_image_path in split_image_paths:
+            split_image = imageio.volread(split_image_path)
+            split_image_mmap, _, _ = util_get_memmap(split_image, split_image_path)
+            del split_image
+            gc.collect()
+
+            # ops.change_params("fnames", [image_path])
+            cnm = cnmf.CNMF(n_processes=n_processes, dview=dview, Ain=Ain, params=ops)
+            cnm = cnm.fit(split_image_mmap)
+            cnm_list.append(cnm)
+            templates.append(load(split_image_path).mean(0))
+
+            del split_image_mmap
+            gc.collect()
 
     spatial = [cnm.estimates.A for cnm in cnm_list]
     dims = templates[0].shape
@@ -147,9 +140,6 @@ def caiman_cnmf_multisession(
     iscell = np.concatenate([np.ones(assignments_filtered.shape[0], dtype=int)])
 
     cell_ims = get_roi(spatial_filtered, roi_thr, thr_method, swap_dim, dims)
-    cell_ims = np.stack(cell_ims).astype(float)
-    cell_ims[cell_ims == 0] = np.nan
-    cell_ims -= 1
     n_rois = len(cell_ims)
 
     # NWBの追加
@@ -192,6 +182,7 @@ def caiman_cnmf_multisession(
     file_path = images.path
     if isinstance(file_path, list):
         file_path = file_path[0]
+    input_images = images
     images = images.data
     mmap_images, dims, _ = util_get_memmap(images.data, file_path)
 
@@ -207,11 +198,11 @@ def caiman_cnmf_multisession(
         "fluorescence": FluoData(fluorescence, file_name="fluorescence"),
         "iscell": IscellData(iscell, file_name="iscell"),
         "cell_roi": RoiData(
-            np.nanmax(cell_ims[iscell != 0], axis=0),
+            cell_ims.label_image(iscell != 0),
             output_dir=output_dir,
             file_name="cell_roi",
         ),
-        "edit_roi_data": EditRoiData(mmap_images, cell_ims),
+        "edit_roi_data": EditRoiData(input_images, cell_ims),
         "nwbfile": nwbfile,
     }
 
@@ -1,5 +1,8 @@
+import os
 import shutil
 
+import numpy as np
+
 from studio.app.common.core.experiment.experiment import ExptOutputPathIds
 from studio.app.common.core.logger import AppLogger
 from studio.app.common.core.utils.filepath_creater import (
@@ -9,6 +12,8 @@ from studio.app.common.core.utils.filepath_creater import (
 from studio.app.common.dataclass import ImageData
 from studio.app.optinist.core.nwb.nwb import NWBDATASET
 from studio.app.optinist.dataclass import RoiData
+from studio.app.optinist.wrappers.caiman.cluster import caiman_cluster
+from studio.app.optinist.wrappers.caiman.cnmf import util_memmap_path
 
 logger = AppLogger.get_logger()
 
@@ -16,10 +21,8 @@ logger = AppLogger.get_logger()
 def caiman_mc(
     image: ImageData, output_dir: str, params: dict = None, **kwargs
 ) -> dict(mc_images=ImageData):
-    import numpy as np
-    from caiman import load_memmap, save_memmap, stop_server
+    from caiman import load_memmap, save_memmap
     from caiman.base.rois import extract_binary_masks_from_structural_channel
-    from caiman.cluster import setup_cluster
     from caiman.motion_correction import MotionCorrect
     from caiman.source_extraction.cnmf.params import CNMFParams
 
@@ -28,31 +31,27 @@ def caiman_mc(
 
     opts = CNMFParams()
 
-    if params is not None:
-        opts.change_params(params_dict=params)
-
-    c, dview, n_processes = setup_cluster(
-        backend="local", n_processes=None, single_thread=True
-    )
+    params = dict(params or {})
+    max_processes = params.pop("n_processes", None)
+    opts.change_params(params_dict=params)
 
-    mc = MotionCorrect(image.path, dview=dview, **opts.get_group("motion"))
+    with caiman_cluster(kwargs.get("threads"), max_processes) as (dview, _):
+        mc = MotionCorrect(image.path, dview=dview, **opts.get_group("motion"))
 
-    mc.motion_correct(save_movie=True)
-    border_to_0 = 0 if mc.border_nan == "copy" else mc.border_to_0
-
-    # memory mapping
-    fname_new = save_memmap(
-        mc.mmap_file, base_name=function_id, order="C", border_to_0=border_to_0
-    )
+        mc.motion_correct(save_movie=True)
+        border_to_0 = 0 if mc.border_nan == "copy" else mc.border_to_0
 
-    stop_server(dview=dview)
+        # memory mapping
+        fname_new = save_memmap(
+            mc.mmap_file, base_name=function_id, order="C", border_to_0=border_to_0
+        )
 
-    # now load the file
+    # now load the file (images stay memory-mapped)
     Yr, dims, T = load_memmap(fname_new)
 
-    images = np.array(Yr.T.reshape((T,) + dims, order="F"))
+    images = Yr.T.reshape((T,) + dims, order="F")
 
-    meanImg = images.mean(axis=0)
+    meanImg = util_mean_image(Yr, dims)
     rois = (
         extract_binary_masks_from_structural_channel(
             meanImg, gSig=7, expand_method="dilation"
@@ -93,11 +92,26 @@ def caiman_mc(
         "nwbfile": nwbfile,
     }
 
+    del images, Yr
+
     # Clean up temporary files
     mmap_output_dir = join_filepath([output_dir, "mmap"])
     create_directory(mmap_output_dir)
     for mmap_file in mc.mmap_file:
         shutil.move(mmap_file, mmap_output_dir)
-    shutil.move(fname_new, mmap_output_dir)
+
+    # keep the C order mmap with mc_images, for the CNMF nodes (util_get_memmap)
+    mmap_path = util_memmap_path(mc_images.path[0], dims, T)
+    shutil.move(fname_new, mmap_path)
+    os.utime(mmap_path)
 
     return info
+
+
+def util_mean_image(Yr, dims: tuple, batch_bytes: int = 2**26):
+    """
+    mean image of a (pixels, frames) mmap, computed by batches of pixels
+    """
+    batch = max(1, batch_bytes // max(1, Yr.shape[1] * Yr.dtype.itemsize))
+    mean = [Yr[i : i + batch].mean(axis=1) for i in range(0, Yr.shape[0], batch)]
+    return np.concatenate(mean).reshape(dims, order="F")
@@ -4,7 +4,14 @@ from studio.app.common.core.experiment.experiment import ExptOutputPathIds
 from studio.app.common.core.logger import AppLogger
 from studio.app.common.dataclass import ImageData
 from studio.app.optinist.core.nwb.nwb import NWBDATASET
-from studio.app.optinist.dataclass import EditRoiData, FluoData, IscellData, RoiData
+from studio.app.optinist.dataclass import (
+    EditRoiData,
+    FluoData,
+    IscellData,
+    RoiData,
+    RoiMasks,
+)
+from studio.app.optinist.wrappers.optinist.dff import calc_dff
 
 logger = AppLogger.get_logger()
 
@@ -31,29 +38,18 @@ def lccd_detect(
 
     reshapedD = D.reshape([D.shape[0] * D.shape[1], D.shape[2]])
     timeseries = np.zeros([num_cell, num_frames])
-    roi_list = []
 
     for i in range(num_cell):
-        roi_list.append((roi[:, i].reshape([D.shape[0], D.shape[1]])) * (i + 1))
         timeseries[i, :] = np.mean(reshapedD[roi[:, i] > 0, :], axis=0)
 
-    im = np.stack(roi_list)
-    im = im.astype(np.float64)
-    im[im == 0] = np.nan
-    im -= 1
+    im = RoiMasks.from_masks(
+        (roi[:, i].reshape(D.shape[:2]) for i in range(num_cell)), D.shape[:2]
+    )
 
-    empty_roi = np.full_like(im[0], np.nan)
-    roi_image = np.nanmax(im[iscell != 0], axis=0).astype(float)
+    empty_roi = np.full(D.shape[:2], np.nan)
+    roi_image = im.label_image(iscell != 0)
 
-    timeseries_dff = np.ones([num_cell, num_frames]) * np.nan
-    for i in range(num_cell):
-        for k in range(num_frames):
-            if (k - dff_f0_frames >= 0) and (k + dff_f0_frames < num_frames):
-                f0 = np.percentile(
-                    timeseries[i, k - dff_f0_frames : k + dff_f0_frames],
-                    dff_f0_percentile,
-                )
-                timeseries_dff[i, k] = (timeseries[i, k] - f0) / f0
+    timeseries_dff = calc_dff(timeseries, dff_f0_frames, dff_f0_percentile)
 
     roi_list = [{"image_mask": roi[:, i].reshape(D.shape[:2])} for i in range(num_cell)]
 
@@ -94,7 +90,7 @@ def lccd_detect(
         "non_cell_roi": RoiData(
             empty_roi, output_dir=output_dir, file_name="non_cell_roi"
         ),
-        "edit_roi_data": EditRoiData(images=mc_images.data, im=im),
+        "edit_roi_data": EditRoiData(images=mc_images, im=im),
         "nwbfile": nwbfile,
     }
 
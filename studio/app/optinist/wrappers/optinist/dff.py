@@ -0,0 +1,64 @@
+import numpy as np
+
+# upper bound of elements materialized at once by sliding windows (float64: 256MB)
+MAX_WINDOW_ELEMENTS = 2**25
+
+
+def sliding_percentile(
+    timeseries: np.ndarray,
+    f0_frames: int,
+    f0_percentile: float,
+    max_window_elements: int = MAX_WINDOW_ELEMENTS,
+) -> np.ndarray:
+    """
+    Sliding-window percentile baseline of (cells, frames) timeseries.
+
+    For each frame k, the baseline is the percentile of
+    timeseries[:, k - f0_frames : k + f0_frames].
+    Frames whose window does not fit in the timeseries are NaN.
+
+    All cells are processed at once, chunked along frames so that
+    at most `max_window_elements` window values are materialized.
+    """
+    timeseries = np.asarray(timeseries, dtype=float)
+    if timeseries.ndim == 1:
+        timeseries = timeseries[np.newaxis, :]
+
+    num_cell, num_frames = timeseries.shape
+    window = 2 * f0_frames
+    baseline = np.full((num_cell, num_frames), np.nan)
+
+    # frames k with k - f0_frames >= 0 and k + f0_frames < num_frames
+    num_valid = num_frames - window
+    if f0_frames <= 0 or num_valid <= 0 or num_cell == 0:
+        return baseline
+
+    windows = np.lib.stride_tricks.sliding_window_view(timeseries, window, axis=1)
+    chunk = max(1, max_window_elements // (num_cell * window))
+
+    for start in range(0, num_valid, chunk):
+        stop = min(start + chunk, num_valid)
+        baseline[:, f0_frames + start : f0_frames + stop] = np.percentile(
+            windows[:, start:stop], f0_percentile, axis=-1
+        )
+
+    return baseline
+
+
+def calc_dff(
+    timeseries: np.ndarray,
+    f0_frames: int,
+    f0_percentile: float,
+    max_window_elements: int = MAX_WINDOW_ELEMENTS,
+) -> np.ndarray:
+    """
+    dF/F = (F - F0) / F0, with F0 the sliding percentile baseline
+    (see `sliding_percentile`).
+    """
+    timeseries = np.asarray(timeseries, dtype=float)
+    f0 = sliding_percentile(
+        timeseries, f0_frames, f0_percentile, max_window_elements
+    ).reshape(timeseries.shape)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (timeseries - f0) / f0
@@ -17,9 +17,12 @@ def cross_correlation(
     import itertools
 
     import numpy as np
-    import scipy.signal as ss
-    import scipy.stats as stats
-    from tqdm import tqdm
+
+    from studio.app.optinist.wrappers.optinist.neural_population_analysis.cross_correlation_engine import (  # noqa: E501
+        correlation_lags,
+        cross_correlation_matrix,
+        shuffle_baseline,
+    )
 
     function_id = ExptOutputPathIds(output_dir).function_id
     logger.info("start cross_correlation: %s", function_id)
@@ -40,47 +43,19 @@ def cross_correlation(
     # calculate cross correlation
     num_cell = X.shape[0]
     data_len = X.shape[1]
-    shuffle_num = params["shuffle_sample_number"]
-
-    lags = ss.correlation_lags(data_len, data_len, mode="same")
-    ind = np.intersect1d(
-        np.where(-params["lags"] <= lags), np.where(lags <= params["lags"])
+    n_jobs = params.get("n_jobs", 1)
+
+    x = correlation_lags(data_len, params["lags"])
+    mat = cross_correlation_matrix(X, x, n_jobs=n_jobs)
+
+    # baseline
+    s_mean, s_confint = shuffle_baseline(
+        X,
+        x,
+        params["shuffle_sample_number"],
+        params["shuffle_confidence_interval"],
+        n_jobs=n_jobs,
     )
-    x = lags[ind]
-
-    mat = np.zeros([num_cell, num_cell, len(x)])
-    s_confint = np.zeros([num_cell, num_cell, len(x), 2])
-    s_mean = np.zeros([num_cell, num_cell, len(x)])
-
-    for i in tqdm(range(num_cell)):
-        # for i in tqdm(range(3)):
-        for j in tqdm(range(num_cell)):
-            ccvals = ss.correlate(
-                X[i, :], X[j, :], method=params["method"], mode="same"
-            )
-            mat[i, j, :] = ccvals[ind]
-
-            # baseline
-            tp_s_mat = np.zeros([len(x), shuffle_num])
-            for k in range(shuffle_num):
-                tp = X[j, :]
-                np.random.shuffle(tp)
-                ccvals = ss.correlate(X[i, :], tp, method=params["method"], mode="same")
-                tp_s_mat[:, k] = ccvals[ind]
-
-            b_mean = np.mean(tp_s_mat, axis=1)
-            b_sem = stats.sem(tp_s_mat, axis=1)
-            b_df = shuffle_num - 1
-
-            interval = np.zeros([len(x), 2])
-            for k in range(len(x)):
-                interval[k, :] = stats.t.interval(
-                    params["shuffle_confidence_interval"], b_df, loc=0, scale=b_sem[k]
-                )
-
-            s_confint[i, j, :, 0] = interval[:, 0]
-            s_confint[i, j, :, 1] = interval[:, 1]
-            s_mean[i, j, :] = b_mean
 
     # NWB追加
     nwbfile = {}
@@ -100,21 +75,16 @@ def cross_correlation(
     # output structures
     cb = list(itertools.combinations(range(num_cell), 2))
 
-    for i in range(len(cb)):
-        arr1 = np.stack([x, mat[cb[i][0], cb[i][1], :]], axis=1)
+    for i, j in cb:
+        arr1 = np.stack([x, mat[i, j, :]], axis=1)
         arr2 = np.stack(
-            [
-                x,
-                s_mean[cb[i][0], cb[i][1], :],
-                s_confint[cb[i][0], cb[i][1], :, 0],
-                s_confint[cb[i][0], cb[i][1], :, 1],
-            ],
+            [x, s_mean[i, j, :], s_confint[i, j, :, 0], s_confint[i, j, :, 1]],
             axis=1,
         )
 
-    name = f"{str(cb[i][0])}-{str(cb[i][1])}"
-    info[name] = TimeSeriesData(arr1.T, file_name=name)
-    name = f"shuffle {str(cb[i][0])}-{str(cb[i][1])}"
-    info[name] = TimeSeriesData(arr2.T, file_name=name)
+        name = f"{i}-{j}"
+        info[name] = TimeSeriesData(arr1.T, file_name=name)
+        name = f"shuffle {i}-{j}"
+        info[name] = TimeSeriesData(arr2.T, file_name=name)
 
     return info
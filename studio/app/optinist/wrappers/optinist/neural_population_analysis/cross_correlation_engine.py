@@ -0,0 +1,174 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Tuple
+
+import numpy as np
+import scipy.fft as sfft
+import scipy.signal as ss
+import scipy.stats as stats
+
+# upper bound of complex cross spectra materialized at once per block (256MB)
+MAX_BLOCK_BYTES = 2**28
+
+# spectra shared with pool workers, set once per worker by _init_worker
+_worker_state = {}
+
+
+def correlation_lags(data_len: int, max_lag: int) -> np.ndarray:
+    """
+    Lags of `scipy.signal.correlate(mode="same")` within [-max_lag, max_lag]
+    """
+    lags = ss.correlation_lags(data_len, data_len, mode="same")
+    return lags[np.abs(lags) <= max_lag]
+
+
+def cross_correlation_matrix(
+    X: np.ndarray,
+    lags: np.ndarray,
+    n_jobs: int = 1,
+    max_block_bytes: int = MAX_BLOCK_BYTES,
+) -> np.ndarray:
+    """
+    Lagged cross correlation of all cell pairs of (cells, frames) X.
+
+    mat[i, j, k] = sum_n X[i, n + lags[k]] * X[j, n],
+    i.e. `scipy.signal.correlate(X[i], X[j], mode="same")` at `lags`.
+
+    Only pairs i <= j are computed, mat[j, i] is the lag reversal of mat[i, j].
+    """
+    X = np.asarray(X, dtype=float)
+    num_cell = X.shape[0]
+    lags = np.asarray(lags)
+    mat = np.zeros([num_cell, num_cell, len(lags)])
+    if num_cell == 0 or len(lags) == 0:
+        return mat
+
+    nfft = sfft.next_fast_len(2 * X.shape[1] - 1, real=True)
+    rows = _block_size(num_cell, nfft // 2 + 1, max_block_bytes)
+    blocks = [(a, min(a + rows, num_cell)) for a in range(0, num_cell, rows)]
+
+    for a, b, upper, lower in _run_blocks(_pair_block, blocks, X, nfft, lags, n_jobs):
+        mat[a:b, a:] = upper
+        mat[a:, a:b] = lower.swapaxes(0, 1)
+
+    return mat
+
+
+def shuffle_baseline(
+    X: np.ndarray,
+    lags: np.ndarray,
+    shuffle_num: int,
+    confidence: float,
+    n_jobs: int = 1,
+    seed: Optional[int] = None,
+    max_block_bytes: int = MAX_BLOCK_BYTES,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Cross correlation baseline of X[i] against shuffled X[j].
+
+    For each target cell j, `shuffle_num` random permutations of X[j]
+    are correlated with every X[i] at once.
+
+    Returns
+        mean: (cells, cells, lags) mean over shuffles
+        confint: (cells, cells, lags, 2) t-distribution confidence interval
+                 of the mean around 0
+    """
+    X = np.asarray(X, dtype=float)
+    num_cell = X.shape[0]
+    lags = np.asarray(lags)
+    mean = np.zeros([num_cell, num_cell, len(lags)])
+    sem = np.zeros([num_cell, num_cell, len(lags)])
+
+    if num_cell > 0 and len(lags) > 0 and shuffle_num > 0:
+        nfft = sfft.next_fast_len(2 * X.shape[1] - 1, real=True)
+        seeds = np.random.SeedSequence(seed).spawn(num_cell)
+        cols = max(1, num_cell // max(n_jobs, 1) // 4)
+        blocks = [
+            (a, min(a + cols, num_cell), shuffle_num, max_block_bytes, seeds[a:b])
+            for a in range(0, num_cell, cols)
+            for b in [min(a + cols, num_cell)]
+        ]
+
+        for a, b, block_mean, block_sem in _run_blocks(
+            _shuffle_block, blocks, X, nfft, lags, n_jobs
+        ):
+            mean[:, a:b] = block_mean
+            sem[:, a:b] = block_sem
+
+    with np.errstate(invalid="ignore"):
+        confint = np.stack(
+            stats.t.interval(confidence, shuffle_num - 1, loc=0, scale=sem), axis=-1
+        )
+
+    return mean, confint
+
+
+def _run_blocks(func, blocks, X, nfft, lags, n_jobs):
+    if n_jobs is None or n_jobs <= 1 or len(blocks) <= 1:
+        _init_worker(X, nfft, lags)
+        try:
+            yield from map(func, blocks)
+        finally:
+            _worker_state.clear()
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=min(n_jobs, len(blocks)),
+        initializer=_init_worker,
+        initargs=(X, nfft, lags),
+    ) as executor:
+        yield from executor.map(func, blocks)
+
+
+def _init_worker(X, nfft, lags):
+    _worker_state.update(
+        X=X,
+        nfft=nfft,
+        spectra=sfft.rfft(X, n=nfft, axis=-1),
+        # circular index of each lag in the inverse transform of cross spectra
+        lag_index=lags % nfft,
+        reverse_lag_index=-lags % nfft,
+    )
+
+
+def _block_size(num_rows, num_freqs, max_block_bytes):
+    # complex cross spectra and their real inverse transform
+    return max(1, max_block_bytes // (num_rows * num_freqs * 32))
+
+
+def _pair_block(block):
+    a, b = block
+    spectra = _worker_state["spectra"]
+
+    cross = spectra[a:b, None, :] * np.conj(spectra[None, a:, :])
+    correlation = sfft.irfft(cross, n=_worker_state["nfft"], axis=-1)
+    upper = correlation[..., _worker_state["lag_index"]]
+    lower = correlation[..., _worker_state["reverse_lag_index"]]
+
+    return a, b, upper, lower
+
+
+def _shuffle_block(block):
+    a, b, shuffle_num, max_block_bytes, seeds = block
+    X = _worker_state["X"]
+    spectra = _worker_state["spectra"]
+    nfft = _worker_state["nfft"]
+    lag_index = _worker_state["lag_index"]
+    num_cell = X.shape[0]
+
+    rows = _block_size(shuffle_num, spectra.shape[1], max_block_bytes)
+    mean = np.zeros([num_cell, b - a, len(lag_index)])
+    sem = np.zeros([num_cell, b - a, len(lag_index)])
+
+    for j, seed in zip(range(a, b), seeds):
+        rng = np.random.default_rng(seed)
+        shuffled = rng.permuted(np.tile(X[j], (shuffle_num, 1)), axis=1)
+        shuffled_spectra = np.conj(sfft.rfft(shuffled, n=nfft, axis=-1))
+
+        for r in range(0, num_cell, rows):
+            cross = spectra[r : r + rows, None, :] * shuffled_spectra[None, :, :]
+            corr = sfft.irfft(cross, n=nfft, axis=-1)[..., lag_index]
+            mean[r : r + rows, j - a] = corr.mean(axis=1)
+            sem[r : r + rows, j - a] = stats.sem(corr, axis=1)
+
+    return a, b, mean, sem
@@ -20,9 +20,14 @@ def Granger(
     import itertools
 
     import numpy as np
-    from statsmodels.tsa.stattools import adfuller, coint, grangercausalitytests
+    from statsmodels.tsa.stattools import adfuller, grangercausalitytests
     from tqdm import tqdm
 
+    from studio.app.optinist.wrappers.optinist.neural_population_analysis.granger_engine import (  # noqa: E501
+        cointegration_tests,
+        granger_causality,
+    )
+
     function_id = ExptOutputPathIds(output_dir).function_id
     logger.info("start granger: %s", function_id)
 
@@ -42,6 +47,7 @@ def Granger(
     num_cell = X.shape[1]
     comb = list(itertools.permutations(range(num_cell), 2))  # combinations with dup
     num_comb = len(comb)
+    n_jobs = params.get("n_jobs", 1)
 
     # preprocessing
     tX = standard_norm(X, params["standard_mean"], params["standard_std"])
@@ -91,8 +97,8 @@ def Granger(
     if params["use_coint_test"]:
         logger.info("Running cointegration test ")
 
-        for i in tqdm(range(num_comb)):
-            tp = coint(X[:, comb[i][0]], X[:, comb[i][1]], **params["coint"])
+        coint_results = cointegration_tests(X, comb, n_jobs=n_jobs, **params["coint"])
+        for i, tp in enumerate(coint_results):
             if not np.isnan(tp[0]):
                 cit["cit_count_t"][i] = tp[0]
             if not np.isnan(tp[1]):
@@ -102,57 +108,45 @@ def Granger(
     #  Granger causality
     logger.info("Running granger test ")
 
-    if hasattr(params["Granger_maxlag"], "__iter__"):
-        num_lag = len(params["Granger_maxlag"])
-    else:
-        num_lag = params["Granger_maxlag"]
+    # The Null hypothesis for grangercausalitytests is
+    # that the time series in the second column1,
+    # does NOT Granger cause the time series in the first column0
+    # column 1 -> column 0
+    gc = granger_causality(
+        tX,
+        params["Granger_maxlag"],
+        addconst=params["Granger_addconst"],
+        n_jobs=n_jobs,
+    )
 
     GC = {
         "gc_combinations": comb,
-        "gc_ssr_ftest": np.zeros([num_comb, num_lag, 4], dtype="float64"),
-        "gc_ssr_chi2test": np.zeros([num_comb, num_lag, 3], dtype="float64"),
-        "gc_lrtest": np.zeros([num_comb, num_lag, 3], dtype="float64"),
-        "gc_params_ftest": np.zeros([num_comb, num_lag, 4], dtype="float64"),
-        "gc_OLS_restricted": [[0] * num_lag for i in range(num_comb)],
-        "gc_OLS_unrestricted": [[0] * num_lag for i in range(num_comb)],
-        "gc_OLS_restriction_matrix": [[0] * num_lag for i in range(num_comb)],
-        "Granger_fval_mat": [np.zeros([num_cell, num_cell]) for i in range(num_lag)],
+        "gc_ssr_ftest": gc["ssr_ftest"],  # (F, pval, df_denom, df_num)
+        "gc_ssr_chi2test": gc["ssr_chi2test"],  # (chi2, pval, df)
+        "gc_lrtest": gc["lrtest"],  # likelihood ratio test (chi2, pval, df)
+        "gc_params_ftest": gc["params_ftest"],  # (F, pval, df_denom, df_num)
+        "Granger_fval_mat": gc["fval_mat"],
     }
 
-    for i in tqdm(range(len(comb))):
-        # The Null hypothesis for grangercausalitytests is
-        # that the time series in the second column1,
-        # does NOT Granger cause the time series in the first column0
-        # column 1 -> column 0
-        tp = grangercausalitytests(
-            tX[:, [comb[i][0], comb[i][1]]],
-            params["Granger_maxlag"],
-            verbose=False,
-            addconst=params["Granger_addconst"],
-        )
-
-        for j in range(len(tp)):  # number of lag
-            GC["gc_ssr_ftest"][i, j, :] = tp[j + 1][0]["ssr_ftest"][
-                0:4
-            ]  # ssr based F test (F, pval, df_denom, df_num)
-            GC["gc_ssr_chi2test"][i, j, :] = tp[j + 1][0]["ssr_chi2test"][
-                0:3
-            ]  # ssr based chi2test (chi2, pval, df)
-            GC["gc_lrtest"][i, j, :] = tp[j + 1][0]["lrtest"][
-                0:3
-            ]  # likelihood ratio test (chi2, pval, df)
-            GC["gc_params_ftest"][i, j, :] = tp[j + 1][0]["params_ftest"][
-                0:4
-            ]  # parameter F test (F, pval, df_denom, df_num)
-            GC["gc_OLS_restricted"][i][j] = tp[j + 1][1][0]
-            GC["gc_OLS_unrestricted"][i][j] = tp[j + 1][1][1]
-            GC["gc_OLS_restriction_matrix"][i][j] = tp[j + 1][1][2]
-
-            GC["Granger_fval_mat"][j][comb[i][0], comb[i][1]] = tp[j + 1][0][
-                "ssr_ftest"
-            ][0]
-
-    GC["Granger_fval_mat"] = np.array(GC["Granger_fval_mat"])
+    # fitted OLS models are only kept on request (memory grows with pairs x lags)
+    if params.get("Granger_store_OLS", False):
+        num_lag = gc["ssr_ftest"].shape[1]
+        GC["gc_OLS_restricted"] = [[0] * num_lag for i in range(num_comb)]
+        GC["gc_OLS_unrestricted"] = [[0] * num_lag for i in range(num_comb)]
+        GC["gc_OLS_restriction_matrix"] = [[0] * num_lag for i in range(num_comb)]
+
+        for i in tqdm(range(num_comb)):
+            tp = grangercausalitytests(
+                tX[:, [comb[i][0], comb[i][1]]],
+                params["Granger_maxlag"],
+                verbose=False,
+                addconst=params["Granger_addconst"],
+            )
+
+            for j, lag_result in enumerate(tp.values()):
+                GC["gc_OLS_restricted"][i][j] = lag_result[1][0]
+                GC["gc_OLS_unrestricted"][i][j] = lag_result[1][1]
+                GC["gc_OLS_restriction_matrix"][i][j] = lag_result[1][2]
 
     # main results for plot
     info = {}
@@ -0,0 +1,214 @@
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Tuple, Union
+
+import numpy as np
+import scipy.stats as stats
+
+# data shared with pool workers, set once per worker by _init_worker
+_worker_state = {}
+
+
+def granger_lags(maxlag: Union[int, Iterable[int]]) -> List[int]:
+    """
+    Lags tested by `statsmodels.tsa.stattools.grangercausalitytests`
+    """
+    if hasattr(maxlag, "__iter__"):
+        return [int(lag) for lag in maxlag]
+    return list(range(1, int(maxlag) + 1))
+
+
+def granger_causality(
+    X: np.ndarray,
+    maxlag: Union[int, Iterable[int]],
+    addconst: bool = True,
+    n_jobs: int = 1,
+) -> Dict[str, np.ndarray]:
+    """
+    Granger causality tests of all ordered cell pairs of (frames, cells) X,
+    equivalent to `grangercausalitytests(X[:, [i, j]], maxlag)`
+    (does X[:, j] Granger cause X[:, i]?) for each pair.
+
+    For each target cell i and lag, the restricted model (own lags of i)
+    is fitted once, and the unrestricted models of all causes j are solved
+    together on the residuals of the restricted model (Frisch-Waugh-Lovell).
+    Target cells can be processed in a process pool.
+
+    Returns (pairs in `itertools.permutations(range(cells), 2)` order)
+        combinations: [(i, j), ...]
+        ssr_ftest: (pairs, lags, 4) F, pvalue, df_denom, df_num
+        ssr_chi2test: (pairs, lags, 3) chi2, pvalue, df
+        lrtest: (pairs, lags, 3) chi2, pvalue, df
+        params_ftest: (pairs, lags, 4) F, pvalue, df_denom, df_num
+        fval_mat: (lags, cells, cells) ssr F value of cause j -> target i
+    """
+    X = np.asarray(X, dtype=float)
+    num_frames, num_cell = X.shape
+    lags = granger_lags(maxlag)
+
+    if num_frames <= 3 * max(lags) + int(addconst):
+        raise ValueError(
+            "Insufficient observations. Maximum allowable lag is "
+            f"{int((num_frames - int(addconst)) / 3) - 1}"
+        )
+
+    targets = list(range(num_cell))
+    if n_jobs is None or n_jobs <= 1 or num_cell <= 1:
+        _init_worker(X, lags, addconst)
+        try:
+            results = list(map(_target_tests, targets))
+        finally:
+            _worker_state.clear()
+    else:
+        with ProcessPoolExecutor(
+            max_workers=min(n_jobs, num_cell),
+            initializer=_init_worker,
+            initargs=(X, lags, addconst),
+        ) as executor:
+            chunksize = max(1, num_cell // (n_jobs * 4))
+            results = list(executor.map(_target_tests, targets, chunksize=chunksize))
+
+    num_lag = len(lags)
+    if results:
+        ssr_ftest, ssr_chi2test, lrtest = (
+            np.concatenate(arrays) for arrays in zip(*results)
+        )
+    else:
+        ssr_ftest = np.zeros([0, num_lag, 4])
+        ssr_chi2test = np.zeros([0, num_lag, 3])
+        lrtest = np.zeros([0, num_lag, 3])
+
+    combinations = list(itertools.permutations(range(num_cell), 2))
+    fval_mat = np.zeros([num_lag, num_cell, num_cell])
+    if combinations:
+        i, j = np.array(combinations).T
+        fval_mat[:, i, j] = ssr_ftest[:, :, 0].T
+
+    return {
+        "combinations": combinations,
+        "ssr_ftest": ssr_ftest,
+        "ssr_chi2test": ssr_chi2test,
+        "lrtest": lrtest,
+        # F test of the cause coefficients equals the ssr F test for OLS
+        "params_ftest": ssr_ftest.copy(),
+        "fval_mat": fval_mat,
+    }
+
+
+def cointegration_tests(
+    X: np.ndarray,
+    combinations: List[Tuple[int, int]],
+    n_jobs: int = 1,
+    **coint_params,
+) -> List[tuple]:
+    """
+    `statsmodels.tsa.stattools.coint(X[:, i], X[:, j])` of each pair,
+    processed in a process pool
+    """
+    tasks = [(X[:, i], X[:, j], coint_params) for i, j in combinations]
+
+    if n_jobs is None or n_jobs <= 1 or len(tasks) <= 1:
+        return list(map(_coint, tasks))
+
+    with ProcessPoolExecutor(max_workers=min(n_jobs, len(tasks))) as executor:
+        chunksize = max(1, len(tasks) // (n_jobs * 4))
+        return list(executor.map(_coint, tasks, chunksize=chunksize))
+
+
+def _coint(task):
+    from statsmodels.tsa.stattools import coint
+
+    x, y, coint_params = task
+    return coint(x, y, **coint_params)
+
+
+def _init_worker(X, lags, addconst):
+    _worker_state.update(X=X, lags=lags, addconst=addconst, gram={})
+
+
+def _lagged_gram(lag: int) -> np.ndarray:
+    """
+    gram[c, p, q] = sum_t X[t + p, c] * X[t + q, c], the gram matrices of
+    the lagged designs of each cell, shared by all target cells
+    """
+    cache = _worker_state["gram"]
+    if lag not in cache:
+        X = _worker_state["X"]
+        nobs = X.shape[0] - lag
+        gram = np.zeros([X.shape[1], lag, lag])
+        for p in range(lag):
+            for q in range(p, lag):
+                gram[:, p, q] = gram[:, q, p] = np.einsum(
+                    "tc,tc->c", X[p : p + nobs], X[q : q + nobs]
+                )
+        cache[lag] = gram
+
+    return cache[lag]
+
+
+def _target_tests(i):
+    X = _worker_state["X"]
+    lags = _worker_state["lags"]
+    addconst = _worker_state["addconst"]
+    num_frames, num_cell = X.shape
+    causes = np.array([j for j in range(num_cell) if j != i], dtype=int)
+
+    ssr_ftest = np.zeros([len(causes), len(lags), 4])
+    ssr_chi2test = np.zeros([len(causes), len(lags), 3])
+    lrtest = np.zeros([len(causes), len(lags), 3])
+
+    for k, lag in enumerate(lags):
+        # the design of frame t + lag holds X[t + p] (p = 0..lag - 1) of each cell
+        nobs = num_frames - lag
+        shifted = [X[p : p + nobs] for p in range(lag)]
+        y = X[lag:, i]
+
+        # restricted model: own lags (and constant)
+        restricted = np.column_stack(
+            [x[:, i] for x in shifted] + ([np.ones(nobs)] if addconst else [])
+        )
+        basis = _orthonormal_basis(restricted)
+        residual = y - basis @ (basis.T @ y)
+        ssr_restricted = residual @ residual
+
+        # unrestricted models: cause lags with the restricted model projected out
+        projected = np.stack([basis.T @ x[:, causes] for x in shifted], axis=-1)
+        gram = _lagged_gram(lag)[causes] - np.einsum(
+            "bcl,bcm->clm", projected, projected
+        )
+        cross = np.stack([residual @ x[:, causes] for x in shifted], axis=-1)
+        ssr_reduction = np.einsum(
+            "cl,clm,cm->c", cross, np.linalg.pinv(gram, hermitian=True), cross
+        )
+
+        ssr_unrestricted = ssr_restricted - ssr_reduction
+        df_resid = nobs - basis.shape[1] - lag
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = (ssr_restricted - ssr_unrestricted) / ssr_unrestricted
+            fgc1 = ratio / lag * df_resid
+            fgc2 = nobs * ratio
+            lr = nobs * np.log(ssr_restricted / ssr_unrestricted)
+
+        ssr_ftest[:, k] = np.column_stack(
+            [
+                fgc1,
+                stats.f.sf(fgc1, lag, df_resid),
+                np.full(len(causes), df_resid),
+                np.full(len(causes), lag),
+            ]
+        )
+        ssr_chi2test[:, k] = np.column_stack(
+            [fgc2, stats.chi2.sf(fgc2, lag), np.full(len(causes), lag)]
+        )
+        lrtest[:, k] = np.column_stack(
+            [lr, stats.chi2.sf(lr, lag), np.full(len(causes), lag)]
+        )
+
+    return ssr_ftest, ssr_chi2test, lrtest
+
+
+def _orthonormal_basis(design: np.ndarray) -> np.ndarray:
+    u, s, _ = np.linalg.svd(design, full_matrices=False)
+    rank = np.sum(s > s.max(initial=0) * max(design.shape) * np.finfo(float).eps)
+    return u[:, :rank]
@@ -6,14 +6,14 @@ def microscope_to_img(
     microscope: MicroscopeData, output_dir: str, params: dict = None, **kwargs
 ) -> dict(microscope_image=ImageData):
     reader = microscope.reader
-    raw_stack = reader.get_image_stacks()  # (ch, t, y, x) or (ch, t, z, y, x)
 
+    # frames of the channel are read and written to tiff in batches
     ch = params.get("ch", 0)
     image = ImageData(
-        raw_stack[ch],
+        reader.get_frames(ch),  # (t, y, x) or (t, z, y, x)
         output_dir=output_dir,
         file_name="microscope_image",
     )
-    microscope.set_data(image.data)
+    microscope.set_data(image.lazy_data)
 
     return {"microscope_image": image}
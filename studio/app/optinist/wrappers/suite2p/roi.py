@@ -7,6 +7,7 @@ from studio.app.optinist.dataclass import (
     FluoData,
     IscellData,
     RoiData,
+    RoiMasks,
     Suite2pData,
 )
 
@@ -17,7 +18,7 @@ def suite2p_roi(
     ops: Suite2pData, output_dir: str, params: dict = None, **kwargs
 ) -> dict(ops=Suite2pData, fluorescence=FluoData, iscell=IscellData):
     import numpy as np
-    from suite2p import ROI, classification, default_ops, detection, extraction
+    from suite2p import classification, default_ops, detection, extraction
 
     function_id = ExptOutputPathIds(output_dir).function_id
     logger.info("start suite2p_roi: %s", function_id)
@@ -52,17 +53,9 @@ def suite2p_roi(
     iscell = classification.classify(stat=stat, classfile=classfile)
     iscell = iscell[:, 0].astype(int)
 
-    arrays = []
-    for i, s in enumerate(stat):
-        array = ROI(
-            ypix=s["ypix"], xpix=s["xpix"], lam=s["lam"], med=s["med"], do_crop=False
-        ).to_array(Ly=ops["Ly"], Lx=ops["Lx"])
-        array *= i + 1
-        arrays.append(array)
-
-    im = np.stack(arrays)
-    im[im == 0] = np.nan
-    im -= 1
+    im = RoiMasks.from_pixels(
+        (ops["Ly"], ops["Lx"]), [s["ypix"] for s in stat], [s["xpix"] for s in stat]
+    )
 
     # roiを追加
     roi_list = []
@@ -123,19 +116,19 @@ def suite2p_roi(
         "fluorescence": FluoData(F, file_name="fluorescence"),
         "iscell": IscellData(iscell, file_name="iscell"),
         "all_roi": RoiData(
-            np.nanmax(im, axis=0), output_dir=output_dir, file_name="all_roi"
+            im.label_image(), output_dir=output_dir, file_name="all_roi"
         ),
         "non_cell_roi": RoiData(
-            np.nanmax(im[iscell == 0], axis=0),
+            im.label_image(iscell == 0),
             output_dir=output_dir,
             file_name="noncell_roi",
         ),
         "cell_roi": RoiData(
-            np.nanmax(im[iscell != 0], axis=0),
+            im.label_image(iscell != 0),
             output_dir=output_dir,
             file_name="cell_roi",
         ),
-        "edit_roi_data": EditRoiData(images=ImageData(ops["filelist"]).data, im=im),
+        "edit_roi_data": EditRoiData(images=ImageData(ops["filelist"]), im=im),
         "nwbfile": nwbfile,
     }
 
@@ -0,0 +1,47 @@
+import os
+
+import numpy as np
+
+from studio.app.common.core.rules.result_handoff import ResultHandoff
+from studio.app.common.core.utils.pickle_handler import PickleWriter
+from studio.app.dir_path import DIRPATH
+
+output_dirpath = f"{DIRPATH.OUTPUT_DIR}/default/result_handoff"
+
+
+def write_result(name: str, value) -> tuple:
+    pickle_path = f"{output_dirpath}/{name}/{name}.pkl"
+    output_info = {"data": np.full(3, value), "nwbfile": {"input": {"a": value}}}
+    PickleWriter.write(pickle_path, output_info)
+    return pickle_path, output_info
+
+
+def test_result_handoff():
+    os.makedirs(output_dirpath, exist_ok=True)
+    ResultHandoff.enable(1)
+    try:
+        pickle_path, output_info = write_result("func1", 1)
+        ResultHandoff.put(pickle_path, output_info)
+
+        # nwb dicts merged after the result is written are not handed off
+        output_info["nwbfile"]["input"]["a"] = 2
+
+        handoff = ResultHandoff.read(pickle_path)
+        assert handoff["nwbfile"]["input"]["a"] == 1
+        np.testing.assert_array_equal(handoff["data"], output_info["data"])
+
+        # the handed off result is a copy
+        handoff["data"][:] = 0
+        assert ResultHandoff.read(pickle_path)["data"][0] == 1
+
+        # a rewritten pickle is read from the file
+        PickleWriter.write(pickle_path, {"data": np.full(3, 3)})
+        assert ResultHandoff.read(pickle_path)["data"][0] == 3
+
+        # only max_entries results are kept
+        ResultHandoff.put(pickle_path, output_info)
+        assert ResultHandoff.read(pickle_path)["data"][0] == 1
+        ResultHandoff.put(*write_result("func2", 4))
+        assert ResultHandoff.read(pickle_path)["data"][0] == 3
+    finally:
+        ResultHandoff.enable(0)
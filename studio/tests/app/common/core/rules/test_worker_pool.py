@@ -0,0 +1,69 @@
+import os
+import sys
+
+import pytest
+
+from studio.app.common.core.rules.worker_pool import RuleWorkerPool
+from studio.app.common.core.utils.pickle_handler import PickleReader
+from studio.app.common.dataclass import ImageData
+from studio.app.dir_path import DIRPATH
+
+image_filepath = (
+    f"{DIRPATH.DATA_DIR}/output_test/default/smk_exec_suite2p/input_0/test.tif"
+)
+output_dirpath = f"{DIRPATH.OUTPUT_DIR}/default/worker_pool"
+
+
+def image_rule(output: str) -> dict:
+    return {
+        "input": [image_filepath],
+        "return_arg": "input_0",
+        "params": {},
+        "output": output,
+        "type": "image",
+        "nwbfile": {"image_series": {}},
+        "hdf5Path": None,
+        "matPath": None,
+        "path": None,
+    }
+
+
+def test_worker_pool_run_data_rule():
+    python = RuleWorkerPool.executable(image_rule(""), use_conda=True)
+    assert python == sys.executable
+
+    os.makedirs(f"{output_dirpath}/input_0", exist_ok=True)
+    for i in range(2):
+        # the second rule is run by the warm worker
+        output = f"{output_dirpath}/input_0/data_{i}.pkl"
+        RuleWorkerPool.run(python, image_rule(output), [image_filepath], [output], [])
+
+        output_info = PickleReader.read(output)
+        assert isinstance(output_info["input_0"], ImageData)
+        assert output_info["input_0"].path == [image_filepath]
+
+    RuleWorkerPool.shutdown()
+
+
+def test_worker_pool_run_failed_rule():
+    # not a hdf5 file
+    details = {**image_rule(""), "type": "hdf5", "hdf5Path": "data"}
+    output = f"{output_dirpath}/input_1/data.pkl"
+
+    with pytest.raises(RuntimeError, match="Rule failed in rule worker"):
+        RuleWorkerPool.run(sys.executable, details, [image_filepath], [output], [])
+
+    RuleWorkerPool.shutdown()
+
+
+def test_worker_pool_isolated_env():
+    details = {**image_rule(""), "type": "func", "path": "lccd/lccd_cell_detection"}
+
+    assert RuleWorkerPool.executable(details, use_conda=True) is None
+
+
+def test_worker_pool_caiman_env():
+    # CaImAn nodes run in warm workers, which keep their cluster between nodes
+    details = {**image_rule(""), "type": "func", "path": "caiman/caiman_mc"}
+
+    assert RuleWorkerPool.executable(details, use_conda=False) == sys.executable
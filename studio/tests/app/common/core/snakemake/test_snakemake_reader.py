@@ -37,6 +37,10 @@ def test_RuleConfigReader_read():
     output = RuleConfigReader.read(rule_config)
 
     assert isinstance(output, Rule)
+    assert not output.forcerun
+
+    output = RuleConfigReader.read({**rule_config, "forcerun": True})
+    assert output.forcerun
 
 
 def test_SmkParamReader_read():
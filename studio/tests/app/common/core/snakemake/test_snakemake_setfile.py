@@ -1,3 +1,6 @@
+from dataclasses import asdict, replace
+
+from studio.app.common.core.snakemake.smk_utils import SmkUtils
 from studio.app.common.core.snakemake.snakemake_rule import SmkRule
 from studio.app.common.core.workflow.workflow import Edge, Node, NodeData, NodePosition
 from studio.app.const import FILETYPE
@@ -84,3 +87,24 @@ def test_SmkSetfile_algo():
 
     assert rule.type == node.data.label
     assert rule.path == node.data.path
+
+
+def test_SmkSetfile_algo_resources():
+    algo_node = replace(node, data=replace(node.data, label="caiman_cnmf"))
+    rule = SmkRule(
+        workspace_id=workspace_id,
+        unique_id=unique_id,
+        node=algo_node,
+        edgeDict=edgeDict,
+    ).algo(nodeDict=nodeDict)
+
+    assert rule.resources["threads"] > 1
+    assert SmkUtils.threads(asdict(rule)) == rule.resources["threads"]
+    assert SmkUtils.resources(asdict(rule), mem_mb_budget=1000) == {
+        "mem_mb": 1000,
+        "runtime": rule.resources["runtime"],
+    }
+
+    # no declaration: one thread, no memory hint
+    assert SmkUtils.threads({"resources": None}) == 1
+    assert SmkUtils.resources({"resources": None}, mem_mb_budget=1000) == {}
@@ -0,0 +1,38 @@
+import numpy as np
+
+from studio.app.common.core.utils.downsampling import (
+    block_reduce,
+    lttb_indices,
+    minmax_indices,
+)
+
+values = np.array([[0, 5, 1, 2, 9, 3, 4]], dtype=float)
+
+
+def test_minmax_indices():
+    np.testing.assert_array_equal(minmax_indices(values, None), [range(7)])
+    # buckets [0, 5, 1, 2] and [9, 3, 4]
+    np.testing.assert_array_equal(minmax_indices(values, 4), [[0, 1, 4, 5]])
+
+
+def test_lttb_indices():
+    np.testing.assert_array_equal(lttb_indices(values, 10), [range(7)])
+    # first and last frames, and the peaks of buckets [5, 1, 2] and [9, 3]
+    np.testing.assert_array_equal(lttb_indices(values, 4), [[0, 1, 4, 6]])
+
+    nan_values = values.copy()
+    nan_values[0, 4] = np.nan
+    assert 4 not in lttb_indices(nan_values, 4)[0]
+
+
+def test_block_reduce():
+    matrix = np.arange(5 * 4, dtype=float).reshape(5, 4)
+    matrix[4, 3] = np.nan
+
+    reduced, rows, cols = block_reduce(matrix, 3, 2)
+
+    assert reduced.shape == (3, 2)
+    np.testing.assert_array_equal(rows, [0, 2, 4])
+    np.testing.assert_array_equal(cols, [0, 2])
+    assert reduced[0, 0] == matrix[:2, :2].mean()
+    assert reduced[2, 1] == matrix[4, 2]
@@ -0,0 +1,156 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import numpy as np
+import tifffile
+
+from studio.app.common.core.utils.api_executor import ApiExecutor
+from studio.app.common.core.utils.filepath_creater import (
+    create_directory,
+    join_filepath,
+)
+from studio.app.common.core.utils.image_pyramid import ImagePyramid
+from studio.app.common.core.workflow.workflow import (
+    Message,
+    NodeRunStatus,
+    OutputPath,
+    OutputType,
+)
+from studio.app.dir_path import DIRPATH
+
+dirpath = f"{DIRPATH.OUTPUT_DIR}/default/image_pyramid_test/func1/tiff/image"
+tiff_path = join_filepath([dirpath, "image.tif"])
+
+image = np.arange(3 * 600 * 520, dtype=np.uint16).reshape(3, 600, 520) % 1000
+
+
+def test_ImagePyramid_build():
+    create_directory(dirpath)
+    tifffile.imwrite(tiff_path, image, photometric="minisblack")
+
+    assert ImagePyramid.get_source_path(
+        f"{DIRPATH.OUTPUT_DIR}/default/image_pyramid_test/func1/image.json"
+    ) == join_filepath([dirpath, "image.tif"])
+    assert ImagePyramid.get_levels(image.shape) == [
+        (600, 520),
+        (300, 260),
+        (150, 130),
+        (75, 65),
+    ]
+
+    # tiles are reduced on the fly until the pyramid is built
+    tiles = [
+        ImagePyramid.read_tile(tiff_path, level, 1, 1, 0, method)
+        for level in [1, 3]
+        for method in ["mean", "max"]
+    ]
+    ImagePyramid.build(tiff_path)
+    assert ImagePyramid.is_built(tiff_path)
+    for tile, built_tile in zip(
+        tiles,
+        [
+            ImagePyramid.read_tile(tiff_path, level, 1, 1, 0, method)
+            for level in [1, 3]
+            for method in ["mean", "max"]
+        ],
+    ):
+        np.testing.assert_array_equal(tile, built_tile)
+
+    tile = ImagePyramid.read_tile(tiff_path, 0, 2, 1, 2)
+    np.testing.assert_array_equal(tile, image[2:3, 512:600, 256:512])
+
+    tile = ImagePyramid.read_tile(tiff_path, 1, 1, 1, 0)
+    assert tile.shape == (1, 256, 4)
+    assert tile[0, 0, 0] == image[1, 0:2, 512:514].mean()
+
+    tile = ImagePyramid.read_tile(tiff_path, 3, 0, 0, 0, "max")
+    assert tile.shape == (1, 75, 65)
+    assert tile[0, 0, 0] == image[0, 0:8, 0:8].max()
+
+
+def test_ImagePyramid_nan():
+    roi = np.full((600, 520), np.nan)
+    roi[0, 0] = 1
+    roi[1, 1] = 3
+    roi[300:, :] = 2
+
+    roi_path = join_filepath([dirpath, "roi.tif"])
+    create_directory(dirpath)
+    tifffile.imwrite(roi_path, roi)
+    np.testing.assert_array_equal(
+        ImagePyramid.read_tile(roi_path, 2, 0, 0, 0, "max")[0, :, 0],
+        [3] + [np.nan] * 74 + [2] * 75,
+    )
+    ImagePyramid.build(roi_path)
+
+    tile = ImagePyramid.read_tile(roi_path, 1, 0, 0, 0)
+    assert tile[0, 0, 0] == 2
+    assert np.isnan(tile[0, 0, 1])
+
+    tile = ImagePyramid.read_tile(roi_path, 2, 0, 0, 0, "max")
+    assert tile[0, 0, 0] == 3
+    assert tile[0, 149, 0] == 2
+
+
+def test_ImagePyramid_get_sources():
+    node_dirpath = f"{DIRPATH.OUTPUT_DIR}/default/image_pyramid_test/func2"
+    for name, shape in [("roi", (600, 520)), ("small", (100, 80))]:
+        create_directory(f"{node_dirpath}/tiff/{name}")
+        tifffile.imwrite(f"{node_dirpath}/tiff/{name}/{name}.tif", np.zeros(shape))
+    movie_path = f"{node_dirpath}/mc_images.tif"
+    tifffile.imwrite(
+        movie_path, np.zeros((3, 600, 520), np.uint16), photometric="minisblack"
+    )
+
+    message = Message(
+        status=NodeRunStatus.SUCCESS.value,
+        message="",
+        outputPaths={
+            name: OutputPath(path=path, type=output_type, max_index=1)
+            for name, path, output_type in [
+                ("roi", f"{node_dirpath}/roi.json", OutputType.ROI),
+                ("small", f"{node_dirpath}/small.json", OutputType.IMAGE),
+                ("mc_images", movie_path, OutputType.IMAGE),
+            ]
+        },
+    )
+
+    # movies are built on demand only
+    assert ImagePyramid.get_sources({"func2": message}) == [
+        f"{node_dirpath}/tiff/roi/roi.tif"
+    ]
+
+
+def test_ImagePyramid_build_in_background(monkeypatch):
+    build_path = join_filepath([dirpath, "background.tif"])
+    create_directory(dirpath)
+    tifffile.imwrite(build_path, image, photometric="minisblack")
+
+    futures = []
+
+    def submit_in_background(func, *args):
+        # slow submission, concurrent calls overlap
+        time.sleep(0.05)
+        futures.append(Future())
+        return futures[-1]
+
+    monkeypatch.setattr(ApiExecutor, "submit_in_background", submit_in_background)
+
+    # concurrent requests (threads of the api) submit the build once
+    barrier = threading.Barrier(4)
+
+    def build_in_background():
+        barrier.wait()
+        ImagePyramid.build_in_background(build_path)
+
+    with ThreadPoolExecutor(4) as executor:
+        for future in [executor.submit(build_in_background) for _ in range(4)]:
+            future.result()
+    assert len(futures) == 1
+
+    # submitted again once done
+    futures[0].set_result(None)
+    ImagePyramid.build_in_background(build_path)
+    assert len(futures) == 2
+    futures[1].set_result(None)
@@ -0,0 +1,32 @@
+import json
+import os
+
+import numpy as np
+
+from studio.app.common.core.utils.file_reader import JsonReader
+from studio.app.common.core.utils.json_writer import JsonWriter
+from studio.app.dir_path import DIRPATH
+
+filepath = f"{DIRPATH.OUTPUT_DIR}/default/json_writer_test/heatmap.json"
+
+
+def test_JsonWriter_write_as_split():
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    data = np.arange(6, dtype=float).reshape(3, 2)
+    data[1, 1] = np.nan
+
+    # non contiguous, written in batches of rows
+    JsonWriter.write_as_split(filepath, data.T, columns=["a", "b", "c"])
+
+    # compact pandas "split" orient
+    with open(filepath) as f:
+        assert "\n" not in f.read()
+
+    output_data = JsonReader.read_as_output(filepath)
+    assert output_data.columns == ["a", "b", "c"]
+    assert output_data.index == [0, 1]
+    assert output_data.data == [[0, 2, 4], [1, None, 5]]
+
+    JsonWriter.write_as_split(filepath, np.arange(3))
+    with open(filepath) as f:
+        assert json.load(f)["data"] == [[0], [1], [2]]
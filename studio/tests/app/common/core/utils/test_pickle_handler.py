@@ -1,6 +1,12 @@
 import os
 
-from studio.app.common.core.utils.pickle_handler import PickleReader, PickleWriter
+import numpy as np
+
+from studio.app.common.core.utils.pickle_handler import (
+    PickleReader,
+    PickleWriter,
+    arrays_dirpath,
+)
 from studio.app.dir_path import DIRPATH
 
 workspace_id = "default"
@@ -25,3 +31,32 @@ def test_PickleReader():
     data = PickleReader.read(filepath)
 
     assert data == "abc"
+
+
+def test_PickleWriter_arrays():
+    pickle_path = f"{DIRPATH.OUTPUT_DIR}/{workspace_id}/{unique_id}/func3/func3.pkl"
+    large = np.arange(2**18, dtype=np.float64).reshape(512, 512)
+    info = {"large": large, "fortran": np.asfortranarray(large), "small": np.ones(3)}
+
+    PickleWriter.write(pickle_path, info)
+    array_files = os.listdir(arrays_dirpath(pickle_path))
+    assert len(array_files) == 2
+
+    data = PickleReader.read(pickle_path)
+    assert isinstance(data["large"], np.memmap)
+    np.testing.assert_array_equal(data["large"], large)
+    np.testing.assert_array_equal(data["fortran"], large)
+    assert data["fortran"].flags.f_contiguous
+
+    # copy-on-write, the file is left intact
+    data["large"][0, 0] = -1
+    assert PickleReader.read(pickle_path)["large"][0, 0] == 0
+
+    # unchanged arrays are not rewritten, arrays no longer used are removed
+    PickleWriter.overwrite(pickle_path, {"fortran": None})
+    remaining_files = os.listdir(arrays_dirpath(pickle_path))
+    assert len(remaining_files) == 1 and remaining_files[0] in array_files
+
+    PickleWriter.remove(pickle_path)
+    assert not os.path.exists(pickle_path)
+    assert not os.path.exists(arrays_dirpath(pickle_path))
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from studio.app.common.core.utils.filepath_creater import create_directory
+from studio.app.common.core.utils.timeseries_store import TimeSeriesStore
+from studio.app.dir_path import DIRPATH
+
+dirpath = f"{DIRPATH.OUTPUT_DIR}/default/timeseries_store_test/func1/fluorescence"
+
+data = np.arange(3 * 10, dtype=float).reshape(3, 10)
+data[1, 4] = np.nan
+
+
+def test_TimeSeriesStore():
+    create_directory(dirpath)
+    TimeSeriesStore.write(dirpath, data, std=data / 10, cell_numbers=[1, 2, 5])
+
+    json_data = TimeSeriesStore.read(dirpath)
+    assert list(json_data.data) == ["1", "2", "5"]
+    assert json_data.xrange == [str(i) for i in range(10)]
+    assert json_data.data["5"]["9"] == 29
+    assert json_data.std["5"]["9"] == 2.9
+    assert json_data.data["2"]["4"] is None
+
+    json_data = TimeSeriesStore.read(dirpath, cells=[2], start=3, stop=6)
+    assert list(json_data.data) == ["2"]
+    assert json_data.data["2"] == {"3": 13, "4": None, "5": 15}
+
+    json_data = TimeSeriesStore.read(dirpath, max_points=4, method="lttb")
+    assert list(json_data.data["5"]) == ["0", "1", "5", "9"]
+
+
+def test_TimeSeriesStore_not_numeric():
+    create_directory(dirpath)
+
+    # numbers of object arrays (e.g. read by pandas) are stored
+    TimeSeriesStore.write(dirpath, data.astype(object))
+    assert TimeSeriesStore.read(dirpath).data["2"]["9"] == 29
+
+    with pytest.raises(ValueError):
+        TimeSeriesStore.write(dirpath, np.array([["a", "b"], [1, 2]], dtype=object))
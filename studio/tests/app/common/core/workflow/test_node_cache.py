@@ -0,0 +1,154 @@
+import inspect
+import json
+import os
+import time
+
+import numpy as np
+
+from studio.app.common.core.snakemake.smk import Rule
+from studio.app.common.core.utils.pickle_handler import PickleReader, PickleWriter
+from studio.app.common.core.workflow.node_cache import NodeCache
+from studio.app.common.dataclass import ImageData
+from studio.app.optinist.wrappers.optinist.basic_neural_analysis.cell_grouping import (
+    cell_grouping,
+)
+from studio.app.optinist.wrappers.optinist.dff import calc_dff
+
+
+def wrapper_function(params=None, **kwargs):
+    return {}
+
+
+def make_rule(params: dict) -> Rule:
+    return Rule(
+        input=[],
+        return_arg={},
+        params=params,
+        output="",
+        type="func",
+        path="optinist/basic_neural_analysis/func",
+    )
+
+
+def write_node(node_dirpath: str) -> str:
+    pickle_path = f"{node_dirpath}/func.pkl"
+    image = ImageData(np.ones((3, 4, 4)), output_dir=node_dirpath, file_name="image")
+    PickleWriter.write(pickle_path, {"image": image, "info": [node_dirpath]})
+
+    with open(f"{node_dirpath}/plot.json", "w") as f:
+        json.dump({"value": 1}, f)
+
+    return pickle_path
+
+
+def test_node_key():
+    key = NodeCache.node_key(make_rule({"a": 1}), {}, ["input"], wrapper_function)
+
+    assert key == NodeCache.node_key(
+        make_rule({"a": 1}), {}, ["input"], wrapper_function
+    )
+    assert key != NodeCache.node_key(
+        make_rule({"a": 2}), {}, ["input"], wrapper_function
+    )
+    assert key != NodeCache.node_key(
+        make_rule({"a": 1}), {}, ["other_input"], wrapper_function
+    )
+
+
+def test_node_key_sources():
+    source_hashes = NodeCache._NodeCache__source_hashes
+    source_hashes.clear()
+    NodeCache.node_key(make_rule({}), {}, [], cell_grouping)
+    NodeCache.node_key(make_rule({}), {}, [], calc_dff)
+
+    # the whole wrapper package is hashed, not only the wrapper file
+    assert list(source_hashes) == [
+        os.path.dirname(os.path.abspath(inspect.getsourcefile(calc_dff)))
+    ]
+
+
+def test_node_cache_store_restore(tmp_path):
+    cache = NodeCache(str(tmp_path / "cache"), max_bytes=2**30)
+    pickle_path = write_node(str(tmp_path / "run1" / "func"))
+    cache.store("ab01", pickle_path, {"input_key": str(tmp_path / "run1" / "input")})
+
+    new_dirpath = str(tmp_path / "run2" / "func")
+    output_info = cache.restore(
+        "ab01",
+        f"{new_dirpath}/func.pkl",
+        {"input_key": str(tmp_path / "run2" / "input")},
+    )
+
+    # paths of the original run are moved to the new run
+    assert output_info["info"] == [new_dirpath]
+    assert output_info["image"].path == [f"{new_dirpath}/tiff/image/image.tif"]
+    np.testing.assert_array_equal(output_info["image"].data, np.ones((3, 4, 4)))
+    assert PickleReader.read(f"{new_dirpath}/func.pkl")["info"] == [new_dirpath]
+
+    # outputs are not shared with the cache
+    assert os.stat(f"{new_dirpath}/tiff/image/image.tif").st_nlink == 1
+    assert os.stat(f"{new_dirpath}/plot.json").st_nlink == 1
+
+    assert cache.restore("cd02", f"{new_dirpath}/func.pkl", {}) is None
+
+
+def test_node_cache_inplace_write(tmp_path):
+    cache = NodeCache(str(tmp_path / "cache"), max_bytes=2**30)
+    input_dirpath = str(tmp_path / "run1" / "input")
+    input_pickle_path = write_node(input_dirpath)
+    with open(f"{input_dirpath}/data.bin", "wb") as f:
+        f.write(b"raw")
+    cache.store("ab01", input_pickle_path, {})
+    os.utime(f"{input_dirpath}/plot.json", (0, 0))
+
+    # a downstream node rewrites the file in place (e.g. suite2p registration)
+    started_at_ns = time.time_ns()
+    with open(f"{input_dirpath}/data.bin", "r+b") as f:
+        f.write(b"reg")
+    node_pickle_path = write_node(str(tmp_path / "run1" / "func"))
+    cache.store("cd02", node_pickle_path, {"ab01": input_dirpath}, started_at_ns)
+
+    # the input entry is not changed by the downstream write
+    new_input_dirpath = str(tmp_path / "run2" / "input")
+    assert cache.restore("ab01", f"{new_input_dirpath}/func.pkl", {}) is not None
+    with open(f"{new_input_dirpath}/data.bin", "rb") as f:
+        assert f.read() == b"raw"
+
+    # the downstream write is replayed on restore of the downstream node
+    new_dirpath = str(tmp_path / "run2" / "func")
+    assert (
+        cache.restore("cd02", f"{new_dirpath}/func.pkl", {"ab01": new_input_dirpath})
+        is not None
+    )
+    with open(f"{new_input_dirpath}/data.bin", "rb") as f:
+        assert f.read() == b"reg"
+    assert not os.path.exists(
+        tmp_path / "cache" / "cd" / "cd02" / NodeCache.INPUTS_DIR / "ab01" / "plot.json"
+    )
+
+
+def test_node_cache_evict(tmp_path):
+    cache = NodeCache(str(tmp_path / "cache"), max_bytes=2**30)
+    for key in ["aa01", "bb02"]:
+        cache.store(key, write_node(str(tmp_path / key / "func")), {})
+
+    # aa01 is used last
+    os.utime(tmp_path / "cache" / "bb" / "bb02" / NodeCache.ENTRY_FILE, (0, 0))
+    cache.max_bytes = 1
+    cache.evict()
+
+    assert not os.path.exists(tmp_path / "cache" / "bb" / "bb02")
+    assert not os.path.exists(tmp_path / "cache" / "aa" / "aa01")
+
+    cache.max_bytes = 2**30
+    cache.store("aa01", write_node(str(tmp_path / "aa01" / "func")), {})
+    cache.store("bb02", write_node(str(tmp_path / "bb02" / "func")), {})
+    with open(tmp_path / "cache" / "aa" / "aa01" / NodeCache.ENTRY_FILE) as f:
+        entry_size = json.load(f)["size"]
+
+    os.utime(tmp_path / "cache" / "bb" / "bb02" / NodeCache.ENTRY_FILE, (0, 0))
+    cache.max_bytes = entry_size
+    cache.evict()
+
+    assert not os.path.exists(tmp_path / "cache" / "bb" / "bb02")
+    assert os.path.exists(tmp_path / "cache" / "aa" / "aa01")
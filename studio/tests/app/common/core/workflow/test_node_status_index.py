@@ -0,0 +1,51 @@
+import os
+import shutil
+
+from studio.app.common.core.experiment.experiment_reader import ExptConfigReader
+from studio.app.common.core.utils.pickle_handler import PickleReader, PickleWriter
+from studio.app.common.core.workflow.node_status_index import NodeStatusIndex
+from studio.app.common.core.workflow.workflow import NodeRunStatus
+from studio.app.common.core.workflow.workflow_result import WorkflowResult
+from studio.app.dir_path import DIRPATH
+
+workspace_id = "default"
+unique_id = "node_status_test"
+
+workflow_dirpath = f"{DIRPATH.DATA_DIR}/output_test/{workspace_id}/result_test"
+output_dirpath = f"{DIRPATH.OUTPUT_DIR}/{workspace_id}/{unique_id}"
+pickle_path = f"{output_dirpath}/func2/func2.pkl"
+
+
+def test_NodeStatusIndex_observe(monkeypatch):
+    shutil.copytree(workflow_dirpath, output_dirpath, dirs_exist_ok=True)
+
+    PickleWriter.write(pickle_path, {"value": 1})
+    NodeStatusIndex.write_success(pickle_path, {"value": 1})
+
+    node_statuses = NodeStatusIndex(output_dirpath).read()
+    assert node_statuses["func2"].status == NodeRunStatus.SUCCESS.value
+    assert node_statuses["func2"].is_current
+
+    # observe must not load node pickles of indexed nodes
+    def read_pickle(filepath):
+        assert False, f"pickle loaded: {filepath}"
+
+    monkeypatch.setattr(PickleReader, "read", read_pickle)
+
+    output = WorkflowResult(workspace_id, unique_id).observe(["func2"])
+
+    assert output["func2"].status == NodeRunStatus.SUCCESS.value
+    assert output["func2"].message == "func2 success"
+
+    expt_config = ExptConfigReader.read(f"{output_dirpath}/{DIRPATH.EXPERIMENT_YML}")
+    assert expt_config.function["func2"].success == NodeRunStatus.SUCCESS.value
+
+
+def test_NodeStatusIndex_rerun():
+    PickleWriter.write(pickle_path, {"value": 1})
+    NodeStatusIndex.write_error(pickle_path, "error message")
+    assert NodeStatusIndex(output_dirpath).read()["func2"].is_current
+
+    # node pickle is removed on re-run
+    os.remove(pickle_path)
+    assert not NodeStatusIndex(output_dirpath).read()["func2"].is_current
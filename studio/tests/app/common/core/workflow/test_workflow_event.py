@@ -0,0 +1,134 @@
+import asyncio
+import os
+
+from snakemake.exceptions import WorkflowError
+
+from studio.app.common.core.snakemake import snakemake_executor
+from studio.app.common.core.snakemake.smk import SmkParam
+from studio.app.common.core.snakemake.smk_status_logger import SmkStatusLogger
+from studio.app.common.core.workflow.workflow import WorkflowRunStatus
+from studio.app.common.core.workflow.workflow_event import (
+    WorkflowEvent,
+    WorkflowEventBroker,
+    WorkflowEventType,
+)
+from studio.app.dir_path import DIRPATH
+
+workspace_id = "default"
+unique_id = "event_test"
+
+output_dirpath = f"{DIRPATH.OUTPUT_DIR}/{workspace_id}/{unique_id}"
+
+
+async def collect_events():
+    return [e async for e in WorkflowEventBroker.listen(workspace_id, unique_id)]
+
+
+def test_WorkflowEventBroker_listen():
+    WorkflowEventBroker.reset(workspace_id, unique_id)
+
+    async def run():
+        listener = asyncio.ensure_future(collect_events())
+        await asyncio.sleep(0)
+
+        for event in [
+            WorkflowEvent(type=WorkflowEventType.NODE_STARTED, nodeId="func1"),
+            WorkflowEvent(type=WorkflowEventType.NODE_FINISHED, nodeId="func1"),
+            WorkflowEvent(type=WorkflowEventType.WORKFLOW_FINISHED),
+        ]:
+            WorkflowEventBroker.publish(workspace_id, unique_id, event)
+
+        return await asyncio.wait_for(listener, timeout=5)
+
+    events = asyncio.run(run())
+
+    assert [e.type for e in events] == [
+        WorkflowEventType.NODE_STARTED,
+        WorkflowEventType.NODE_FINISHED,
+        WorkflowEventType.WORKFLOW_FINISHED,
+    ]
+
+    # late listeners receive the history
+    late_events = asyncio.run(asyncio.wait_for(collect_events(), timeout=5))
+    assert len(late_events) == 3
+
+
+def test_SmkStatusLogger_publish():
+    WorkflowEventBroker.reset(workspace_id, unique_id)
+    output_path = f"{output_dirpath}/func1/func1.pkl"
+    other_output_path = f"{DIRPATH.OUTPUT_DIR}/{workspace_id}/other/func1/func1.pkl"
+
+    smk_logger = SmkStatusLogger(workspace_id, unique_id)
+    smk_logger.log_handler({"level": "job_info", "jobid": 1, "output": [output_path]})
+    smk_logger.log_handler(
+        {"level": "job_info", "jobid": 2, "output": [other_output_path]}
+    )
+
+    # output pickle does not exist yet (job of another workflow)
+    smk_logger.log_handler({"level": "job_finished", "jobid": 1})
+
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    open(output_path, "wb").close()
+    smk_logger.log_handler({"level": "job_finished", "jobid": 1})
+    smk_logger.log_handler({"level": "job_finished", "jobid": 2})
+    smk_logger.clean_up()
+
+    WorkflowEventBroker.publish(
+        workspace_id,
+        unique_id,
+        WorkflowEvent(type=WorkflowEventType.WORKFLOW_FINISHED),
+    )
+    events = asyncio.run(asyncio.wait_for(collect_events(), timeout=5))
+
+    assert [(e.type, e.nodeId) for e in events] == [
+        (WorkflowEventType.NODE_STARTED, "func1"),
+        (WorkflowEventType.NODE_FINISHED, "func1"),
+        (WorkflowEventType.WORKFLOW_FINISHED, None),
+    ]
+
+
+def test_WorkflowEventBroker_untracked():
+    async def collect_untracked_events():
+        return [
+            e
+            async for e in WorkflowEventBroker.listen(
+                workspace_id, "untracked", lambda: WorkflowRunStatus.SUCCESS.value
+            )
+        ]
+
+    # e.g. run before a restart of the server
+    events = asyncio.run(asyncio.wait_for(collect_untracked_events(), timeout=5))
+
+    assert [(e.type, e.status) for e in events] == [
+        (WorkflowEventType.WORKFLOW_FINISHED, WorkflowRunStatus.SUCCESS.value)
+    ]
+
+
+def test_WorkflowEventBroker_keepalive(monkeypatch):
+    monkeypatch.setattr(WorkflowEventBroker, "KEEPALIVE_INTERVAL", 0.01)
+    WorkflowEventBroker.reset(workspace_id, unique_id)
+
+    async def first_event():
+        async for event in WorkflowEventBroker.listen(workspace_id, unique_id):
+            return event
+
+    assert asyncio.run(asyncio.wait_for(first_event(), timeout=5)) is None
+
+
+def test_snakemake_execute_error(monkeypatch):
+    def failing_snakemake(*args, **kwargs):
+        raise WorkflowError("locked")
+
+    monkeypatch.setattr(snakemake_executor, "snakemake", failing_snakemake)
+    snakemake_executor.snakemake_execute(
+        workspace_id,
+        unique_id,
+        SmkParam(
+            use_conda=False, cores=1, forceall=False, forcetargets=False, lock=False
+        ),
+    )
+
+    events = asyncio.run(asyncio.wait_for(collect_events(), timeout=5))
+    assert [(e.type, e.status) for e in events] == [
+        (WorkflowEventType.WORKFLOW_FINISHED, WorkflowRunStatus.ERROR.value)
+    ]
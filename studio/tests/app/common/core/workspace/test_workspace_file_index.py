@@ -0,0 +1,69 @@
+import os
+import shutil
+
+import numpy as np
+import tifffile
+
+from studio.app.common.core.utils.filepath_creater import (
+    create_directory,
+    join_filepath,
+)
+from studio.app.common.core.workspace.workspace_file_index import WorkspaceFileIndex
+from studio.app.dir_path import DIRPATH
+
+workspace_id = "file_index_test"
+dirpath = join_filepath([DIRPATH.INPUT_DIR, workspace_id])
+
+
+def test_WorkspaceFileIndex():
+    shutil.rmtree(dirpath, ignore_errors=True)
+    create_directory(join_filepath([dirpath, "sub", "dir"]))
+    tifffile.imwrite(
+        join_filepath([dirpath, "sub", "dir", "image.tif"]),
+        np.zeros((5, 8, 6), dtype=np.uint16),
+        photometric="minisblack",
+    )
+    with open(join_filepath([dirpath, "data.csv"]), "w") as f:
+        f.write("0,1\n")
+    with open(join_filepath([dirpath, "notes.txt"]), "w") as f:
+        f.write("not indexed")
+
+    index = WorkspaceFileIndex(workspace_id)
+    files = index.get()
+    assert sorted(files) == ["data.csv", "sub/dir/image.tif"]
+    assert files["sub/dir/image.tif"].shape == [5, 8, 6]
+    assert files["sub/dir/image.tif"].dtype == "uint16"
+    assert files["data.csv"].shape is None
+
+    # changes made outside of the api are found on read
+    os.remove(join_filepath([dirpath, "data.csv"]))
+    shutil.rmtree(join_filepath([dirpath, "sub", "dir"]))
+    tifffile.imwrite(
+        join_filepath([dirpath, "sub", "other.tif"]), np.zeros((4, 3), dtype=np.float32)
+    )
+    files = index.get()
+    assert sorted(files) == ["sub/other.tif"]
+    assert files["sub/other.tif"].shape == [4, 3]
+
+    # files rewritten in place (directory mtime unchanged) are probed again
+    dir_mtime = os.stat(join_filepath([dirpath, "sub"])).st_mtime_ns
+    tifffile.imwrite(
+        join_filepath([dirpath, "sub", "other.tif"]), np.zeros((6, 3), dtype=np.uint8)
+    )
+    os.utime(join_filepath([dirpath, "sub"]), ns=(dir_mtime, dir_mtime))
+    files = index.get()
+    assert files["sub/other.tif"].shape == [6, 3]
+    assert files["sub/other.tif"].dtype == "uint8"
+
+    # the index is not written into the workspace
+    assert sorted(os.listdir(dirpath)) == ["notes.txt", "sub"]
+
+    with open(join_filepath([dirpath, "sub", "broken.tif"]), "wb") as f:
+        f.write(b"not a tiff")
+    assert index.update("sub/broken.tif").shape == []
+
+    os.remove(join_filepath([dirpath, "sub", "other.tif"]))
+    index.remove("sub/other.tif")
+    assert "sub/other.tif" not in WorkspaceFileIndex(workspace_id).get()
+
+    shutil.rmtree(dirpath)
@@ -0,0 +1,75 @@
+import os
+import pickle
+
+import numpy as np
+import tifffile
+
+from studio.app.common.dataclass.image import ImageData, write_tiff
+from studio.app.dir_path import DIRPATH
+
+output_dirpath = f"{DIRPATH.OUTPUT_DIR}/default/image_test"
+
+image = np.arange(5 * 8 * 6, dtype=np.uint16).reshape(5, 8, 6)
+
+
+def test_image_metadata():
+    image_data = ImageData(image, output_dir=output_dirpath, file_name="image")
+
+    assert image_data.shape == (5, 8, 6)
+    assert image_data.ndim == 3
+    assert image_data.dtype == np.uint16
+    assert image_data.frame_count == 5
+    assert image_data.output_path.max_index == 5
+
+    # metadata is read from headers for file paths
+    reloaded = ImageData(image_data.path[0])
+    assert reloaded.shape == (5, 8, 6)
+    assert reloaded.dtype == np.uint16
+
+
+def test_image_lazy_data():
+    image_data = ImageData(image, output_dir=output_dirpath, file_name="lazy")
+
+    lazy = image_data.lazy_data
+    assert lazy.shape == image.shape
+    np.testing.assert_array_equal(lazy[1:3], image[1:3])
+    np.testing.assert_array_equal(lazy[-1], image[-1])
+    np.testing.assert_array_equal(lazy[::2, 1], image[::2, 1])
+    np.testing.assert_array_equal(image_data.get_frames(2, 4), image[2:4])
+    np.testing.assert_array_equal(np.asarray(lazy), image_data.data)
+
+
+def test_image_lazy_data_multiple_files():
+    paths = []
+    for i, (start, stop) in enumerate([(0, 2), (2, 5)]):
+        path = f"{output_dirpath}/multi_{i}.tif"
+        tifffile.imwrite(path, image[start:stop], compression="zlib")
+        paths.append(path)
+
+    image_data = ImageData(paths)
+
+    assert image_data.shape == (5, 8, 6)
+    np.testing.assert_array_equal(image_data.get_frames(1, 4), image[1:4])
+
+
+def test_image_pickle_without_metadata():
+    image_data = ImageData(image, output_dir=output_dirpath, file_name="pickled")
+    del image_data._shapes
+
+    reloaded = pickle.loads(pickle.dumps(image_data))
+    assert reloaded.shape == (5, 8, 6)
+
+
+def test_image_write_memmap_in_batches():
+    # strided view of a (pixels, frames) memmap, as CaImAn saves movies
+    mmap_path = f"{output_dirpath}/movie.mmap"
+    os.makedirs(output_dirpath, exist_ok=True)
+    Yr = np.memmap(mmap_path, mode="w+", dtype=np.float32, shape=(8 * 6, 5))
+    Yr[:] = image.reshape(5, -1, order="F").T
+    movie = Yr.T.reshape(image.shape, order="F")
+
+    path = f"{output_dirpath}/movie.tif"
+    write_tiff(path, movie, batch_bytes=2 * 8 * 6 * 4)
+
+    np.testing.assert_array_equal(tifffile.imread(path), image)
+    assert tifffile.memmap(path, mode="r").shape == image.shape
@@ -0,0 +1,32 @@
+import os
+
+import numpy as np
+
+from studio.app.common.core.utils.timeseries_store import TimeSeriesStore
+from studio.app.common.dataclass.csv import CsvData
+from studio.app.common.dataclass.timeseries import TimeSeriesData
+from studio.app.dir_path import DIRPATH
+
+output_dirpath = f"{DIRPATH.OUTPUT_DIR}/default/timeseries_test"
+
+# header row read as data (setHeader unset)
+data = np.array([["a", "b", "c"], [1, 2, 3]], dtype=object)
+
+
+def test_timeseries_not_numeric(client):
+    timeseries_data = TimeSeriesData(data, file_name="header")
+    timeseries_data.save_json(output_dirpath)
+
+    # served from the per cell json files
+    assert not TimeSeriesStore.exists(timeseries_data.json_path)
+    response = client.get(f"/outputs/timedata/{timeseries_data.json_path}?index=1")
+    assert response.status_code == 200
+    assert response.json()["data"]["1"] == {"0": 1, "1": 2, "2": 3}
+
+
+def test_csv_not_numeric():
+    csv_data = CsvData(data, {}, file_name="header")
+    csv_data.save_json(output_dirpath)
+
+    assert not TimeSeriesStore.exists(csv_data.json_path)
+    assert sorted(os.listdir(csv_data.json_path)) == ["0.json", "1.json"]
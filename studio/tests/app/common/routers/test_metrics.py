@@ -0,0 +1,11 @@
+def test_latency_metrics(client):
+    client.delete("/metrics/latency")
+    for _ in range(3):
+        client.get("/snakemake")
+
+    response = client.get("/metrics/latency")
+    data = response.json()
+
+    assert response.status_code == 200
+    assert data["GET /snakemake"]["count"] == 3
+    assert data["GET /snakemake"]["p99_ms"] <= data["GET /snakemake"]["max_ms"]
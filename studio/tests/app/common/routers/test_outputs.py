@@ -1,3 +1,9 @@
+import os
+
+import numpy as np
+import tifffile
+
+from studio.app.common.core.utils.frame_reader import TiffFrameReader
 from studio.app.dir_path import DIRPATH
 
 workspace_id = "default"
@@ -78,3 +84,83 @@ def test_image(client):
 
     assert response.status_code == 200
     assert isinstance(data, dict)
+
+
+def test_image_frames(client):
+    dirpath = f"{DIRPATH.OUTPUT_DIR}/{workspace_id}/frames_test"
+    os.makedirs(dirpath, exist_ok=True)
+    image = np.arange(20 * 8 * 6, dtype=np.uint16).reshape(20, 8, 6)
+    tifffile.imwrite(f"{dirpath}/test.tif", image)
+
+    response = client.get(
+        f"/outputs/image_frames/{dirpath}/test.tif"
+        f"?workspace_id={workspace_id}&start_index=3&end_index=7"
+    )
+    frames, header = TiffFrameReader.decode(response.content)
+
+    assert response.status_code == 200
+    assert header["start_index"] == 2
+    np.testing.assert_array_equal(frames, image[2:7])
+
+    response = client.get(
+        f"/outputs/image_frames/{dirpath}/test.tif"
+        f"?workspace_id={workspace_id}&downsample=2&quantize=true"
+    )
+    frames, header = TiffFrameReader.decode(response.content)
+
+    assert response.status_code == 200
+    assert frames.shape == (10, 4, 3)
+    assert frames.dtype == np.uint8
+    assert header["value_max"] > header["value_min"]
+
+    # rgb and multichannel images are not supported
+    tifffile.imwrite(f"{dirpath}/rgb.tif", np.zeros((8, 6, 3), np.uint8))
+    tifffile.imwrite(
+        f"{dirpath}/channels.tif",
+        np.zeros((4, 2, 8, 6), np.uint16),
+        photometric="minisblack",
+    )
+    for name in ["rgb.tif", "channels.tif"]:
+        response = client.get(
+            f"/outputs/image_frames/{dirpath}/{name}?workspace_id={workspace_id}"
+        )
+        assert response.status_code == 400
+
+
+def test_image_tile(client):
+    dirpath = f"{DIRPATH.OUTPUT_DIR}/{workspace_id}/tile_test/tiff/image"
+    os.makedirs(dirpath, exist_ok=True)
+    image = np.arange(2 * 300 * 280, dtype=np.uint16).reshape(2, 300, 280)
+    tifffile.imwrite(f"{dirpath}/image.tif", image, photometric="minisblack")
+
+    response = client.get(
+        f"/outputs/image_levels/{dirpath}/image.tif?workspace_id={workspace_id}"
+    )
+    assert response.status_code == 200
+    assert response.json()["levels"][1] == [150, 140]
+
+    response = client.get(
+        f"/outputs/image_tile/{dirpath}/image.tif"
+        f"?workspace_id={workspace_id}&frame=1&tile_x=1"
+    )
+    frames, header = TiffFrameReader.decode(response.content)
+
+    assert response.status_code == 200
+    assert header["start_index"] == 1
+    np.testing.assert_array_equal(frames, image[1:2, :256, 256:])
+
+    response = client.get(
+        f"/outputs/image_tile/{dirpath}/image.tif"
+        f"?workspace_id={workspace_id}&level=1&method=max"
+    )
+    frames, _ = TiffFrameReader.decode(response.content)
+
+    assert response.status_code == 200
+    assert frames.shape == (1, 150, 140)
+    assert frames[0, 0, 0] == image[0, :2, :2].max()
+
+    response = client.get(
+        f"/outputs/image_tile/{dirpath}/image.tif"
+        f"?workspace_id={workspace_id}&level=5"
+    )
+    assert response.status_code == 400
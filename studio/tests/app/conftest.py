@@ -9,10 +9,12 @@ from studio.app.common.core.auth.auth_dependencies import (
     get_admin_user,
     get_current_user,
 )
+from studio.app.common.core.workflow.node_cache import NODE_CACHE_CONFIG
 from studio.app.common.core.workspace.workspace_dependencies import (
     is_workspace_available,
     is_workspace_owner,
 )
+from studio.app.common.core.workspace.workspace_file_index import WorkspaceFileIndex
 from studio.app.dir_path import DIRPATH
 
 
@@ -26,6 +28,8 @@ def session_fixture():
     yield
 
     shutil.rmtree(f"{DIRPATH.DATA_DIR}/output")
+    shutil.rmtree(NODE_CACHE_CONFIG.NODE_CACHE_DIR, ignore_errors=True)
+    shutil.rmtree(WorkspaceFileIndex.INDEX_DIR, ignore_errors=True)
 
 
 @pytest.fixture(scope="module")
@@ -0,0 +1,118 @@
+import numpy as np
+import tifffile
+from pynwb import NWBHDF5IO
+
+from studio.app.common.core.utils.config_handler import ConfigReader
+from studio.app.common.dataclass import ImageData
+from studio.app.dir_path import CORE_PARAM_PATH
+from studio.app.optinist.core.nwb.nwb import NWBDATASET
+from studio.app.optinist.core.nwb.nwb_creater import overwrite_nwb, save_nwb
+from studio.app.optinist.core.nwb.nwb_dataio import NWBDataIO
+
+
+def test_nwb_dataio_chunk_shape():
+    dataset_io = NWBDataIO(chunk_bytes=4 * 16 * 16 * 2)
+
+    assert dataset_io.chunk_shape((100, 16, 16), 2) == (4, 16, 16)
+    assert dataset_io.chunk_shape((2, 16, 16), 2) == (2, 16, 16)
+    assert dataset_io.chunk_shape((100, 512, 512), 2) == (1, 512, 512)
+
+    assert NWBDataIO(min_bytes=1024).wrap(np.zeros(10)).__class__ is np.ndarray
+    assert NWBDataIO(compression="none").wrap(np.zeros(10**6)).__class__ is np.ndarray
+
+
+def test_save_nwb_compressed(tmp_path):
+    rng = np.random.default_rng(0)
+    movie = rng.integers(0, 100, (20, 16, 16), dtype=np.uint16)
+    tifffile.imwrite(tmp_path / "movie.tif", movie)
+
+    input_config = ConfigReader.read(CORE_PARAM_PATH.nwb.value)
+    input_config[NWBDATASET.IMAGE_SERIES]["external_file"] = ImageData(
+        str(tmp_path / "movie.tif")
+    )
+    input_config[NWBDATASET.IMAGE_SERIES]["save_raw_image_to_nwb"] = True
+    input_config["dataset_io"] = {"min_bytes": 0, "chunk_bytes": 8 * 16 * 16 * 2}
+
+    pixel_masks = [
+        np.array([[1, 2, 1.0], [3, 4, 0.5]]),
+        np.array([[5, 6, 1.0]]),
+    ]
+    fluorescence = rng.random((20, 2))
+    config = {
+        NWBDATASET.ROI: {
+            "func1": [
+                {"pixel_mask": mask, "accepted": i == 0}
+                for i, mask in enumerate(pixel_masks)
+            ]
+        },
+        NWBDATASET.FLUORESCENCE: {
+            "func1": {
+                "Fluorescence": {
+                    "table_name": "ROIs",
+                    "region": [0, 1],
+                    "name": "Fluorescence",
+                    "data": fluorescence,
+                    "unit": "lumens",
+                }
+            }
+        },
+    }
+
+    save_path = str(tmp_path / "test.nwb")
+    save_nwb(save_path, input_config, config)
+
+    with NWBHDF5IO(save_path, "r") as io:
+        nwbfile = io.read()
+
+        image_series = nwbfile.acquisition["TwoPhotonSeries"].data
+        np.testing.assert_array_equal(image_series[:], movie)
+        assert image_series.chunks == (8, 16, 16)
+        assert image_series.compression == "gzip"
+
+        plane_seg = nwbfile.processing["ophys"]["ImageSegmentation"]["func1"]
+        assert list(plane_seg.colnames) == ["accepted", "pixel_mask"]
+        assert list(plane_seg["accepted"].data[:]) == [True, False]
+        for i, mask in enumerate(pixel_masks):
+            np.testing.assert_array_equal(
+                np.array(plane_seg["pixel_mask"][i].tolist()), mask
+            )
+
+        np.testing.assert_array_equal(
+            nwbfile.processing["ophys"]["func1"]["Fluorescence"].data[:],
+            fluorescence,
+        )
+
+
+def test_overwrite_nwb_compressed(tmp_path):
+    rng = np.random.default_rng(0)
+    tifffile.imwrite(tmp_path / "movie.tif", np.zeros((20, 16, 16), np.uint16))
+
+    input_config = ConfigReader.read(CORE_PARAM_PATH.nwb.value)
+    input_config[NWBDATASET.IMAGE_SERIES]["external_file"] = ImageData(
+        str(tmp_path / "movie.tif")
+    )
+    config = {
+        NWBDATASET.ROI: {"func1": [{"pixel_mask": np.array([[1, 2, 1.0]])}]},
+        NWBDATASET.FLUORESCENCE: {
+            "func1": {
+                "Fluorescence": {
+                    "table_name": "ROIs",
+                    "region": [0],
+                    "name": "Fluorescence",
+                    "data": rng.random((20, 1)),
+                    "unit": "lumens",
+                }
+            }
+        },
+    }
+    save_nwb(str(tmp_path / "test.nwb"), input_config, config)
+
+    # nwb file rewritten after an roi edit
+    fluorescence = rng.random((20, 1))
+    config[NWBDATASET.FLUORESCENCE]["func1"]["Fluorescence"]["data"] = fluorescence
+    overwrite_nwb(config, str(tmp_path), "test.nwb", NWBDataIO(min_bytes=0))
+
+    with NWBHDF5IO(str(tmp_path / "test.nwb"), "r") as io:
+        data = io.read().processing["ophys"]["func1"]["Fluorescence"].data
+        np.testing.assert_array_equal(data[:], fluorescence)
+        assert data.compression == "gzip"
@@ -0,0 +1,88 @@
+import pickle
+
+import numpy as np
+import tifffile
+
+from studio.app.common.dataclass import ImageData
+from studio.app.optinist.dataclass import EditRoiData, RoiMasks
+
+
+def make_label_stack():
+    """
+    Dense ROI stack as built by the ROI detection wrappers:
+    pixel value is the ROI index, NaN outside of each ROI
+    """
+    im = np.full((3, 6, 5), np.nan)
+    im[0, 1:3, 1:3] = 0
+    im[1, 2:4, 2:5] = 1  # overlaps ROI 0
+    im[2, 5, 0] = 2
+    return im
+
+
+def test_roi_masks_label_image():
+    im = make_label_stack()
+    masks = RoiMasks.from_label_stack(im)
+
+    assert len(masks) == 3
+    assert masks.frame_shape == (6, 5)
+    np.testing.assert_array_equal(masks.to_label_stack(), im)
+    np.testing.assert_array_equal(masks.label_image(), np.nanmax(im, axis=0))
+
+    iscell = np.array([1, 0, 1])
+    np.testing.assert_array_equal(
+        masks.label_image(iscell != 0), np.nanmax(im[iscell != 0], axis=0)
+    )
+    assert np.isnan(masks.label_image(np.zeros(3, dtype=bool))).all()
+
+
+def test_roi_masks_edit():
+    masks = RoiMasks.from_label_stack(make_label_stack())
+
+    merged = masks.append(masks.union([0, 1]))
+    assert len(merged) == 4
+    np.testing.assert_array_equal(
+        merged.mask(3), ~np.isnan(make_label_stack()[:2]).all(axis=0)
+    )
+
+    # ellipse masks of added ROIs are NaN outside of the ROI
+    added = np.full((6, 5), np.nan)
+    added[0, 4] = 1
+    added = merged.append(added)
+    assert added.yx(4) == (np.array([0]), np.array([4]))
+
+    np.testing.assert_array_equal(added[:3].indices, masks.indices)
+    assert added.pixel_table().shape == (len(added.indices), 3)
+
+
+def test_roi_masks_from_pixels():
+    masks = RoiMasks.from_pixels((4, 4), [np.array([0, 0, 3])], [np.array([1, 2, 3])])
+
+    np.testing.assert_array_equal(masks.pixels(0), [1, 2, 15])
+
+
+def test_edit_roi_data_legacy_pickle():
+    im = make_label_stack()
+    data = EditRoiData(None, RoiMasks.from_label_stack(im))
+
+    # pickles written before RoiMasks hold the dense stack
+    data.im = im
+    restored = pickle.loads(pickle.dumps(data))
+
+    assert isinstance(restored.im, RoiMasks)
+    np.testing.assert_array_equal(restored.im.to_label_stack(), im)
+
+
+def test_edit_roi_data_roi_traces(tmp_path):
+    movie = np.random.default_rng(0).random((7, 6, 5)).astype(np.float32)
+    tifffile.imwrite(tmp_path / "movie.tif", movie)
+
+    im = make_label_stack()
+    data = EditRoiData(ImageData(str(tmp_path / "movie.tif")), im)
+    data.TRACE_CHUNK_FRAMES = 3
+
+    expected = np.array([movie[:, ~np.isnan(roi)].mean(axis=1) for roi in im])
+    np.testing.assert_allclose(data.roi_traces([0, 1, 2]), expected, rtol=1e-6)
+    np.testing.assert_allclose(data.roi_traces([2]), expected[[2]], rtol=1e-6)
+
+    # only the movie reference is pickled
+    assert len(pickle.dumps(data)) < movie.nbytes
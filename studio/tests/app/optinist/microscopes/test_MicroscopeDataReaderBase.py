@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+
+from studio.app.common.dataclass.image import ImageData
+from studio.app.dir_path import DIRPATH
+from studio.app.optinist.microscopes.MicroscopeDataReaderBase import (
+    MicroscopeDataReaderBase,
+    OMEDataModel,
+)
+
+output_dirpath = f"{DIRPATH.OUTPUT_DIR}/default/microscope_reader"
+
+# (ch, t, y, x)
+stacks = np.arange(2 * 7 * 4 * 5, dtype=np.uint16).reshape(2, 7, 4, 5)
+
+
+class SyntheticReader(MicroscopeDataReaderBase):
+    """Reader of the in-memory stacks, counting frame reads"""
+
+    def _init_library(self):
+        self.read_count = 0
+
+    def _load_file(self, data_file_path: str) -> object:
+        return (stacks,)
+
+    def _build_original_metadata(self, data_name: str) -> dict:
+        return {"data_name": data_name}
+
+    def _build_ome_metadata(self, original_metadata: dict) -> OMEDataModel:
+        return OMEDataModel(
+            image_name=original_metadata["data_name"],
+            size_x=stacks.shape[3],
+            size_y=stacks.shape[2],
+            size_t=stacks.shape[1],
+            size_z=0,
+            size_c=stacks.shape[0],
+            depth=16,
+            significant_bits=16,
+            acquisition_date="",
+            objective_model=None,
+            imaging_rate=30,
+        )
+
+    def _build_lab_specific_metadata(self, original_metadata: dict) -> dict:
+        return None
+
+    def _release_resources(self) -> None:
+        pass
+
+    def _get_image_stacks(self) -> list:
+        return stacks.copy()
+
+    def _get_frame_count(self) -> int:
+        return stacks.shape[1]
+
+    def _read_frame(self, channel: int, index: int) -> np.ndarray:
+        self.read_count += 1
+        return stacks[channel, index]
+
+
+def load_reader() -> SyntheticReader:
+    reader = SyntheticReader()
+    reader.load("synthetic.dat")
+    return reader
+
+
+def test_read_frames():
+    reader = load_reader()
+
+    assert reader.get_frame_count() == 7
+    np.testing.assert_array_equal(
+        reader.read_frames(1, [5, 0, -1]), stacks[1, [5, 0, 6]]
+    )
+    assert reader.read_count == 3
+    assert reader.read_frames(0, []).shape == (0, 4, 5)
+
+    with pytest.raises(IndexError):
+        reader.read_frames(0, [7])
+
+
+def test_iter_frames():
+    reader = load_reader()
+
+    batches = list(reader.iter_frames(channel=1, start=1, stop=6, batch=2))
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    np.testing.assert_array_equal(np.concatenate(batches), stacks[1, 1:6])
+    assert reader.read_count == 5
+
+    np.testing.assert_array_equal(
+        np.concatenate(list(reader.iter_frames(batch=3))), stacks[0]
+    )
+
+
+def test_frames_to_image():
+    reader = load_reader()
+
+    frames = reader.get_frames(1)
+    assert frames.shape == (7, 4, 5)
+    assert frames.dtype == np.uint16
+    np.testing.assert_array_equal(frames[2:4, 1], stacks[1, 2:4, 1])
+
+    image = ImageData(frames, output_dir=output_dirpath, file_name="frames")
+    np.testing.assert_array_equal(image.data, stacks[1])
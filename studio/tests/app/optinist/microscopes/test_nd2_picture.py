@@ -0,0 +1,34 @@
+import ctypes
+
+import numpy as np
+
+from studio.app.optinist.microscopes.ND2Reader import LIMPICTURE, picture_to_array
+
+
+def test_picture_to_array():
+    height, width, components = 3, 5, 2
+    width_bytes = 24  # lines are padded (5 px * 2 components * 2 bytes = 20)
+
+    image = np.arange(height * width * components, dtype=np.uint16).reshape(
+        height, width, components
+    )
+    buffer = np.zeros((height, width_bytes // 2), dtype=np.uint16)
+    buffer[:, : width * components] = image.reshape(height, -1)
+
+    pic = LIMPICTURE(
+        uiWidth=width,
+        uiHeight=height,
+        uiBitsPerComp=16,
+        uiComponents=components,
+        uiWidthBytes=width_bytes,
+        uiSize=buffer.nbytes,
+        pImageData=buffer.ctypes.data_as(ctypes.c_void_p).value,
+    )
+
+    plane = picture_to_array(pic, np.uint16)
+    np.testing.assert_array_equal(plane, image)
+
+    # channels are de-interleaved by a single copy
+    stacks = np.empty((components, 1, height, width), dtype=np.uint16)
+    stacks[:, 0] = plane.transpose(2, 0, 1)
+    np.testing.assert_array_equal(stacks[1, 0], image[:, :, 1])
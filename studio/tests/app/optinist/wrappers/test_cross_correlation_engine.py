@@ -0,0 +1,63 @@
+import numpy as np
+import scipy.signal as ss
+
+from studio.app.optinist.wrappers.optinist.neural_population_analysis.cross_correlation_engine import (  # noqa: E501
+    correlation_lags,
+    cross_correlation_matrix,
+    shuffle_baseline,
+)
+
+
+def cross_correlation_loop(X, max_lag):
+    """
+    Reference implementation (previous cross_correlation loop)
+    """
+    data_len = X.shape[1]
+    lags = ss.correlation_lags(data_len, data_len, mode="same")
+    ind = np.where(np.abs(lags) <= max_lag)[0]
+    return np.array(
+        [
+            [ss.correlate(x_i, x_j, method="direct", mode="same")[ind] for x_j in X]
+            for x_i in X
+        ]
+    )
+
+
+def test_cross_correlation_matrix():
+    rng = np.random.default_rng(0)
+
+    # odd/even lengths, lag window narrower and wider than the data
+    for num_frames, max_lag in [(51, 10), (50, 100), (40, 3)]:
+        X = rng.standard_normal((6, num_frames))
+        lags = correlation_lags(num_frames, max_lag)
+        expected = cross_correlation_loop(X, max_lag)
+
+        np.testing.assert_allclose(
+            cross_correlation_matrix(X, lags), expected, atol=1e-10
+        )
+        # blocked computation gives the same result
+        np.testing.assert_allclose(
+            cross_correlation_matrix(X, lags, max_block_bytes=1), expected, atol=1e-10
+        )
+
+
+def test_shuffle_baseline():
+    rng = np.random.default_rng(0)
+    X = rng.standard_normal((4, 60))
+    lags = correlation_lags(60, 5)
+
+    mean, confint = shuffle_baseline(X, lags, 20, 0.95, seed=0)
+
+    assert mean.shape == (4, 4, 11)
+    assert confint.shape == (4, 4, 11, 2)
+    np.testing.assert_allclose(confint[..., 0], -confint[..., 1])
+    assert (confint[..., 1] > 0).all()
+
+    # input is not shuffled in place
+    np.testing.assert_array_equal(X, np.random.default_rng(0).standard_normal((4, 60)))
+
+    # blocked and parallel computations give the same result
+    for kwargs in [{"max_block_bytes": 1}, {"n_jobs": 2}]:
+        mean2, confint2 = shuffle_baseline(X, lags, 20, 0.95, seed=0, **kwargs)
+        np.testing.assert_allclose(mean2, mean)
+        np.testing.assert_allclose(confint2, confint)
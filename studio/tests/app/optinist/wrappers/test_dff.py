@@ -0,0 +1,39 @@
+import numpy as np
+
+from studio.app.optinist.wrappers.optinist.dff import calc_dff, sliding_percentile
+
+
+def calc_dff_loop(timeseries, f0_frames, f0_percentile):
+    """
+    Reference implementation (previous lccd_detect loop)
+    """
+    num_cell, num_frames = timeseries.shape
+    timeseries_dff = np.ones([num_cell, num_frames]) * np.nan
+    for i in range(num_cell):
+        for k in range(num_frames):
+            if (k - f0_frames >= 0) and (k + f0_frames < num_frames):
+                f0 = np.percentile(
+                    timeseries[i, k - f0_frames : k + f0_frames], f0_percentile
+                )
+                timeseries_dff[i, k] = (timeseries[i, k] - f0) / f0
+    return timeseries_dff
+
+
+def test_calc_dff():
+    rng = np.random.default_rng(0)
+    timeseries = rng.random((7, 300)) + 1.0
+
+    expected = calc_dff_loop(timeseries, 20, 8)
+
+    np.testing.assert_allclose(calc_dff(timeseries, 20, 8), expected)
+    # chunked computation gives the same result
+    np.testing.assert_allclose(
+        calc_dff(timeseries, 20, 8, max_window_elements=100), expected
+    )
+
+
+def test_sliding_percentile_short_timeseries():
+    baseline = sliding_percentile(np.ones((2, 10)), 5, 8)
+
+    assert baseline.shape == (2, 10)
+    assert np.isnan(baseline).all()
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from studio.app.optinist.wrappers.optinist.neural_population_analysis.granger_engine import (  # noqa: E501
+    granger_causality,
+)
+
+
+def make_timeseries():
+    rng = np.random.default_rng(0)
+    X = rng.standard_normal((200, 4))
+    # cell 0 drives cell 1 with a lag of 1 frame
+    X[1:, 1] += 0.8 * X[:-1, 0]
+    return X
+
+
+def test_granger_causality():
+    stattools = pytest.importorskip("statsmodels.tsa.stattools")
+    X = make_timeseries()
+
+    result = granger_causality(X, 2)
+
+    assert result["ssr_ftest"].shape == (12, 2, 4)
+    assert result["fval_mat"].shape == (2, 4, 4)
+
+    for p, (i, j) in enumerate(result["combinations"]):
+        expected = stattools.grangercausalitytests(X[:, [i, j]], 2, verbose=False)
+        for k, lag in enumerate([1, 2]):
+            for key, size in [
+                ("ssr_ftest", 4),
+                ("ssr_chi2test", 3),
+                ("lrtest", 3),
+                ("params_ftest", 4),
+            ]:
+                np.testing.assert_allclose(
+                    result[key][p, k],
+                    np.array(expected[lag][0][key][:size], dtype=float),
+                    rtol=1e-7,
+                )
+            assert result["fval_mat"][k, i, j] == result["ssr_ftest"][p, k, 0]
+
+
+def test_granger_causality_parallel():
+    X = make_timeseries()
+
+    result = granger_causality(X, [1, 3])
+    parallel = granger_causality(X, [1, 3], n_jobs=2)
+
+    np.testing.assert_allclose(parallel["ssr_ftest"], result["ssr_ftest"])
+    np.testing.assert_allclose(parallel["fval_mat"], result["fval_mat"])
+    # only the driven pair is significant
+    assert result["fval_mat"][0].argmax() == np.ravel_multi_index((1, 0), (4, 4))
+
+
+def test_granger_causality_insufficient_observations():
+    with pytest.raises(ValueError):
+        granger_causality(np.zeros((10, 2)), 3)